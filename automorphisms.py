@@ -0,0 +1,176 @@
+import networkx as nx
+from networkx.algorithms.isomorphism import MultiDiGraphMatcher
+
+def role(v):
+    '''
+    returns the role of a vertex, which has to be preserved by automorphisms
+    v - vertex
+    '''
+
+    if v.is_source:
+        return "source"
+    if v.is_target:
+        return "target"
+    return "vertex"
+
+def refine_colors(G, colors):
+    '''
+    refines a coloring of the vertices until vertices of the same color have the same
+    number of in- and out-neighbors of each color, returns the refined coloring as list
+    indexed by vertex id; vertices of different refined colors cannot be mapped onto
+    each other by an automorphism that preserves the initial coloring
+    G      - graph
+    colors - list of initial colors indexed by vertex id
+    '''
+
+    csr = G.get_csr()
+    tails = csr["tails"].tolist()
+    heads = csr["heads"].tolist()
+    out_ptr = csr["out_ptr"].tolist()
+    out_arcs = csr["out_arcs"].tolist()
+    in_ptr = csr["in_ptr"].tolist()
+    in_arcs = csr["in_arcs"].tolist()
+
+    # colors are replaced by consecutive integers after each round
+    palette = {}
+    colors = [palette.setdefault(c, len(palette)) for c in colors]
+    num_colors = len(palette)
+
+    while True:
+        palette = {}
+        refined = []
+        for i in range(len(colors)):
+            signature = (colors[i],
+                         tuple(sorted(colors[tails[a]] for a in in_arcs[in_ptr[i]:in_ptr[i+1]])),
+                         tuple(sorted(colors[heads[a]] for a in out_arcs[out_ptr[i]:out_ptr[i+1]])))
+            refined.append(palette.setdefault(signature, len(palette)))
+
+        colors = refined
+        if len(palette) == num_colors:
+            return colors
+        num_colors = len(palette)
+
+def multi_digraph(G):
+    '''
+    returns the graph as networkx multi-digraph on the vertex ids, where each vertex stores
+    its id as attribute id
+    G - graph
+    '''
+
+    H = nx.MultiDiGraph()
+    for v in G.get_vertices():
+        H.add_node(v.get_id(), id=v.get_id())
+    for arc in G.get_arcs():
+        H.add_edge(arc.get_tail().get_id(), arc.get_head().get_id())
+
+    return H
+
+def vertex_automorphisms(G):
+    '''
+    generates the automorphisms of the graph that preserve the roles of vertices, each as
+    dictionary assigning to the id of a vertex the id of its image; parallel arcs can be
+    permuted in addition, which is not part of the generated automorphisms
+    G - graph
+    '''
+
+    colors = [role(v) for v in G.get_vertices()]
+    H = multi_digraph(G)
+
+    matcher = MultiDiGraphMatcher(H, H, node_match=lambda a, b: colors[a["id"]] == colors[b["id"]])
+
+    return matcher.isomorphisms_iter()
+
+def is_transposable(G, H, fixed, x, y):
+    '''
+    returns whether the graph has an automorphism that preserves the roles of vertices,
+    fixes the given vertices, and interchanges two vertices
+    G     - graph
+    H     - G as networkx multi-digraph on the vertex ids
+    fixed - ids of vertices that are fixed
+    x     - id of first vertex to be interchanged
+    y     - id of second vertex to be interchanged
+    '''
+
+    colors = [role(v) for v in G.get_vertices()]
+    for i in fixed:
+        colors[i] = ("fixed", i)
+    colors[x] = colors[y] = "swapped"
+
+    # cheap necessary condition before searching for the automorphism
+    refined = refine_colors(G, colors)
+    if refined[x] != refined[y]:
+        return False
+
+    colors_x = list(colors)
+    colors_y = list(colors)
+    colors_x[x] = colors_y[y] = "x"
+    colors_x[y] = colors_y[x] = "y"
+
+    matcher = MultiDiGraphMatcher(H, H, node_match=lambda a, b: colors_x[a["id"]] == colors_y[b["id"]])
+
+    return matcher.is_isomorphic()
+
+def interchangeable_out_arcs(G, first_vertex=None):
+    '''
+    detects arcs that can be interchanged by automorphisms of the graph that preserve
+    sources and targets, returns a list of pairs (vl, classes), where classes is a list
+    of sets of positions of arcs leaving vertex with label vl
+
+    the vertices are processed in topological order, starting with first_vertex; arcs leaving
+    a vertex are in the same class if there is an automorphism that interchanges them and fixes
+    the heads of all other arcs leaving this vertex as well as all previously processed vertices
+    and the heads of their leaving arcs, so the symbols of the arcs of a class can be sorted at
+    every vertex independently of the previously processed vertices
+
+    G            - graph
+    first_vertex - label of the vertex that is processed first (optional)
+    '''
+
+    H = multi_digraph(G)
+
+    order = G.topological_order()
+    if not first_vertex is None:
+        order = [first_vertex] + [vl for vl in order if vl != first_vertex]
+
+    fixed = set()
+    interchangeable = []
+    for vl in order:
+        v = G.get_vertex(vl)
+        if v.is_target:
+            continue
+
+        fixed.add(v.get_id())
+        heads = [arc.get_head().get_id() for arc in G.get_out_arcs(vl)]
+
+        # classes of arc positions are built by union-find, since interchanging arcs is transitive
+        parent = list(range(len(heads)))
+        def find(i):
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+
+        for i in range(len(heads)):
+            for j in range(i + 1, len(heads)):
+                if find(i) == find(j):
+                    continue
+
+                # parallel arcs can always be interchanged, arcs to different heads only if
+                # interchanging the heads does not interchange further arcs leaving the vertex
+                others = fixed.union(heads[k] for k in range(len(heads)) if heads[k] != heads[i]
+                                     and heads[k] != heads[j])
+                if heads[i] == heads[j] or (heads.count(heads[i]) == 1 and heads.count(heads[j]) == 1
+                                            and not heads[i] in fixed and not heads[j] in fixed
+                                            and is_transposable(G, H, others, heads[i], heads[j])):
+                    parent[find(j)] = find(i)
+
+        classes = {}
+        for i in range(len(heads)):
+            classes.setdefault(find(i), set()).add(i)
+        classes = [positions for positions in classes.values() if len(positions) > 1]
+        if len(classes) > 0:
+            interchangeable.append((vl, classes))
+
+        fixed.update(heads)
+
+    return interchangeable
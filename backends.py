@@ -0,0 +1,231 @@
+import gurobipy as gp
+import numpy as np
+import time
+
+try:
+    from ortools.sat.python import cp_model
+except ImportError:
+    cp_model = None
+
+# solvers that can be used to solve the models, search is the backtracking search of
+# search.py, which does not need a model
+BACKENDS = ["gurobi", "cpsat", "search"]
+
+# parameters of Gurobi and the corresponding parameters of CP-SAT
+CPSAT_PARAMS = {"TimeLimit": "max_time_in_seconds", "Threads": "num_workers",
+                "OutputFlag": "log_search_progress", "Seed": "random_seed"}
+
+class CpSatModel:
+
+    def __init__(self):
+        '''
+        creates a model of the CP-SAT solver of OR-Tools that provides the part of the
+        interface of a Gurobi model that is used to build and solve network coding models,
+        i.e., binary variables, linear constraints, bounds, MIP starts (as hints), solving,
+        status, and solution values; the statuses are reported by Gurobi's status codes
+        '''
+
+        self.model = cp_model.CpModel()
+        self.variables = []
+        self.params = {}
+        self.solution = None
+
+        self.Status = gp.GRB.LOADED
+        self.SolCount = 0
+        self.Runtime = 0.0
+        self.NodeCount = 0
+        self.MIPGap = 0.0
+
+    @property
+    def NumVars(self):
+        return len(self.variables)
+
+    @property
+    def NumConstrs(self):
+        return len(self.model.Proto().constraints)
+
+    @property
+    def NumNZs(self):
+        return sum(len(constr.linear.vars) for constr in self.model.Proto().constraints)
+
+    # the models for CP-SAT are linear
+    NumQConstrs = 0
+    NumQCNZs = 0
+
+    def addVars(self, num, vtype=None):
+        '''
+        adds binary variables, returns a dictionary of the variables indexed by 0,...,num-1
+        num   - number of variables
+        vtype - variable type, only binary variables are supported (optional)
+        '''
+
+        variables = [self.model.NewBoolVar("") for i in range(num)]
+        self.variables.extend(variables)
+
+        return dict(enumerate(variables))
+
+    def addConstr(self, constr, name=None):
+        '''
+        adds a linear constraint, returns the constraint
+        constr - linear constraint built from variables of the model
+        name   - name of the constraint, which is ignored (optional)
+        '''
+
+        return self.model.Add(constr)
+
+    def chgCoeff(self, constr, var, value):
+        '''
+        adds a variable to a linear constraint
+        constr - constraint returned by addConstr
+        var    - variable that does not occur in the constraint yet
+        value  - coefficient of the variable
+        '''
+
+        constr.proto.linear.vars.append(var.index)
+        constr.proto.linear.coeffs.append(int(value))
+
+    def getVars(self):
+        '''
+        returns all variables ordered by their index
+        '''
+
+        return self.variables
+
+    def getAttr(self, name, variables):
+        '''
+        returns the values of an attribute of variables, only "X" is supported
+        name      - name of the attribute
+        variables - list of variables
+        '''
+
+        assert name == "X"
+
+        return self.solution[[var.index for var in variables]]
+
+    def setAttr(self, name, variables, values):
+        '''
+        sets an attribute of variables, "Start" values are passed to CP-SAT as hints,
+        variable names are ignored
+        name      - name of the attribute
+        variables - list of variables
+        values    - list of values
+        '''
+
+        if name == "Start":
+            self.model.ClearHints()
+            for (var, value) in zip(variables, values):
+                self.model.AddHint(var, int(round(value)))
+
+    def setParam(self, name, value):
+        '''
+        sets a parameter, given by the name of the corresponding Gurobi parameter
+        name  - name of the Gurobi parameter
+        value - value of the parameter
+        '''
+
+        if not name in CPSAT_PARAMS:
+            print("WARNING: parameter {} is not supported by CP-SAT and ignored".format(name))
+            return
+
+        self.params[CPSAT_PARAMS[name]] = value
+
+    def update(self):
+        '''
+        does nothing, since modifications of the model take effect immediately
+        '''
+
+        pass
+
+    def optimize(self):
+        '''
+        solves the model
+        '''
+
+        self.solution = None
+        self.SolCount = 0
+
+        solver = cp_model.CpSolver()
+        for (name, value) in self.params.items():
+            if name == "log_search_progress":
+                value = bool(value)
+            setattr(solver.parameters, name, value)
+
+        start = time.perf_counter()
+        status = solver.Solve(self.model)
+        self.Runtime = time.perf_counter() - start
+        self.NodeCount = solver.NumBranches()
+
+        if status == cp_model.OPTIMAL or status == cp_model.FEASIBLE:
+            self.Status = gp.GRB.OPTIMAL
+            self.SolCount = 1
+            self.solution = np.array(solver.ResponseProto().solution, dtype=float)
+        elif status == cp_model.INFEASIBLE:
+            self.Status = gp.GRB.INFEASIBLE
+        elif status == cp_model.MODEL_INVALID:
+            # conflicting bounds lead to empty domains, which are reported as invalid model
+            if any(var.proto.domain[0] > var.proto.domain[1] for var in self.variables):
+                self.Status = gp.GRB.INFEASIBLE
+            else:
+                print("ERROR: invalid CP-SAT model: {}".format(self.model.Validate()))
+                self.Status = gp.GRB.INTERRUPTED
+        elif "max_time_in_seconds" in self.params:
+            self.Status = gp.GRB.TIME_LIMIT
+        else:
+            self.Status = gp.GRB.INTERRUPTED
+
+def create_solver_model(backend="gurobi"):
+    '''
+    returns an empty model of the given backend, or None if the backend is not available
+    backend - "gurobi" or "cpsat" (optional)
+    '''
+
+    if backend == "gurobi":
+        return gp.Model()
+
+    if backend == "cpsat":
+        if cp_model is None:
+            print("ERROR: backend cpsat requires the Python package ortools")
+            return None
+        return CpSatModel()
+
+    print("ERROR: unknown backend {}, available backends are {}".format(backend, ", ".join(BACKENDS)))
+    return None
+
+def quicksum(terms):
+    '''
+    returns the sum of variables or linear expressions of either backend, the empty sum is 0
+    terms - iterable of variables or expressions
+    '''
+
+    terms = list(terms)
+    if len(terms) == 0:
+        return 0
+
+    if not cp_model is None and isinstance(terms[0], cp_model.LinearExpr):
+        return cp_model.LinearExpr.sum(terms)
+
+    return gp.quicksum(terms)
+
+def set_lb(var, value):
+    '''
+    sets the lower bound of a binary variable of either backend
+    var   - variable
+    value - lower bound
+    '''
+
+    if isinstance(var, gp.Var):
+        var.lb = value
+    else:
+        var.proto.domain[0] = int(value)
+
+def set_ub(var, value):
+    '''
+    sets the upper bound of a binary variable of either backend
+    var   - variable
+    value - upper bound
+    '''
+
+    if isinstance(var, gp.Var):
+        var.ub = value
+    else:
+        var.proto.domain[1] = int(value)
@@ -0,0 +1,83 @@
+#!/usr/bin/python3
+
+import networkcode as nwc
+import instances as inst
+import gurobipy as gp
+import contextlib
+import io
+import sys
+import time
+
+def run_formulation(G, size_alpha, size_code, linearize, time_limit):
+    '''
+    builds and solves the model for one formulation, returns a dictionary of statistics
+    G          - network to be used
+    size_alpha - size of the underlying alphabet
+    size_code  - size of code to be found
+    linearize  - whether the linear formulation is used
+    time_limit - time limit for solving the model
+    '''
+
+    # suppress the messages printed while building the model
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        m = nwc.create_model(G, size_alpha, size_code, linearize=linearize)[0]
+        m.update()
+        build_time = time.perf_counter() - start
+
+    m.Params.OutputFlag = 0
+    m.Params.TimeLimit = time_limit
+    m.optimize()
+
+    return {"status": nwc.status_name(m), "build": build_time, "solve": m.Runtime,
+            "vars": m.NumVars, "constrs": m.NumConstrs, "qconstrs": m.NumQConstrs,
+            "nodes": m.NodeCount}
+
+# check input
+if len(sys.argv) < 3:
+    print("ERROR: received too few arguments")
+    print("usage: ./benchmark.py <alphabet> <codesize> <optional parameters>")
+    print("call script with optional parameter -h for more information")
+    sys.exit()
+
+optional = sys.argv[3:]
+if "-h" in optional:
+    print("compares the quadratic and the linearized formulation on all instances")
+    print("optional parameters:")
+    print("\t-h: show help")
+    print("\t-i<name>: only run instance name (can be repeated)")
+    print("\t-t<seconds>: time limit per solve (default 60)")
+    print("\texamplary call: ./benchmark.py 2 3 -ibutterfly -t10")
+    sys.exit()
+
+size_alpha = int(sys.argv[1])
+size_code = int(sys.argv[2])
+
+# parse optional parameters
+names = []
+time_limit = 60
+for arg in optional:
+    if arg.startswith("-i"):
+        names.append(arg[2:])
+    elif arg.startswith("-t"):
+        time_limit = float(arg[2:])
+
+if len(names) == 0:
+    names = inst.get_instance_names()
+
+print("{:14} {:10} {:11} {:>8} {:>8} {:>8} {:>8} {:>8} {:>8}".format(
+    "instance", "model", "status", "build", "solve", "vars", "constrs", "qconstrs", "nodes"))
+for name in names:
+    for linearize in [False, True]:
+        G = inst.get_instance(name)
+        if G is None:
+            break
+        try:
+            res = run_formulation(G, size_alpha, size_code, linearize, time_limit)
+        except gp.GurobiError as e:
+            print("{:14} {:10} ERROR: {}".format(name, "linear" if linearize else "quadratic", e))
+            continue
+
+        print("{:14} {:10} {:11} {:8.2f} {:8.2f} {:8d} {:8d} {:8d} {:8.0f}".format(
+            name, "linear" if linearize else "quadratic", res["status"], res["build"],
+            res["solve"], res["vars"], res["constrs"], res["qconstrs"], res["nodes"]))
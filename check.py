@@ -0,0 +1,192 @@
+#!/usr/bin/python3
+
+import enumeration as en
+import graph
+import instances
+import networkcode as nwc
+import numpy as np
+import reduction as red
+import separation as sep
+import simulator as sim
+import itertools as it
+import sys
+
+def check_simulator():
+    '''
+    checks that the simulation accepts an unambiguous code of the butterfly network and
+    rejects it once a map merges the two code words or misses an image, returns the list
+    of failures
+    '''
+
+    G = instances.get_instance("butterfly")
+    v = {vl: G.get_vertex(vl) for vl in [1, 2, 3, 4, 5]}
+
+    # code word 1 differs from code word 0 on the arc to 3, vertex 4 forwards the difference
+    maps = {(v[2], (0,)): (0, 0),
+            (v[3], (0,)): (0, 0), (v[3], (1,)): (1, 1),
+            (v[4], (0, 0)): (0,), (v[4], (0, 1)): (1,),
+            (v[5], (0,)): (0, 0), (v[5], (1,)): (1, 1)}
+    code_words = {(0, v[1]): (0, 0), (1, v[1]): (0, 1)}
+
+    failures = []
+    if not sim.verify_code(G, 2, maps, code_words, verbose=False):
+        failures.append("unambiguous code is rejected")
+
+    merged = dict(maps)
+    merged[v[4], (0, 1)] = (0,)
+    if sim.verify_code(G, 2, merged, code_words, verbose=False):
+        failures.append("code that is ambiguous at target 6 is accepted")
+
+    missing = dict(maps)
+    del missing[v[4], (0, 1)]
+    if sim.verify_code(G, 2, missing, code_words, verbose=False):
+        failures.append("code that uses an input without image is accepted")
+
+    same = {(0, v[1]): (0, 1), (1, v[1]): (0, 1)}
+    if sim.verify_code(G, 2, maps, same, verbose=False):
+        failures.append("code with equal code words is accepted")
+
+    return failures
+
+def check_reduction():
+    '''
+    checks that a code of the reduced network is restored to a code of the original network,
+    which consists of the butterfly network with a relay 8 between 4 and 5, a vertex 9 that
+    cannot reach a target, and a target 10 with the same tails as target 6, returns the list
+    of failures
+    '''
+
+    G = graph.DiGraph()
+    G.add_vertex(1, is_source=True, pos=(0,0))
+    for (vl, pos) in [(2, (1,1)), (3, (1,-1)), (4, (2,0)), (8, (2.5,0)), (5, (3,0)), (9, (2,-2))]:
+        G.add_vertex(vl, pos=pos)
+    for (vl, pos) in [(6, (4,1)), (7, (4,-1)), (10, (4,2))]:
+        G.add_vertex(vl, is_target=True, pos=pos)
+
+    for (ul, vl) in [(1, 2), (1, 3), (2, 4), (2, 6), (3, 4), (3, 7), (4, 8), (8, 5), (5, 6), (5, 7),
+                     (3, 9), (2, 10), (5, 10)]:
+        G.add_arc(ul, vl)
+
+    reduction = red.reduce_network(G)
+    if reduction is None:
+        return ["network is not reduced"]
+
+    failures = []
+    if (reduction.relays, reduction.dropped, reduction.merged) != ([8], [9], {10: 6}):
+        failures.append("unexpected reduction: {}".format(reduction.summary()))
+
+    maps, code_words = nwc.find_unambiguous_code2(reduction.reduced, 2, 2, backend="search", display=False)
+    if maps is None:
+        return failures + ["reduced network has no code"]
+
+    maps, code_words = reduction.restore(2, maps, code_words)
+    if not sim.verify_code(G, 2, maps, code_words, verbose=False):
+        failures.append("restored code is rejected by the simulation")
+
+    return failures
+
+def check_separation(trials=20, seed=0):
+    '''
+    checks that the subset separator finds a most violated subset inequality for every code
+    word and output string, compared with all subsets of input strings, on random fractional
+    values from a grid of quarters, which causes ties; returns the list of failures
+    trials - number of random points
+    seed   - seed of the random points
+    '''
+
+    rng = np.random.default_rng(seed)
+    separator = sep.CutSeparator(None, None, None, None, families=("subset",))
+    (size_code, num_in, num_out) = (3, 4, 3)
+
+    failures = []
+    for trial in range(trials):
+        inputs = rng.integers(0, 5, (size_code, num_in)) / 4
+        outputs = rng.integers(0, 5, (size_code, num_out)) / 4
+        maps = rng.integers(0, 5, (num_in, num_out)) / 4
+
+        found = {(key[0], key[1]): (violation, key[2])
+                 for (violation, family, vl, key) in separator.separate_subset(0, inputs, outputs, maps)}
+
+        for (c, o) in it.product(range(size_code), range(num_out)):
+            def lhs(subset):
+                return (sum(inputs[c,i] for i in subset)
+                        + sum(maps[i,o] for i in range(num_in) if not i in subset))
+
+            best = min(lhs(subset) for k in range(num_in + 1) for subset in it.combinations(range(num_in), k))
+            violation = outputs[c,o] - best
+            if violation <= sep.CUT_TOLERANCE:
+                if (c, o) in found:
+                    failures.append("point {}: inequality of code word {} and output {} is not violated".format(
+                        trial, c, o))
+            elif not (c, o) in found:
+                failures.append("point {}: violated inequality of code word {} and output {} is missed".format(
+                    trial, c, o))
+            elif (abs(found[c,o][0] - violation) > 1e-9
+                  or abs(outputs[c,o] - lhs(found[c,o][1]) - violation) > 1e-9):
+                failures.append("point {}: inequality of code word {} and output {} is not most violated".format(
+                    trial, c, o))
+
+    return failures
+
+def check_enumeration(backend="cpsat"):
+    '''
+    checks the numbers of pairwise not equivalent codes of size 2 over the binary alphabet,
+    which are 21 for the butterfly network and 30 for comb4_2_mult, with and without
+    automorphism handling; without excluding the images of the codes, the same codes are
+    found and only symmetric duplicates are added; returns the list of failures
+    backend - backend of the model
+    '''
+
+    failures = []
+    for (instance_name, expected) in [("butterfly", 21), ("comb4_2_mult", 30)]:
+        for handle_automorphisms in [False, True]:
+            duplicates = {}
+            for exclude_images in [True, False]:
+                codes, stats = en.enumerate_codes(instances.get_instance(instance_name), 2, 2,
+                                                  exclude_images=exclude_images, return_stats=True,
+                                                  backend=backend, handle_automorphisms=handle_automorphisms)
+                duplicates[exclude_images] = stats["duplicates"]
+
+                configuration = "{} with handle_automorphisms={}, exclude_images={}".format(
+                    instance_name, handle_automorphisms, exclude_images)
+                if stats["status"] != "complete" or stats["codes"] != expected:
+                    failures.append("{}: {} codes ({}), expected {}".format(
+                        configuration, stats["codes"], stats["status"], expected))
+
+            if duplicates[True] != 0 or duplicates[False] < duplicates[True]:
+                failures.append("{} with handle_automorphisms={}: {} and {} duplicates with and without excluding images".format(
+                    instance_name, handle_automorphisms, duplicates[True], duplicates[False]))
+
+    return failures
+
+# checks that can be run by name
+CHECKS = {"simulator": check_simulator,
+          "reduction": check_reduction,
+          "separation": check_separation,
+          "enumeration": check_enumeration}
+
+if __name__ == "__main__":
+
+    if "-h" in sys.argv[1:]:
+        print("runs small deterministic checks of the modules, by default all of them")
+        print("usage: ./check.py <optional names of checks>")
+        print("checks: {}".format(", ".join(CHECKS)))
+        print("\texamplary call: ./check.py simulator")
+        sys.exit()
+
+    names = sys.argv[1:] if len(sys.argv) > 1 else list(CHECKS)
+    unknown = [name for name in names if not name in CHECKS]
+    if len(unknown) > 0:
+        print("ERROR: unknown checks {}, use {}".format(", ".join(unknown), ", ".join(CHECKS)))
+        sys.exit(1)
+
+    num_failed = 0
+    for name in names:
+        failures = CHECKS[name]()
+        for failure in failures:
+            print("FAILED: {}: {}".format(name, failure))
+        print("check {}: {}".format(name, "ok" if len(failures) == 0 else "failed"))
+        num_failed += len(failures) > 0
+
+    if num_failed > 0:
+        sys.exit(1)
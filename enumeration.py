@@ -0,0 +1,373 @@
+import automorphisms as aut
+import networkcode as nwc
+import reduction as red
+import simulator as sim
+from backends import quicksum
+import itertools as it
+import time
+
+# maximum number of automorphisms of the network that are used for the canonical form
+MAX_AUTOMORPHISMS = 10000
+
+# maximum number of no-good cuts that exclude the symmetric images of a single code
+MAX_IMAGES = 1000
+
+class CodeSpace:
+
+    def __init__(self, G, strings):
+        '''
+        describes the codes of a network independently of the model: a code is given by
+        the symbols that its code words send along the arcs that can reach a target, i.e.,
+        by a matrix with one row per code word and one column per such arc; this determines
+        the code words and the images of all input strings that are received, whereas the
+        remaining parts of the maps can be chosen arbitrarily
+        G       - graph for which we want to compute the code
+        strings - index of strings of the model
+        '''
+
+        self.G = G
+        self.strings = strings
+
+        # arcs that can reach a target, ordered by their ids
+        to_targets = red.reachable(G, [G.get_vertex_id(vl) for vl in G.get_targets()], False)
+        self.columns = [arc for arc in G.get_arcs() if arc.get_head().get_id() in to_targets]
+
+        # positions of these arcs among the arcs leaving each vertex
+        self.positions = {}
+        for arc in self.columns:
+            self.positions.setdefault(arc.get_tail().get_label(), []).append(arc.get_tail_pos())
+
+        # parallel arcs form the classes of columns that can be permuted
+        bundles = {}
+        for (j, arc) in enumerate(self.columns):
+            bundles.setdefault((arc.get_tail().get_id(), arc.get_head().get_id()), []).append(j)
+        self.classes = sorted(bundles.values())
+
+        # each automorphism maps the column of arc a to the column of its image, parallel
+        # arcs are mapped in order; the permutations are stored as the columns of the preimages
+        self.permutations = []
+        for mapping in it.islice(aut.vertex_automorphisms(G), MAX_AUTOMORPHISMS):
+            source = len(self.columns) * [0]
+            for ((u, v), js) in bundles.items():
+                for (j, k) in zip(js, bundles[mapping[u], mapping[v]]):
+                    source[k] = j
+            self.permutations.append(source)
+
+        if len(self.permutations) >= MAX_AUTOMORPHISMS:
+            print("WARNING: only {} automorphisms of the network are used, codes might be reported twice".format(
+                MAX_AUTOMORPHISMS))
+
+        # columns of the first source, which are sorted by symmetry_handling
+        self.first_columns = None
+        sources = G.get_sources()
+        if len(sources) > 0:
+            first = [j for (j, arc) in enumerate(self.columns) if arc.get_tail().get_label() == sources[0]]
+            if len(first) == G.out_degree(sources[0]):
+                self.first_columns = first
+
+    def transcript(self, solution, size_code):
+        '''
+        returns the matrix of symbols of a solution as tuple of rows, missing outputs are -1
+        solution  - solution as returned by extract_solution
+        size_code - size of the code
+        '''
+
+        rows = []
+        for c in range(size_code):
+            row = []
+            for arc in self.columns:
+                vl = arc.get_tail().get_label()
+                out_id = solution.outputs[vl][c]
+                row.append(self.strings.out_strings(vl)[out_id][arc.get_tail_pos()] if out_id >= 0 else -1)
+            rows.append(tuple(row))
+
+        return tuple(rows)
+
+    def canonical_form(self, matrix):
+        '''
+        returns the canonical form of a code under permutations of the code words, relabelings
+        of the symbols on each arc, and automorphisms of the network, i.e., the lexicographically
+        smallest matrix that is obtained by these operations; two codes are equivalent if and
+        only if their canonical forms coincide
+        matrix - matrix of symbols as returned by transcript
+        '''
+
+        return min(canonical_rows([[row[j] for j in source] for row in matrix], self.classes)
+                   for source in self.permutations)
+
+    def images(self, matrix):
+        '''
+        generates the distinct images of a code under automorphisms, permutations of parallel
+        arcs and of the code words, and relabelings of the symbols that satisfy the restrictions of symmetry_handling
+        and value_symmetry_handling, i.e., the code words are sorted at the first source and
+        the symbols on each arc are used in the order of the code words
+        matrix - matrix of symbols as returned by transcript
+        '''
+
+        if self.first_columns is None:
+            yield matrix
+            return
+
+        # parallel arcs can be permuted in addition to the automorphisms
+        bundles = [columns for columns in self.classes if len(columns) > 1]
+
+        found = set()
+        for source in self.permutations:
+            for choice in it.product(*[it.permutations(columns) for columns in bundles]):
+                permuted = list(source)
+                for (columns, images) in zip(bundles, choice):
+                    for (j, k) in zip(columns, images):
+                        permuted[j] = source[k]
+
+                image = [[row[j] for j in permuted] for row in matrix]
+                for rows in sorted_relabelings(image, self.first_columns):
+                    if not rows in found:
+                        found.add(rows)
+                        yield rows
+                    if len(found) >= MAX_IMAGES:
+                        return
+
+    def no_good(self, m, var_output_at_node, matrix):
+        '''
+        adds a constraint to the model that excludes the code given by its matrix of symbols,
+        all other codes remain feasible
+        m                  - model created by create_model
+        var_output_at_node - variables modeling the output at vertices
+        matrix             - matrix of symbols as returned by transcript
+        '''
+
+        variables = []
+        num_terms = 0
+        for (vl, positions) in self.positions.items():
+            columns = [j for (j, arc) in enumerate(self.columns) if arc.get_tail().get_label() == vl]
+            out_strings = self.strings.out_strings(vl)
+            outputs = var_output_at_node.block(vl)
+
+            for c in range(len(matrix)):
+                symbols = tuple(matrix[c][j] for j in columns)
+                variables.extend(outputs[c][s] for s in range(len(out_strings))
+                                 if tuple(out_strings[s][p] for p in positions) == symbols)
+                num_terms += 1
+
+        m.addConstr(quicksum(variables) <= num_terms - 1)
+
+def relabeled_row(row, labels, classes):
+    '''
+    returns the row relabeled by the labels of the previous rows, where new symbols of a
+    column get the next free label, together with the extended labels and the refined
+    classes; the columns of each class are sorted by their labels and split into classes
+    of equal labels
+    row     - symbols per column
+    labels  - tuple of dictionaries assigning the labels to the symbols of each column
+    classes - tuple of tuples of columns that cannot be distinguished by the previous rows
+    '''
+
+    labels = list(labels)
+    values = []
+    for j in range(len(row)):
+        if not row[j] in labels[j]:
+            labels[j] = dict(labels[j])
+            labels[j][row[j]] = len(labels[j])
+        values.append(labels[j][row[j]])
+
+    relabeled = []
+    refined = []
+    for columns in classes:
+        ordered = sorted(columns, key=lambda j: values[j])
+        relabeled.extend(values[j] for j in ordered)
+        for (value, group) in it.groupby(ordered, key=lambda j: values[j]):
+            refined.append(tuple(group))
+
+    return tuple(relabeled), tuple(labels), tuple(refined)
+
+def canonical_rows(matrix, classes):
+    '''
+    returns the lexicographically smallest matrix that is obtained from the given one by
+    permuting the rows, relabeling the symbols of each column, and permuting the columns
+    within each class; the rows are chosen one after another, keeping all partial choices
+    that lead to the smallest rows so far
+    matrix  - list of rows of symbols
+    classes - list of lists of columns that can be permuted
+    '''
+
+    states = [(tuple(range(len(matrix))), tuple({} for j in range(len(matrix[0]) if len(matrix) > 0 else 0)),
+               tuple(tuple(columns) for columns in classes))]
+    form = []
+
+    for r in range(len(matrix)):
+        best = None
+        candidates = {}
+        for (remaining, labels, state_classes) in states:
+            for i in remaining:
+                (row, new_labels, new_classes) = relabeled_row(matrix[i], labels, state_classes)
+                if not best is None and row > best:
+                    continue
+                if best is None or row < best:
+                    best = row
+                    candidates = {}
+
+                rest = tuple(k for k in remaining if k != i)
+                key = (rest, tuple(tuple(sorted(d.items())) for d in new_labels), new_classes)
+                candidates[key] = (rest, new_labels, new_classes)
+
+        form.append(best)
+        states = list(candidates.values())
+
+    return tuple(form)
+
+def sorted_relabelings(matrix, first_columns):
+    '''
+    generates the orders of the rows of a matrix, relabeled such that the symbols of each
+    column are used in the order of the rows, for which the relabeled rows are strictly
+    increasing in the given columns
+    matrix        - list of rows of symbols
+    first_columns - columns in which the rows are increasing
+    '''
+
+    num_columns = len(matrix[0]) if len(matrix) > 0 else 0
+    stack = [((), tuple({} for j in range(num_columns)), tuple(range(len(matrix))))]
+    num_images = 0
+
+    while len(stack) > 0 and num_images < MAX_IMAGES:
+        (rows, labels, remaining) = stack.pop()
+        if len(remaining) == 0:
+            num_images += 1
+            yield rows
+            continue
+
+        for i in remaining:
+            (row, new_labels, classes) = relabeled_row(matrix[i], labels, tuple((j,) for j in range(num_columns)))
+            if len(rows) > 0 and [row[j] for j in first_columns] <= [rows[-1][j] for j in first_columns]:
+                continue
+            stack.append((rows + (row,), new_labels, tuple(k for k in remaining if k != i)))
+
+def enumerate_codes(G, size_alpha, size_code, max_codes=None, exclude_images=True, display=False,
+                    params=None, return_stats=False, handle_symmetries=True,
+                    handle_value_symmetries=True, apply_preprocessing=False, **options):
+    '''
+    enumerates all unambiguous codes of a given size up to symmetry, i.e., up to permutations
+    of the code words, relabelings of the symbols on each arc, and automorphisms of the
+    network; the model is solved repeatedly and each code is excluded by a no-good cut on the
+    symbols it sends along the arcs that can reach a target; each code is reduced to its
+    canonical form (see CodeSpace.canonical_form) and only kept if it is not equivalent to
+    a code found before; returns the list of pairs of maps and code words of the codes
+    G          - network to be used
+    size_alpha - size of the underlying alphabet
+    size_code  - size of codes to be enumerated
+
+    optional input:
+    max_codes               - maximum number of codes that are enumerated (default: all)
+    exclude_images          - whether the images of each code under the symmetries are
+                              excluded by no-good cuts as well, which requires symmetry
+                              handling and value symmetry handling; otherwise, only the
+                              symmetry handling of the model excludes equivalent codes
+    display                 - whether the codes are printed to the screen
+    params                  - dictionary of solver parameters, which apply to each solve
+    return_stats            - whether a dictionary with the status, the numbers of codes,
+                              solutions, symmetric duplicates, and no-good cuts, and the
+                              time is returned as second value
+    handle_symmetries       - whether the code words are sorted at the first source
+    handle_value_symmetries - whether the symbols on each arc are used in the order of the
+                              code words
+    apply_preprocessing     - whether preprocessing is applied, which only keeps codes
+                              whose maps at vertices of in-degree 1 are the identity
+    options                 - remaining options of create_model, backend search is not
+                              supported since it cannot add no-good cuts
+    '''
+
+    if not max_codes is None and max_codes < 1:
+        print("ERROR: at least one code needs to be enumerated")
+        if return_stats:
+            return None, None
+        return None
+
+    if options.get("backend") == "search":
+        print("ERROR: enumeration requires a model, use backend gurobi or cpsat")
+        if return_stats:
+            return None, None
+        return None
+
+    if apply_preprocessing:
+        print("WARNING: preprocessing is active, only codes with identity maps at vertices of in-degree 1 are enumerated")
+
+    if exclude_images and not (handle_symmetries and handle_value_symmetries):
+        print("WARNING: images are only excluded with symmetry handling and value symmetry handling")
+        exclude_images = False
+
+    start = time.perf_counter()
+    alpha = range(size_alpha)
+
+    m, strings, var_input_at_node, var_output_at_node, var_map_at_node = \
+        nwc.create_model(G, size_alpha, size_code, handle_symmetries=handle_symmetries,
+                         handle_value_symmetries=handle_value_symmetries,
+                         apply_preprocessing=apply_preprocessing, **options)
+
+    if m is None:
+        if return_stats:
+            return None, None
+        return None
+
+    if not params is None:
+        for (name, value) in params.items():
+            m.setParam(name, value)
+
+    space = CodeSpace(G, strings)
+    print("ENUMERATE CODES: {} arcs can reach a target, {} automorphisms".format(
+        len(space.columns), len(space.permutations)))
+
+    codes = []
+    forms = set()
+    status = "limit"
+    num_solutions = 0
+    num_duplicates = 0
+    num_no_goods = 0
+
+    while max_codes is None or len(codes) < max_codes:
+        nwc.optimize_model(m)
+        status = nwc.status_name(m)
+        if status != "feasible":
+            break
+
+        num_solutions += 1
+        solution = nwc.extract_solution(m, var_input_at_node, var_output_at_node, var_map_at_node)
+        matrix = space.transcript(solution, size_code)
+
+        form = space.canonical_form(matrix)
+        if form in forms:
+            num_duplicates += 1
+        else:
+            forms.add(form)
+            maps = nwc.create_maps_from_solution(m, G, alpha, var_map_at_node, strings, solution=solution)
+            code_words = nwc.create_code_from_solution(m, G, alpha, var_output_at_node, strings,
+                                                       solution=solution)
+            if not sim.verify_code(G, size_alpha, maps, code_words, verbose=False):
+                print("WARNING: code {} is not verified by simulation".format(len(codes)))
+            codes.append((maps, code_words))
+
+            if display:
+                print("\nCODE {}".format(len(codes) - 1))
+                for line in nwc.solution_lines(G, range(size_code), solution, strings):
+                    print(line)
+
+        # the solution itself is excluded even if the number of images is limited
+        images = {matrix}
+        if exclude_images:
+            images.update(space.images(matrix))
+        for image in images:
+            space.no_good(m, var_output_at_node, image)
+        num_no_goods += len(images)
+
+    if status == "infeasible":
+        status = "complete"
+    elif status == "feasible":
+        status = "limit"
+
+    wall_time = time.perf_counter() - start
+    print("found {} codes of size {} that are pairwise not equivalent ({}) from {} solutions, {} symmetric duplicates, {} no-good cuts, {:.2f}s".format(
+        len(codes), size_code, status, num_solutions, num_duplicates, num_no_goods, wall_time))
+
+    if return_stats:
+        return codes, {"status": status, "codes": len(codes), "solutions": num_solutions,
+                       "duplicates": num_duplicates, "no_goods": num_no_goods, "time": wall_time}
+
+    return codes
@@ -1,18 +1,24 @@
+import hashlib
 import matplotlib.pyplot as plt
 import networkx as nx
+import numpy as np
 
 class Vertex:
 
-    def __init__(self, v, is_source, is_target, pos):
+    __slots__ = ["label", "id", "is_source", "is_target", "pos"]
+
+    def __init__(self, v, is_source, is_target, pos, vid=None):
         '''
         creates a vertex object
         v         - label of vertex
         is_source - whether vertex is source
         is_target - whether vertex is target
         pos       - position of vertex (for drawing)
+        vid       - integer id of vertex within its graph
         '''
 
         self.label = v
+        self.id = vid
         self.is_source = is_source
         self.is_target = is_target
         self.pos = pos
@@ -24,33 +30,34 @@ class Vertex:
 
         return self.label
 
-    def is_source(self):
-        '''
-        returns whether vertex is source
-        '''
-
-        return self.is_source
-
-    def is_target(self):
+    def get_id(self):
         '''
-        returns whether vertex is target
+        returns integer id of vertex
         '''
 
-        return self.is_target
+        return self.id
 
 class Arc:
 
-    def __init__(self, u, v, is_attackable):
+    __slots__ = ["tail", "head", "is_attackable", "id", "tail_pos", "head_pos"]
+
+    def __init__(self, u, v, is_attackable, aid=None, tail_pos=None, head_pos=None):
         '''
         creates an arc object
         u             - tail of arc
         v             - head of arc
         is_attackable - whether arc is attackable
+        aid           - integer id of arc within its graph
+        tail_pos      - position of arc among the arcs leaving its tail
+        head_pos      - position of arc among the arcs pointing to its head
         '''
 
         self.tail = u
         self.head = v
         self.is_attackable = is_attackable
+        self.id = aid
+        self.tail_pos = tail_pos
+        self.head_pos = head_pos
 
     def get_tail(self):
         '''
@@ -73,12 +80,26 @@ class Arc:
 
         return self.is_attackable
 
+    def get_tail_pos(self):
+        '''
+        returns position of arc among the arcs leaving its tail
+        '''
+
+        return self.tail_pos
+
+    def get_head_pos(self):
+        '''
+        returns position of arc among the arcs pointing to its head
+        '''
+
+        return self.head_pos
 
 class DiGraph:
 
     def __init__(self):
         '''
-        creates a digraph object
+        creates a digraph object; vertices and arcs get consecutive integer ids in the
+        order in which they are added, labels are mapped to ids by a dictionary
         '''
 
         self.vertices = []
@@ -87,9 +108,72 @@ class DiGraph:
         self.sources = []
         self.targets = []
 
+        # arcs and the lists of arcs pointing to and leaving each vertex, indexed by vertex id
         self.arcs = []
-        self.in_arcs = {}
-        self.out_arcs = {}
+        self.in_arcs = []
+        self.out_arcs = []
+
+        # arrays and orders derived from the arcs, computed on demand
+        self.csr = None
+        self.topological = None
+
+    @classmethod
+    def from_arrays(cls, tails, heads, num_vertices=None, labels=None, sources=(), targets=(),
+                    attackable=None, positions=None):
+        '''
+        creates a digraph from arrays of arc tails and heads given by vertex ids
+        tails        - array of vertex ids of the tails of arcs
+        heads        - array of vertex ids of the heads of arcs
+
+        optional:
+        num_vertices - number of vertices (default: largest id in tails and heads plus one)
+        labels       - list of vertex labels indexed by id (default: the ids)
+        sources      - ids of sources
+        targets      - ids of targets
+        attackable   - array of flags whether arcs are attackable
+        positions    - list of vertex positions indexed by id
+        '''
+
+        tails = np.asarray(tails, dtype=np.int64)
+        heads = np.asarray(heads, dtype=np.int64)
+        assert len(tails) == len(heads)
+
+        if num_vertices is None:
+            num_vertices = int(max(tails.max(initial=-1), heads.max(initial=-1))) + 1
+        if labels is None:
+            labels = range(num_vertices)
+        if positions is None:
+            positions = [None] * num_vertices
+        if attackable is None:
+            attackable = [False] * len(tails)
+
+        G = cls()
+        is_source = np.zeros(num_vertices, dtype=bool)
+        is_source[list(sources)] = True
+        is_target = np.zeros(num_vertices, dtype=bool)
+        is_target[list(targets)] = True
+
+        for i in range(num_vertices):
+            if G.add_vertex(labels[i], bool(is_source[i]), bool(is_target[i]), positions[i]) is None:
+                return None
+
+        if len(tails) > 0 and (min(tails.min(), heads.min()) < 0 or max(tails.max(), heads.max()) >= num_vertices):
+            print("ERROR: arc arrays contain an invalid vertex id")
+            return None
+
+        # position of each arc among the arcs with the same tail (head) in the order of the arrays
+        tail_pos = positions_in_groups(tails, num_vertices)
+        head_pos = positions_in_groups(heads, num_vertices)
+
+        vertices = G.vertices
+        for (a, (u, v, tp, hp)) in enumerate(zip(tails.tolist(), heads.tolist(), tail_pos.tolist(),
+                                                  head_pos.tolist())):
+            arc = Arc(vertices[u], vertices[v], bool(attackable[a]), a, tp, hp)
+            G.arcs.append(arc)
+            G.out_arcs[u].append(arc)
+            G.in_arcs[v].append(arc)
+
+        return G
 
     def add_vertex(self, v, is_source=False, is_target=False, pos=None):
         '''
@@ -98,23 +182,28 @@ class DiGraph:
         '''
 
         # check wether vertex already exists
-        if v in self.vertex_labels:
+        if v in self.label_map:
             print("did not add vertex, it already exists in graph")
             return None
 
         if is_source and is_target:
             print("added vertex being both source and target")
 
-        vert = Vertex(v, is_source, is_target, pos)
+        vert = Vertex(v, is_source, is_target, pos, len(self.vertices))
         self.label_map[v] = len(self.vertices)
         self.vertices.append(vert)
         self.vertex_labels.append(v)
+        self.in_arcs.append([])
+        self.out_arcs.append([])
 
         if is_source:
             self.sources.append(v)
         if is_target:
             self.targets.append(v)
 
+        self.csr = None
+        self.topological = None
+
         return vert
 
     def add_arc(self, u, v, attackable=False):
@@ -128,25 +217,24 @@ class DiGraph:
         '''
 
         # check whether head and tail exist
-        if not (u in self.vertex_labels and v in self.vertex_labels):
+        if not (u in self.label_map and v in self.label_map):
             print("did not add arc, head or tail does not exist in graph")
             return None
 
-        tail = self.vertices[self.label_map[u]]
-        head = self.vertices[self.label_map[v]]
+        uid = self.label_map[u]
+        vid = self.label_map[v]
+        tail = self.vertices[uid]
+        head = self.vertices[vid]
 
-        arc = Arc(tail, head, attackable)
+        arc = Arc(tail, head, attackable, len(self.arcs), len(self.out_arcs[uid]), len(self.in_arcs[vid]))
         self.arcs.append(arc)
+        self.in_arcs[vid].append(arc)
+        self.out_arcs[uid].append(arc)
 
-        if not v in self.in_arcs:
-            self.in_arcs[v] = [arc]
-        else:
-            self.in_arcs[v].append(arc)
+        self.csr = None
+        self.topological = None
 
-        if not u in self.out_arcs:
-            self.out_arcs[u] = [arc]
-        else:
-            self.out_arcs[u].append(arc)
+        return arc
 
     def get_vertices(self):
         '''
@@ -155,6 +243,23 @@ class DiGraph:
 
         return self.vertices
 
+    def get_vertex(self, v):
+        '''
+        returns vertex with label v
+        '''
+
+        if not v in self.label_map:
+            return None
+
+        return self.vertices[self.label_map[v]]
+
+    def get_vertex_id(self, v):
+        '''
+        returns id of vertex with label v
+        '''
+
+        return self.label_map.get(v)
+
     def get_vertex_labels(self):
         '''
         returns vertex labels
@@ -188,33 +293,30 @@ class DiGraph:
         returns arcs pointing to v
         '''
 
-        if not v in self.in_arcs:
+        if not v in self.label_map or len(self.in_arcs[self.label_map[v]]) == 0:
             return None
 
-        return self.in_arcs[v]
+        return self.in_arcs[self.label_map[v]]
 
     def get_out_arcs(self, v):
         '''
         returns arcs leaving v
         '''
 
-        if not v in self.out_arcs:
+        if not v in self.label_map or len(self.out_arcs[self.label_map[v]]) == 0:
             return None
 
-        return self.out_arcs[v]
+        return self.out_arcs[self.label_map[v]]
 
     def in_degree(self, v):
         '''
         returns in-degree of vertex with label v
         '''
 
-        if not v in self.vertex_labels:
+        if not v in self.label_map:
             return None
 
-        if not v in self.in_arcs:
-            return 0
-
-        return len(self.in_arcs[v])
+        return len(self.in_arcs[self.label_map[v]])
 
 
     def out_degree(self, v):
@@ -222,13 +324,72 @@ class DiGraph:
         returns out-degree of vertex with label v
         '''
 
-        if not v in self.vertex_labels:
+        if not v in self.label_map:
             return None
 
-        if not v in self.out_arcs:
-            return 0
+        return len(self.out_arcs[self.label_map[v]])
 
-        return len(self.out_arcs[v])
+    def get_csr(self):
+        '''
+        returns the adjacency of the graph in compressed sparse row format as dictionary
+        of arrays: "tails" and "heads" contain the vertex ids of the arcs, the arc ids of
+        the arcs leaving (pointing to) vertex i are "out_arcs" ("in_arcs") between
+        positions "out_ptr"[i] and "out_ptr"[i+1] ("in_ptr"[i] and "in_ptr"[i+1])
+        '''
+
+        if self.csr is None:
+            n = len(self.vertices)
+            tails = np.array([arc.tail.id for arc in self.arcs], dtype=np.int64)
+            heads = np.array([arc.head.id for arc in self.arcs], dtype=np.int64)
+
+            self.csr = {"tails": tails, "heads": heads}
+            for (kind, ids, arc_lists) in [("out", tails, self.out_arcs), ("in", heads, self.in_arcs)]:
+                ptr = np.zeros(n + 1, dtype=np.int64)
+                ptr[1:] = np.cumsum(np.bincount(ids, minlength=n))
+                self.csr[kind + "_ptr"] = ptr
+                self.csr[kind + "_arcs"] = np.array([arc.id for arcs in arc_lists for arc in arcs],
+                                                    dtype=np.int64)
+
+        return self.csr
+
+    def topological_order(self):
+        '''
+        returns the vertex labels in topological order, or None if the graph contains a cycle
+        '''
+
+        if self.topological is None:
+            csr = self.get_csr()
+            heads = csr["heads"]
+            out_ptr = csr["out_ptr"]
+            out_arcs = csr["out_arcs"]
+
+            in_degree = np.diff(csr["in_ptr"]).tolist()
+            order = [i for i in range(len(self.vertices)) if in_degree[i] == 0]
+            for i in order:
+                for v in heads[out_arcs[out_ptr[i]:out_ptr[i+1]]].tolist():
+                    in_degree[v] -= 1
+                    if in_degree[v] == 0:
+                        order.append(v)
+
+            if len(order) != len(self.vertices):
+                print("ERROR: graph contains a cycle")
+                return None
+
+            self.topological = [self.vertex_labels[i] for i in order]
+
+        return self.topological
+
+    def structure_hash(self):
+        '''
+        returns a hash of the vertices and arcs of the graph; the hash depends on
+        the order in which vertices and arcs have been added, since this order
+        determines the order of the strings at the vertices
+        '''
+
+        vertices = [(repr(v.get_label()), v.is_source, v.is_target) for v in self.vertices]
+        arcs = [(repr(a.get_tail().get_label()), repr(a.get_head().get_label())) for a in self.arcs]
+
+        return hashlib.sha256(repr((vertices, arcs)).encode()).hexdigest()
 
     def visualize(self):
         '''
@@ -267,3 +428,20 @@ class DiGraph:
             nx.draw(G, node_color=vertex_color_map, edge_color=arc_color_map, pos=vertex_positions, arrows=True)
 
         plt.show()
+
+def positions_in_groups(ids, num_groups):
+    '''
+    returns for every entry of an array of group ids the number of previous entries
+    with the same id, i.e., the position of the entry within its group
+    ids        - array of group ids
+    num_groups - number of groups
+    '''
+
+    order = np.argsort(ids, kind="stable")
+    starts = np.zeros(num_groups + 1, dtype=np.int64)
+    starts[1:] = np.cumsum(np.bincount(ids, minlength=num_groups))
+
+    pos = np.empty(len(ids), dtype=np.int64)
+    pos[order] = np.arange(len(ids)) - starts[ids[order]]
+
+    return pos
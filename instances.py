@@ -1,4 +1,7 @@
 import graph as graph
+import itertools as it
+import random
+import re
 
 def create_butterfly_network():
 
@@ -62,177 +65,253 @@ def create_RIIS():
 
     return G
 
-def create_combination_5_3():
+def add_combination_vertices(G, first, n, k, is_source=True):
+    '''
+    adds the vertices of the combination network C(n,k) to a graph, where the vertices
+    are labeled consecutively starting at first; returns the labels of the intermediate
+    vertices and of the targets
+    G         - graph to which the vertices are added
+    first     - label of the source of the combination network
+    n         - number of intermediate vertices
+    k         - number of intermediate vertices connected to a target
+    is_source - whether the first vertex is a source
+    '''
+
+    subsets = list(it.combinations(range(n), k))
+
+    G.add_vertex(first, is_source=is_source, pos=(0,0))
+    middle = [first + 1 + i for i in range(n)]
+    for i in range(n):
+        G.add_vertex(middle[i], pos=(1,(n - 1) - 2*i))
+
+    targets = [first + 1 + n + j for j in range(len(subsets))]
+    for j in range(len(subsets)):
+        G.add_vertex(targets[j], is_target=True, pos=(3,(len(subsets) - 2) - 2*j))
+
+    return middle, targets
+
+def add_combination_arcs(G, first, n, k):
+    '''
+    adds the arcs of the combination network C(n,k) whose vertices have been added by
+    add_combination_vertices to a graph
+    G     - graph to which the arcs are added
+    first - label of the source of the combination network
+    n     - number of intermediate vertices
+    k     - number of intermediate vertices connected to a target
+    '''
+
+    subsets = list(it.combinations(range(n), k))
+
+    for i in range(n):
+        G.add_arc(first, first + 1 + i)
+
+    # the targets correspond to the k-subsets in lexicographic order
+    for j in range(len(subsets)):
+        for i in subsets[j]:
+            G.add_arc(first + 1 + i, first + 1 + n + j)
+
+def create_combination_network(n, k):
+    '''
+    creates the combination network C(n,k): the source sends to n intermediate vertices
+    and every k-subset of the intermediate vertices is connected to its own target
+    n - number of intermediate vertices
+    k - number of intermediate vertices connected to a target
+    '''
+
+    if n < 1 or k < 1 or k > n:
+        print("ERROR: invalid parameters of combination network")
+        return None
 
     G = graph.DiGraph()
 
-    G.add_vertex(1, is_source=True, pos=(0,0))
+    add_combination_vertices(G, 1, n, k)
+    add_combination_arcs(G, 1, n, k)
 
-    v2 = G.add_vertex(2, pos=(1,4))
-    v3 = G.add_vertex(3, pos=(1,2))
-    v4 = G.add_vertex(4, pos=(1,0))
-    v5 = G.add_vertex(5, pos=(1,-2))
-    v6 = G.add_vertex(6, pos=(1,-4))
-
-    G.add_vertex(7, is_target=True, pos=(3,8))
-    G.add_vertex(8, is_target=True, pos=(3,6))
-    G.add_vertex(9, is_target=True, pos=(3,4))
-    G.add_vertex(10, is_target=True, pos=(3,2))
-    G.add_vertex(11, is_target=True, pos=(3,0))
-    G.add_vertex(12, is_target=True, pos=(3,-2))
-    G.add_vertex(13, is_target=True, pos=(3,-4))
-    G.add_vertex(14, is_target=True, pos=(3,-6))
-    G.add_vertex(15, is_target=True, pos=(3,-8))
-    G.add_vertex(16, is_target=True, pos=(3,-10))
+    return G
 
-    G.add_arc(1, 2)
-    G.add_arc(1, 3)
-    G.add_arc(1, 4)
-    G.add_arc(1, 5)
-    G.add_arc(1, 6)
+def create_combination_mult_network(n, k, width=2):
+    '''
+    creates the combination network C(n,k) whose source is replaced by an intermediate
+    vertex that receives width symbols via a pre-stage of width vertices from a new source
+    n     - number of intermediate vertices of the combination network
+    k     - number of intermediate vertices connected to a target
+    width - number of vertices of the pre-stage
+    '''
 
-    G.add_arc(2, 7)
-    G.add_arc(3, 7)
-    G.add_arc(4, 7)
-    G.add_arc(2, 8)
-    G.add_arc(3, 8)
-    G.add_arc(5, 8)
-    G.add_arc(2, 9)
-    G.add_arc(3, 9)
-    G.add_arc(6, 9)
-    G.add_arc(2, 10)
-    G.add_arc(4, 10)
-    G.add_arc(5, 10)
-    G.add_arc(2, 11)
-    G.add_arc(4, 11)
-    G.add_arc(6, 11)
-    G.add_arc(2, 12)
-    G.add_arc(5, 12)
-    G.add_arc(6, 12)
-    G.add_arc(3, 13)
-    G.add_arc(4, 13)
-    G.add_arc(5, 13)
-    G.add_arc(3, 14)
-    G.add_arc(4, 14)
-    G.add_arc(6, 14)
-    G.add_arc(3, 15)
-    G.add_arc(5, 15)
-    G.add_arc(6, 15)
-    G.add_arc(4, 16)
-    G.add_arc(5, 16)
-    G.add_arc(6, 16)
+    if n < 1 or k < 1 or k > n or width < 1:
+        print("ERROR: invalid parameters of combination network")
+        return None
+
+    G = graph.DiGraph()
+
+    # the pre-stage is labeled after the vertices of the combination network
+    first_pre = n + len(list(it.combinations(range(n), k))) + 2
+
+    G.add_vertex(0, is_source=True, pos=(-2,0))
+    for i in range(width):
+        G.add_vertex(first_pre + i, pos=(-1,(width - 1)/2 - i))
+    add_combination_vertices(G, 1, n, k, is_source=False)
+
+    for i in range(width):
+        G.add_arc(0, first_pre + i)
+    for i in range(width):
+        G.add_arc(first_pre + i, 1)
+    add_combination_arcs(G, 1, n, k)
 
     return G
 
-def create_combination_5_2():
+def create_generalized_butterfly(n):
+    '''
+    creates the butterfly network with n targets: the source sends to n intermediate
+    vertices, each of which is connected to its own target and to a bottleneck vertex,
+    and the bottleneck forwards its output via a relay vertex to all targets;
+    for n = 2, this is the butterfly network
+    n - number of targets
+    '''
+
+    if n < 1:
+        print("ERROR: invalid parameters of butterfly network")
+        return None
 
     G = graph.DiGraph()
-    G.add_vertex(1, is_source=True, pos=(0,0))
 
-    v2 = G.add_vertex(2, pos=(1,4))
-    v3 = G.add_vertex(3, pos=(1,2))
-    v4 = G.add_vertex(4, pos=(1,0))
-    v5 = G.add_vertex(5, pos=(1,-2))
-    v6 = G.add_vertex(6, pos=(1,-4))
-
-    G.add_vertex(7, is_target=True, pos=(3,8))
-    G.add_vertex(8, is_target=True, pos=(3,6))
-    G.add_vertex(9, is_target=True, pos=(3,4))
-    G.add_vertex(10, is_target=True, pos=(3,2))
-    G.add_vertex(11, is_target=True, pos=(3,0))
-    G.add_vertex(12, is_target=True, pos=(3,-2))
-    G.add_vertex(13, is_target=True, pos=(3,-4))
-    G.add_vertex(14, is_target=True, pos=(3,-6))
-    G.add_vertex(15, is_target=True, pos=(3,-8))
-    G.add_vertex(16, is_target=True, pos=(3,-10))
+    middle = [2 + i for i in range(n)]
+    bottleneck = n + 2
+    relay = n + 3
+    targets = [n + 4 + i for i in range(n)]
 
-    G.add_arc(1, 2)
-    G.add_arc(1, 3)
-    G.add_arc(1, 4)
-    G.add_arc(1, 5)
-    G.add_arc(1, 6)
-    G.add_arc(2, 7)
-    G.add_arc(3, 7)
-    G.add_arc(2, 8)
-    G.add_arc(4, 8)
-    G.add_arc(2, 9)
-    G.add_arc(5, 9)
-    G.add_arc(2, 10)
-    G.add_arc(6, 10)
-    G.add_arc(3, 11)
-    G.add_arc(4, 11)
-    G.add_arc(3, 12)
-    G.add_arc(5, 12)
-    G.add_arc(3, 13)
-    G.add_arc(6, 13)
-    G.add_arc(4, 14)
-    G.add_arc(5, 14)
-    G.add_arc(4, 15)
-    G.add_arc(6, 15)
-    G.add_arc(5, 16)
-    G.add_arc(6, 16)
+    G.add_vertex(1, is_source=True, pos=(0,0))
+    for i in range(n):
+        G.add_vertex(middle[i], pos=(1,(n - 1) - 2*i))
+    G.add_vertex(bottleneck, pos=(2,0))
+    G.add_vertex(relay, pos=(3,0))
+    for i in range(n):
+        G.add_vertex(targets[i], is_target=True, pos=(4,(n - 1) - 2*i))
+
+    for i in range(n):
+        G.add_arc(1, middle[i])
+    for i in range(n):
+        G.add_arc(middle[i], bottleneck)
+        G.add_arc(middle[i], targets[i])
+    G.add_arc(bottleneck, relay)
+    for i in range(n):
+        G.add_arc(relay, targets[i])
 
     return G
 
-def create_combination_5_2_mult():
+def create_layered_network(num_layers, width, min_degree, max_degree, seed=0):
+    '''
+    creates a random layered network: a source, num_layers layers of width intermediate
+    vertices, and a final layer of width targets; every vertex of a layer receives arcs
+    from a number of vertices of the previous layer that is drawn uniformly from
+    [min_degree, max_degree], and every intermediate vertex sends to at least one vertex
+    of the next layer
+    num_layers - number of layers of intermediate vertices
+    width      - number of vertices per layer
+    min_degree - minimum in-degree of vertices outside the first layer
+    max_degree - maximum in-degree of vertices outside the first layer
+    seed       - seed of the random number generator
+    '''
+
+    if num_layers < 1 or width < 1 or min_degree < 1 or min_degree > max_degree:
+        print("ERROR: invalid parameters of layered network")
+        return None
+
+    rng = random.Random(seed)
+
+    # vertex 0 is the source, layer l consists of the vertices 1 + l*width, ..., (l+1)*width
+    layers = [[1 + l*width + i for i in range(width)] for l in range(num_layers + 1)]
+    tails = []
+    heads = []
+
+    for v in layers[0]:
+        tails.append(0)
+        heads.append(v)
+
+    for l in range(1, num_layers + 1):
+        has_out_arc = set()
+        in_degree = {}
+        for v in layers[l]:
+            in_degree[v] = min(rng.randint(min_degree, max_degree), width)
+            for u in sorted(rng.sample(layers[l-1], in_degree[v])):
+                tails.append(u)
+                heads.append(v)
+                has_out_arc.add(u)
+
+        # intermediate vertices without out-arcs would not be able to forward a symbol,
+        # they send to a vertex of the next layer whose in-degree is not yet maximum
+        for u in layers[l-1]:
+            if u in has_out_arc:
+                continue
+            candidates = [v for v in layers[l] if in_degree[v] < max_degree]
+            v = rng.choice(candidates if len(candidates) > 0 else layers[l])
+            tails.append(u)
+            heads.append(v)
+            in_degree[v] += 1
+
+    positions = [(0,0)] + [(l + 1,(width - 1) - 2*i) for l in range(num_layers + 1) for i in range(width)]
+
+    return graph.DiGraph.from_arrays(tails, heads, num_vertices=1 + (num_layers + 1)*width,
+                                     sources=[0], targets=layers[num_layers], positions=positions)
+
+def create_random_multicast_network(num_vertices, num_targets, max_degree, seed=0):
+    '''
+    creates a random acyclic multicast network: vertex 0 is the source, the last num_targets
+    vertices are the targets, every other vertex receives an arc from a random preceding
+    vertex and up to max_degree - 1 further arcs from random preceding non-targets, and
+    every intermediate vertex sends to at least one succeeding vertex
+    num_vertices - number of vertices
+    num_targets  - number of targets
+    max_degree   - maximum in-degree of vertices, which is only exceeded if an
+                   intermediate vertex has no other possible successor
+    seed         - seed of the random number generator
+    '''
+
+    if num_targets < 1 or num_vertices < num_targets + 1 or max_degree < 1:
+        print("ERROR: invalid parameters of random multicast network")
+        return None
+
+    rng = random.Random(seed)
+    num_inner = num_vertices - num_targets
+    tails = []
+    heads = []
+    in_degree = [0] * num_vertices
+    out_degree = [0] * num_vertices
+
+    # vertices are created in topological order, targets only receive arcs
+    for v in range(1, num_vertices):
+        preceding = range(min(v, num_inner))
+        in_degree[v] = min(rng.randint(1, max_degree), len(preceding))
+        for u in sorted(rng.sample(preceding, in_degree[v])):
+            tails.append(u)
+            heads.append(v)
+            out_degree[u] += 1
+
+    # intermediate vertices without out-arcs send to a succeeding vertex whose in-degree
+    # is not yet maximum
+    for u in range(num_inner):
+        if out_degree[u] > 0:
+            continue
+        candidates = [v for v in range(u + 1, num_vertices) if in_degree[v] < max_degree]
+        v = rng.choice(candidates) if len(candidates) > 0 else rng.randrange(u + 1, num_vertices)
+        tails.append(u)
+        heads.append(v)
+        in_degree[v] += 1
+
+    return graph.DiGraph.from_arrays(tails, heads, num_vertices=num_vertices, sources=[0],
+                                     targets=range(num_inner, num_vertices))
 
-    G = graph.DiGraph()
+def create_combination_5_3():
 
-    G.add_vertex(0, is_source=True, pos=(-2,0))
-    G.add_vertex(17, pos=(-1,0.5))
-    G.add_vertex(18, pos=(-1,-0.5))
-    
-    G.add_vertex(1, pos=(0,0))
+    return create_combination_network(5, 3)
 
-    v2 = G.add_vertex(2, pos=(1,4))
-    v3 = G.add_vertex(3, pos=(1,2))
-    v4 = G.add_vertex(4, pos=(1,0))
-    v5 = G.add_vertex(5, pos=(1,-2))
-    v6 = G.add_vertex(6, pos=(1,-4))
-
-    G.add_vertex(7, is_target=True, pos=(3,8))
-    G.add_vertex(8, is_target=True, pos=(3,6))
-    G.add_vertex(9, is_target=True, pos=(3,4))
-    G.add_vertex(10, is_target=True, pos=(3,2))
-    G.add_vertex(11, is_target=True, pos=(3,0))
-    G.add_vertex(12, is_target=True, pos=(3,-2))
-    G.add_vertex(13, is_target=True, pos=(3,-4))
-    G.add_vertex(14, is_target=True, pos=(3,-6))
-    G.add_vertex(15, is_target=True, pos=(3,-8))
-    G.add_vertex(16, is_target=True, pos=(3,-10))
-
-    G.add_arc(0, 17)
-    G.add_arc(0, 18)
-    G.add_arc(17, 1)
-    G.add_arc(18, 1)
+def create_combination_5_2():
 
-    G.add_arc(1, 2)
-    G.add_arc(1, 3)
-    G.add_arc(1, 4)
-    G.add_arc(1, 5)
-    G.add_arc(1, 6)
-    G.add_arc(2, 7)
-    G.add_arc(3, 7)
-    G.add_arc(2, 8)
-    G.add_arc(4, 8)
-    G.add_arc(2, 9)
-    G.add_arc(5, 9)
-    G.add_arc(2, 10)
-    G.add_arc(6, 10)
-    G.add_arc(3, 11)
-    G.add_arc(4, 11)
-    G.add_arc(3, 12)
-    G.add_arc(5, 12)
-    G.add_arc(3, 13)
-    G.add_arc(6, 13)
-    G.add_arc(4, 14)
-    G.add_arc(5, 14)
-    G.add_arc(4, 15)
-    G.add_arc(6, 15)
-    G.add_arc(5, 16)
-    G.add_arc(6, 16)
+    return create_combination_network(5, 2)
 
-    return G
+def create_combination_5_2_mult():
+
+    return create_combination_mult_network(5, 2)
 
 def create_4_2_mult():
 
@@ -268,20 +347,32 @@ def create_4_2_mult():
 
     return G
     
+def get_instance_names():
+
+    return ["butterfly", "RIIS", "comb5_3", "comb5_2", "comb5_2_mult", "comb4_2_mult"]
+
+# parameterized instance names and the generators they are resolved to, e.g., comb7_3,
+# comb6_2_mult, butterfly4, layered3_4_1_2_s7 (layers, width, degrees, seed), and
+# random30_5_3_s1 (vertices, targets, maximum degree, seed)
+GENERATORS = [(r"comb(\d+)_(\d+)", create_combination_network),
+              (r"comb(\d+)_(\d+)_mult", create_combination_mult_network),
+              (r"butterfly(\d+)", create_generalized_butterfly),
+              (r"layered(\d+)_(\d+)_(\d+)_(\d+)_s(\d+)", create_layered_network),
+              (r"random(\d+)_(\d+)_(\d+)_s(\d+)", create_random_multicast_network)]
+
 def get_instance(instance_name):
 
     if instance_name == "butterfly":
         return create_butterfly_network()
     elif instance_name == "RIIS":
         return create_RIIS()
-    elif instance_name == "comb5_3":
-        return create_combination_5_3()
-    elif instance_name == "comb5_2":
-        return create_combination_5_2()
-    elif instance_name == "comb5_2_mult":
-        return create_combination_5_2_mult()
     elif instance_name == "comb4_2_mult":
         return create_4_2_mult()
-    else:
-         print("ERROR: unknown instance")
+
+    for (pattern, generator) in GENERATORS:
+        match = re.fullmatch(pattern, instance_name)
+        if not match is None:
+            return generator(*[int(arg) for arg in match.groups()])
+
+    print("ERROR: unknown instance")
     return None
@@ -0,0 +1,196 @@
+import graph as graph
+import json
+
+class NetworkBuilder:
+
+    def __init__(self):
+        '''
+        collects the vertices and arcs of a network that is read from a file, vertices are
+        numbered in the order of their first occurrence, and the network is built at once
+        when all vertices and arcs are known, so flags can be given in any order
+        '''
+
+        self.ids = {}
+        self.labels = []
+        self.is_source = []
+        self.is_target = []
+        self.positions = []
+
+        self.tails = []
+        self.heads = []
+        self.attackable = []
+
+    def vertex(self, label, is_source=False, is_target=False, pos=None):
+        '''
+        adds a vertex or updates its flags and position, returns its id
+        label     - label of vertex
+        is_source - whether vertex is source
+        is_target - whether vertex is target
+        pos       - position of vertex (for drawing)
+        '''
+
+        if not label in self.ids:
+            self.ids[label] = len(self.labels)
+            self.labels.append(label)
+            self.is_source.append(False)
+            self.is_target.append(False)
+            self.positions.append(None)
+
+        vid = self.ids[label]
+        self.is_source[vid] = self.is_source[vid] or is_source
+        self.is_target[vid] = self.is_target[vid] or is_target
+        if not pos is None:
+            self.positions[vid] = tuple(pos)
+
+        return vid
+
+    def arc(self, tail, head, attackable=False):
+        '''
+        adds an arc, vertices that have not been given before are added as intermediate vertices
+        tail       - label of tail of arc
+        head       - label of head of arc
+        attackable - whether arc is attackable
+        '''
+
+        self.tails.append(self.vertex(tail))
+        self.heads.append(self.vertex(head))
+        self.attackable.append(attackable)
+
+    def build(self):
+        '''
+        returns the network as DiGraph, or None if a source or intermediate vertex has no
+        out-arcs, since it could not send any symbol, or if the arcs contain a cycle, since
+        the maps are evaluated in topological order
+        '''
+
+        has_out_arc = set(self.tails)
+        dead_ends = [self.labels[i] for i in range(len(self.labels))
+                     if not self.is_target[i] and not i in has_out_arc]
+        if len(dead_ends) > 0:
+            print("ERROR: vertices without out-arcs need to be targets: {}".format(
+                ", ".join(str(label) for label in dead_ends)))
+            return None
+
+        # Kahn's algorithm: the vertices that are never removed lie on or behind a cycle
+        in_degree = len(self.labels) * [0]
+        out_arcs = [[] for i in range(len(self.labels))]
+        for (u, v) in zip(self.tails, self.heads):
+            in_degree[v] += 1
+            out_arcs[u].append(v)
+        queue = [i for i in range(len(self.labels)) if in_degree[i] == 0]
+        for u in queue:
+            for v in out_arcs[u]:
+                in_degree[v] -= 1
+                if in_degree[v] == 0:
+                    queue.append(v)
+        if len(queue) < len(self.labels):
+            cyclic = [self.labels[i] for i in range(len(self.labels)) if in_degree[i] > 0]
+            print("ERROR: the network needs to be acyclic, vertices on or behind a cycle: {}".format(
+                ", ".join(str(label) for label in cyclic)))
+            return None
+
+        sources = [i for i in range(len(self.labels)) if self.is_source[i]]
+        targets = [i for i in range(len(self.labels)) if self.is_target[i]]
+
+        return graph.DiGraph.from_arrays(self.tails, self.heads, num_vertices=len(self.labels),
+                                         labels=self.labels, sources=sources, targets=targets,
+                                         attackable=self.attackable, positions=self.positions)
+
+def parse_label(token):
+    '''
+    returns a vertex label, which is an integer if possible and a string otherwise
+    token - string to be parsed
+    '''
+
+    try:
+        return int(token)
+    except ValueError:
+        return token
+
+def read_edge_list(stream):
+    '''
+    reads a network from an edge list, returns the network or None in case of an error;
+    each line is empty, a comment starting with #, or one of
+        source <label> [<x> <y>]
+        target <label> [<x> <y>]
+        vertex <label> [<x> <y>]
+        <tail> <head> [attackable]
+    where vertices that are not declared are intermediate vertices
+    stream - stream the edge list is read from
+    '''
+
+    builder = NetworkBuilder()
+    kinds = {"source": (True, False), "target": (False, True), "vertex": (False, False)}
+
+    for (number, line) in enumerate(stream, 1):
+        tokens = line.split("#", 1)[0].split()
+        if len(tokens) == 0:
+            continue
+
+        try:
+            if tokens[0] in kinds and len(tokens) in [2, 4]:
+                (is_source, is_target) = kinds[tokens[0]]
+                pos = None
+                if len(tokens) == 4:
+                    pos = (float(tokens[2]), float(tokens[3]))
+                builder.vertex(parse_label(tokens[1]), is_source, is_target, pos)
+            elif len(tokens) == 2 or (len(tokens) == 3 and tokens[2] == "attackable"):
+                builder.arc(parse_label(tokens[0]), parse_label(tokens[1]), len(tokens) == 3)
+            else:
+                raise ValueError
+        except ValueError:
+            print("ERROR: cannot parse line {}: {}".format(number, line.strip()))
+            return None
+
+    return builder.build()
+
+def read_json(stream):
+    '''
+    reads a network from a JSON document of the form
+        {"vertices": [{"label": 1, "source": true, "pos": [0, 0]}, ...],
+         "arcs": [[1, 2], {"tail": 2, "head": 3, "attackable": true}, ...]}
+    where the entries "source", "target", and "pos" of vertices are optional, and
+    vertices that only occur in arcs are intermediate vertices; returns the network
+    or None in case of an error
+    stream - stream the document is read from
+    '''
+
+    try:
+        data = json.load(stream)
+    except ValueError as e:
+        print("ERROR: cannot parse JSON: {}".format(e))
+        return None
+
+    builder = NetworkBuilder()
+
+    try:
+        for vertex in data.get("vertices", []):
+            builder.vertex(vertex["label"], vertex.get("source", False), vertex.get("target", False),
+                           vertex.get("pos"))
+
+        for arc in data["arcs"]:
+            if isinstance(arc, dict):
+                builder.arc(arc["tail"], arc["head"], arc.get("attackable", False))
+            else:
+                builder.arc(arc[0], arc[1])
+    except (KeyError, IndexError, TypeError) as e:
+        print("ERROR: invalid network description: {}".format(e))
+        return None
+
+    return builder.build()
+
+def read_network(filename):
+    '''
+    reads a network from a file, files ending with .json are read by read_json and
+    all other files are read as edge lists by read_edge_list; returns None in case of an error
+    filename - name of the file
+    '''
+
+    try:
+        with open(filename) as stream:
+            if filename.endswith(".json"):
+                return read_json(stream)
+            return read_edge_list(stream)
+    except OSError as e:
+        print("ERROR: cannot read network: {}".format(e))
+        return None
@@ -1,8 +1,23 @@
 import gurobipy as gp
 import graph as graph
+import simulator as sim
+import automorphisms as aut
+import reduction as red
+import backends as bk
+import search as srch
+import separation as sep
+from backends import quicksum, set_lb, set_ub
+from profiler import PhaseProfiler, profile_phase
 import itertools as it
+import hashlib
+import json
+import os
 from itertools import chain, combinations
 import re
+import sys
+import time
+import numpy as np
+from collections.abc import Mapping
 
 def create_strings(alpha, size):
     '''
@@ -33,90 +48,439 @@ def powerset(iterable):
     s = list(iterable)
     return list(chain.from_iterable(combinations(s, r) for r in range(len(s)+1)))
 
-def create_variables(m, G, alpha, code):
-    '''
-    creates the variables of the unambiguous code model
-    m     - Gurobi model for which variables are created
-    G     - graph for which we want to compute the code
-    alpha - the alphabet
-    code  - indices of code words
-    '''
+class StringIndex:
 
-    vertices = G.get_vertices()
+    def __init__(self, G, alpha):
+        '''
+        creates an index of all strings that are needed to model codes on a graph,
+        each string table is created only once per pair (alphabet size, arity)
+        G     - graph for which we want to compute the code
+        alpha - the alphabet
+        '''
 
-    # variables to indicate the input at a vertex
-    var_input_at_node = {}
-    for c in code:
-        for v in vertices:
+        self.alpha = alpha
+        self.size_alpha = len(alpha)
 
-            # sources have no input
-            if v.is_source:
-                continue
+        # string tables, mixed-radix ids, and per-position symbols per arity
+        self.tables = {}
+        self.ids = {}
+        self.symbols = {}
+        self.marginals = {}
+        self.names = {}
+
+        # arity of the input and output strings per vertex label
+        self.in_size = {}
+        self.out_size = {}
 
+        for v in G.get_vertices():
             vl = v.get_label()
-            in_arcs = G.get_in_arcs(vl)
-            assert not in_arcs is None
 
-            in_strings = create_strings(alpha, len(in_arcs))
-            for in_str in in_strings:
-                varname = "varinCode{}Node{}Str{}".format(c,vl,string_name(str(in_str)))
-                var_input_at_node[c,v,in_str] = m.addVar(vtype=gp.GRB.BINARY, name=varname)
+            if not v.is_source:
+                in_arcs = G.get_in_arcs(vl)
+                assert not in_arcs is None
+                self.in_size[vl] = len(in_arcs)
+                self.add_table(len(in_arcs))
+
+            if not v.is_target:
+                out_arcs = G.get_out_arcs(vl)
+                assert not out_arcs is None
+                self.out_size[vl] = len(out_arcs)
+                self.add_table(len(out_arcs))
+
+    def add_table(self, size):
+        '''
+        creates the table of strings of length size if it does not exist yet
+        size - length of the strings
+        '''
+
+        key = (self.size_alpha, size)
+        if key in self.tables:
+            return
+
+        table = create_strings(self.alpha, size)
+        self.tables[key] = table
+
+        # strings are enumerated in lexicographic order, so the position of a string
+        # in the table is its mixed-radix representation in base |alpha|
+        self.ids[key] = {string: i for (i, string) in enumerate(table)}
+        self.symbols[key] = [[string[pos] for string in table] for pos in range(size)]
+
+    def strings(self, size):
+        '''
+        returns all strings of length size
+        size - length of the strings
+        '''
+
+        key = (self.size_alpha, size)
+        if not key in self.tables:
+            self.add_table(size)
+
+        return self.tables[key]
+
+    def in_strings(self, vl):
+        '''
+        returns all input strings of vertex with label vl
+        '''
+
+        return self.tables[self.size_alpha, self.in_size[vl]]
+
+    def out_strings(self, vl):
+        '''
+        returns all output strings of vertex with label vl
+        '''
+
+        return self.tables[self.size_alpha, self.out_size[vl]]
+
+    def string_id(self, string):
+        '''
+        returns the mixed-radix id of a string, i.e., its position in the string table
+        string - string whose id is computed
+        '''
+
+        return self.ids[self.size_alpha, len(string)][string]
+
+    def position_symbols(self, size, pos):
+        '''
+        returns the symbol at position pos of every string of length size,
+        ordered by string id
+        size - length of the strings
+        pos  - position within the strings
+        '''
+
+        return self.symbols[self.size_alpha, size][pos]
+
+    def symbol_ids(self, size, pos, a):
+        '''
+        returns the ids of all strings of length size having symbol a at position pos
+        size - length of the strings
+        pos  - position within the strings
+        a    - symbol
+        '''
+
+        key = (self.size_alpha, size, pos, a)
+        if not key in self.marginals:
+            symbols = self.position_symbols(size, pos)
+            self.marginals[key] = [i for i in range(len(symbols)) if symbols[i] == a]
+
+        return self.marginals[key]
+
+    def name(self, string):
+        '''
+        returns the name of a string as computed by string_name
+        string - string to be processed
+        '''
+
+        if not string in self.names:
+            self.names[string] = string_name(str(string))
+
+        return self.names[string]
+
+def add_variable_block(m, rows, cols):
+    '''
+    adds a block of binary variables to the model by a single call and returns
+    the block as list of rows
+    m    - Gurobi model for which variables are created
+    rows - number of rows of the block
+    cols - number of columns of the block
+    '''
 
-    # variables to indicate output at vertex
-    var_output_at_node = {}
-    for c in code:
-        for v in vertices:
+    variables = list(m.addVars(rows * cols, vtype=gp.GRB.BINARY).values())
+
+    return [variables[r*cols:(r+1)*cols] for r in range(rows)]
+
+class VariableFamily(Mapping):
+
+    def __init__(self, strings, kind):
+        '''
+        creates a family of variables that consists of one block per vertex; the rows of
+        input and output blocks correspond to code words and the columns to string ids,
+        the rows and columns of map blocks correspond to ids of input and output strings;
+        the family can be used as dictionary with keys (c,v,string) for input and output
+        variables and keys (v,in_str,out_str) for map variables
+        strings - index of strings
+        kind    - "input", "output", or "map"
+        '''
+
+        self.strings = strings
+        self.kind = kind
+        self.vertices = []
+        self.blocks = {}
+
+    def add_block(self, v, block):
+        '''
+        adds the block of variables of vertex v
+        v     - vertex
+        block - list of rows of variables
+        '''
+
+        self.vertices.append(v)
+        self.blocks[v.get_label()] = block
+
+    def block(self, vl):
+        '''
+        returns the block of variables of vertex with label vl
+        '''
+
+        return self.blocks[vl]
+
+    def column_strings(self, vl):
+        '''
+        returns the strings corresponding to the columns of the block of vertex with label vl
+        '''
+
+        if self.kind == "input":
+            return self.strings.in_strings(vl)
+        return self.strings.out_strings(vl)
+
+    def row_strings(self, vl):
+        '''
+        returns the strings corresponding to the rows of the map block of vertex with label vl
+        '''
+
+        return self.strings.in_strings(vl)
+
+    def __getitem__(self, key):
+
+        try:
+            if self.kind == "map":
+                (v, row_str, col_str) = key
+                vl = v.get_label()
+                row = self.strings.string_id(row_str)
+                if len(row_str) != self.strings.in_size[vl]:
+                    raise KeyError(key)
+            else:
+                (row, v, col_str) = key
+                vl = v.get_label()
+                if row < 0:
+                    raise KeyError(key)
+
+            col = self.strings.string_id(col_str)
+            if len(col_str) != len(self.column_strings(vl)[0]):
+                raise KeyError(key)
+
+            return self.blocks[vl][row][col]
+        except (AttributeError, IndexError, TypeError, ValueError):
+            raise KeyError(key)
+
+    def __iter__(self):
+
+        if self.kind == "map":
+            for v in self.vertices:
+                vl = v.get_label()
+                for row_str in self.row_strings(vl):
+                    for col_str in self.column_strings(vl):
+                        yield (v, row_str, col_str)
+            return
+
+        num_rows = max([len(block) for block in self.blocks.values()], default=0)
+        for c in range(num_rows):
+            for v in self.vertices:
+                vl = v.get_label()
+                if c >= len(self.blocks[vl]):
+                    continue
+                for col_str in self.column_strings(vl):
+                    yield (c, v, col_str)
+
+    def __len__(self):
+
+        return sum(len(block) * len(block[0]) for block in self.blocks.values() if len(block) > 0)
+
+def create_variables(m, G, alpha, code, strings=None, names=True):
+    '''
+    creates the variables of the unambiguous code model, each family of variables
+    is created by one call per vertex
+    m       - Gurobi model for which variables are created
+    G       - graph for which we want to compute the code
+    alpha   - the alphabet
+    code    - indices of code words
+    strings - index of strings (optional)
+    names   - whether variables get names (optional)
+    '''
 
-            # targets have no output
-            if v.is_target:
-                continue
+    if strings is None:
+        strings = StringIndex(G, alpha)
 
-            vl = v.get_label()
-            out_arcs = G.get_out_arcs(vl)
-            assert not out_arcs is None
+    # variables to indicate the input at a vertex, output at a vertex, and maps
+    var_input_at_node = VariableFamily(strings, "input")
+    var_output_at_node = VariableFamily(strings, "output")
+    var_map_at_node = VariableFamily(strings, "map")
 
-            out_strings = create_strings(alpha, len(out_arcs))
-            for out_str in out_strings:
-                varname = "varoutCode{}Node{}Str{}".format(c,vl,string_name(str(out_str)))
-                var_output_at_node[c,v,out_str] = m.addVar(vtype=gp.GRB.BINARY, name=varname)
+    for v in G.get_vertices():
+        vl = v.get_label()
 
-    # variables to indicate maps
-    var_map_at_node = {}
-    for v in vertices:
+        # sources have no input
+        if not v.is_source:
+            block = add_variable_block(m, len(code), len(strings.in_strings(vl)))
+            var_input_at_node.add_block(v, block)
+
+        # targets have no output
+        if not v.is_target:
+            block = add_variable_block(m, len(code), len(strings.out_strings(vl)))
+            var_output_at_node.add_block(v, block)
 
         # sources and targets don't require a map
+        if not v.is_source and not v.is_target:
+            block = add_variable_block(m, len(strings.in_strings(vl)), len(strings.out_strings(vl)))
+            var_map_at_node.add_block(v, block)
+
+    if names:
+        name_variables(m, var_input_at_node, var_output_at_node, var_map_at_node)
+
+    return var_input_at_node, var_output_at_node, var_map_at_node
+
+def name_variables(m, var_input_at_node, var_output_at_node, var_map_at_node):
+    '''
+    assigns names to all variables of the unambiguous code model
+    m                  - Gurobi model containing the variables
+    var_input_at_node  - variables modeling the input at vertices
+    var_output_at_node - variables modeling the output at vertices
+    var_map_at_node    - variables modeling the maps at vertices
+    '''
+
+    strings = var_map_at_node.strings
+    variables = []
+    names = []
+
+    for (family, prefix) in [(var_input_at_node, "varin"), (var_output_at_node, "varout")]:
+        for (vl, block) in family.blocks.items():
+            col_strings = family.column_strings(vl)
+            for c in range(len(block)):
+                for s in range(len(col_strings)):
+                    variables.append(block[c][s])
+                    names.append("{}Code{}Node{}Str{}".format(prefix,c,vl,strings.name(col_strings[s])))
+
+    for (vl, block) in var_map_at_node.blocks.items():
+        in_strings = strings.in_strings(vl)
+        out_strings = strings.out_strings(vl)
+        for i in range(len(in_strings)):
+            for o in range(len(out_strings)):
+                variables.append(block[i][o])
+                names.append("mapNode{}In{}Out{}".format(vl,strings.name(in_strings[i]),
+                                                         strings.name(out_strings[o])))
+
+    m.setAttr("VarName", variables, names)
+
+def add_code_word_variables(m, G, var_input_at_node, var_output_at_node, names=True):
+    '''
+    adds the input and output variables of a new code word to a model, returns the index
+    of the new code word
+    m                  - Gurobi model for which variables are created
+    G                  - graph for which we want to compute the code
+    var_input_at_node  - variables modeling the input at vertices
+    var_output_at_node - variables modeling the output at vertices
+    names              - whether variables get names (optional)
+    '''
+
+    strings = var_input_at_node.strings
+    c = None
+    variables = []
+    var_names = []
+
+    for (family, prefix) in [(var_input_at_node, "varin"), (var_output_at_node, "varout")]:
+        for (vl, block) in family.blocks.items():
+            col_strings = family.column_strings(vl)
+            if c is None:
+                c = len(block)
+            assert len(block) == c
+
+            row = add_variable_block(m, 1, len(col_strings))[0]
+            block.append(row)
+
+            if names:
+                variables.extend(row)
+                var_names.extend(["{}Code{}Node{}Str{}".format(prefix,c,vl,strings.name(col_str))
+                                  for col_str in col_strings])
+
+    if names:
+        m.setAttr("VarName", variables, var_names)
+
+    return c
+
+def create_constraints(m, G, alpha, code, var_input_at_node, var_output_at_node, var_map_at_node,
+                       strings=None, aggregate_compatibility=False, linearize=False):
+    '''
+    creates the basic constraints of the unambiguous code model, returns a dictionary
+    assigning to the label of each target the list of constraints that rule out
+    ambiguities, one per input string
+    m                  - Gurobi model for which variables are created
+    G                  - graph for which we want to compute the code
+    alpha              - the alphabet
+    code               - indices of code words
+    var_input_at_node  - variables modeling the input at vertices
+    var_output_at_node - variables modeling the output at vertices
+    var_map_at_node    - variables modeling the maps at vertices
+    strings            - index of strings (optional)
+
+    optional input:
+    aggregate_compatibility - whether compatibility of arcs is modeled by one constraint per
+                              arc, code word, and symbol instead of one constraint per arc,
+                              code word, and input string of the head
+    linearize               - whether the relation between input, maps, and output is modeled
+                              by linear constraints instead of products of variables
+    '''
+
+    if strings is None:
+        strings = StringIndex(G, alpha)
+
+    vertices = G.get_vertices()
+
+    create_code_word_constraints(m, G, alpha, code, var_input_at_node, var_output_at_node,
+                                 var_map_at_node, strings,
+                                 aggregate_compatibility=aggregate_compatibility, linearize=linearize)
+
+    for v in vertices:
         if v.is_source or v.is_target:
             continue
 
         vl = v.get_label()
-        in_arcs = G.get_in_arcs(vl)
-        out_arcs = G.get_out_arcs(vl)
-        assert not in_arcs is None
-        assert not out_arcs is None
+        in_strings = strings.in_strings(vl)
+        maps = var_map_at_node.block(vl)
 
-        in_strings = create_strings(alpha, len(in_arcs))
-        out_strings = create_strings(alpha, len(out_arcs))
-        for in_str in in_strings:
-            for out_str in out_strings:
-                inname = string_name(str(in_str))
-                outname = string_name(str(out_str))
-                varname = "mapNode{}In{}Out{}".format(v,inname,outname)
-                var_map_at_node[v,in_str,out_str] = m.addVar(vtype=gp.GRB.BINARY, name=varname)
+        # every vertex sends an input string to at most one output string
+        for i in range(len(in_strings)):
+            consname = "mapatmost#{}#{}".format(vl,strings.name(in_strings[i]))
+            m.addConstr(quicksum(maps[i]) <= 1, name=consname)
 
-    return var_input_at_node, var_output_at_node, var_map_at_node
+    # there are no ambiguities
+    ambiguity_constraints = {}
+    for v in vertices:
+        if not v.is_target:
+            continue
+
+        vl = v.get_label()
+        in_strings = strings.in_strings(vl)
+        inputs = var_input_at_node.block(vl)
 
-def create_constraints(m, G, alpha, code, var_input_at_node, var_output_at_node, var_map_at_node):
+        ambiguity_constraints[vl] = []
+        for i in range(len(in_strings)):
+            consname = "noambig#{}#{}".format(vl,strings.name(in_strings[i]))
+            cons = m.addConstr(quicksum(inputs[c][i] for c in code) <= 1, name=consname)
+            ambiguity_constraints[vl].append(cons)
+
+    return ambiguity_constraints
+
+def create_code_word_constraints(m, G, alpha, code, var_input_at_node, var_output_at_node,
+                                 var_map_at_node, strings=None, aggregate_compatibility=False,
+                                 linearize=False):
     '''
-    creates the basic constraints of the unambiguous code model
+    creates the constraints of the unambiguous code model that involve a single code word,
+    i.e., all basic constraints except for the definition of maps and the ambiguity constraints
     m                  - Gurobi model for which variables are created
     G                  - graph for which we want to compute the code
     alpha              - the alphabet
-    code               - indices of code words
+    code               - indices of code words for which constraints are created
     var_input_at_node  - variables modeling the input at vertices
     var_output_at_node - variables modeling the output at vertices
     var_map_at_node    - variables modeling the maps at vertices
+    strings            - index of strings (optional)
+
+    optional input:
+    see create_constraints
     '''
 
+    if strings is None:
+        strings = StringIndex(G, alpha)
+
     vertices = G.get_vertices()
 
     # every vertex has exactly one input per code word
@@ -126,14 +490,10 @@ def create_constraints(m, G, alpha, code, var_input_at_node, var_output_at_node,
                 continue
 
             vl = v.get_label()
-            in_arcs = G.get_in_arcs(vl)
-            assert not in_arcs is None
-
-            in_strings = create_strings(alpha, len(in_arcs))
+            inputs = var_input_at_node.block(vl)
 
             consname = "oneinputCode{}Node{}".format(c,vl)
-            m.addConstr(gp.quicksum(var_input_at_node[c,v,in_str] for in_str in in_strings) == 1,
-                        name=consname)
+            m.addConstr(quicksum(inputs[c]) == 1, name=consname)
 
     # every vertex has exactly one output per code word
     for c in code:
@@ -142,14 +502,10 @@ def create_constraints(m, G, alpha, code, var_input_at_node, var_output_at_node,
                 continue
 
             vl = v.get_label()
-            out_arcs = G.get_out_arcs(vl)
-            assert not out_arcs is None
-
-            out_strings = create_strings(alpha, len(out_arcs))
+            outputs = var_output_at_node.block(vl)
 
             consname = "oneoutputCode{}Node{}".format(c,vl)
-            m.addConstr(gp.quicksum(var_output_at_node[c,v,out_str] for out_str in out_strings) == 1,
-                        name=consname)
+            m.addConstr(quicksum(outputs[c]) == 1, name=consname)
 
     # construct maps at vertices
     for v in vertices:
@@ -157,52 +513,41 @@ def create_constraints(m, G, alpha, code, var_input_at_node, var_output_at_node,
             continue
         
         vl = v.get_label()
-        in_arcs = G.get_in_arcs(vl)
-        out_arcs = G.get_out_arcs(vl)
-        assert not in_arcs is None
-        assert not out_arcs is None
+        in_strings = strings.in_strings(vl)
+        out_strings = strings.out_strings(vl)
 
-        in_strings = create_strings(alpha, len(in_arcs))
-        out_strings = create_strings(alpha, len(out_arcs))
-        
-        # every vertex sends an input string to at most one output string
-        for in_str in in_strings:
-            consname = "mapatmost#{}#{}".format(vl,string_name(str(in_str)))
-            m.addConstr(gp.quicksum(var_map_at_node[v,in_str,out_str] for out_str in out_strings) <= 1,
-                        name=consname)
+        inputs = var_input_at_node.block(vl)
+        outputs = var_output_at_node.block(vl)
+        maps = var_map_at_node.block(vl)
 
         # every vertex has at least one output string when it receives an input
-        for in_str in in_strings:
+        for i in range(len(in_strings)):
             for c in code:
-                consame = "mapsatleast#{}#{}#{}".format(vl,string_name(str(in_str)),c)
-                m.addConstr(var_input_at_node[c,v,in_str] <=
-                            gp.quicksum(var_map_at_node[v,in_str,out_str] for out_str in out_strings),
-                            name=consname)
+                consname = "mapsatleast#{}#{}#{}".format(vl,strings.name(in_strings[i]),c)
+                m.addConstr(inputs[c][i] <= quicksum(maps[i]), name=consname)
 
         # relation between input, maps, and output
-        for c in code:
-            for out_str in out_strings:
-                consname = "maps#{}#{}#{}".format(vl,out_str,c)
-                m.addConstr(var_output_at_node[c,v,out_str] ==
-                            gp.quicksum(var_input_at_node[c,v,in_str]*var_map_at_node[v,in_str,out_str]
-                                        for in_str in in_strings),
-                            name=consname)
-
-    # there are no ambiguities
-    for v in vertices:
-        if not v.is_target:
+        if linearize:
+            # if the vertex receives in_str, its output coincides with the image of in_str,
+            # which is exact for binary variables since the output is unique
+            for c in code:
+                for i in range(len(in_strings)):
+                    for o in range(len(out_strings)):
+                        inname = strings.name(in_strings[i])
+                        outname = strings.name(out_strings[o])
+                        consname = "mapsup#{}#{}#{}#{}".format(vl,inname,outname,c)
+                        m.addConstr(outputs[c][o] - maps[i][o] <= 1 - inputs[c][i], name=consname)
+                        consname = "mapslow#{}#{}#{}#{}".format(vl,inname,outname,c)
+                        m.addConstr(maps[i][o] - outputs[c][o] <= 1 - inputs[c][i], name=consname)
             continue
 
-        vl = v.get_label()
-        in_arcs = G.get_in_arcs(vl)
-        assert not in_arcs is None
+        for c in code:
+            for o in range(len(out_strings)):
+                consname = "maps#{}#{}#{}".format(vl,out_strings[o],c)
+                m.addConstr(outputs[c][o] ==
+                            quicksum(inputs[c][i]*maps[i][o] for i in range(len(in_strings))),
+                            name=consname)
 
-        in_strings = create_strings(alpha, len(in_arcs))
-        for in_str in in_strings:
-            consname = "noambig#{}#{}".format(vl,string_name(str(in_str)))
-            m.addConstr(gp.quicksum(var_input_at_node[c,v,in_str] for c in code) <= 1,
-                        name=consname)
-        
     # input and output need to be compatible
     arcs = G.get_arcs();
     for arc in arcs:
@@ -217,29 +562,47 @@ def create_constraints(m, G, alpha, code, var_input_at_node, var_output_at_node,
         assert not in_arcs is None
         assert not out_arcs is None
 
-        pos_in_arcs = [i for i in range(len(in_arcs))
-                       if in_arcs[i].get_tail() == u and in_arcs[i].get_head() == v]
-        pos_out_arcs = [i for i in range(len(out_arcs))
-                        if out_arcs[i].get_tail() == u and out_arcs[i].get_head() == v]
-        assert len(pos_in_arcs) >= 1
-        assert len(pos_out_arcs) >= 1
+        # the graph stores the position of each arc in the lists of its head and tail
+        pos_in_arcs = [arc.get_head_pos()]
+        pos_out_arcs = [arc.get_tail_pos()]
+        assert in_arcs[pos_in_arcs[0]] is arc
+        assert out_arcs[pos_out_arcs[0]] is arc
+
+        in_strings = strings.in_strings(vl)
+        inputs = var_input_at_node.block(vl)
+        outputs = var_output_at_node.block(ul)
 
-        in_strings = create_strings(alpha, len(in_arcs))
-        out_strings = create_strings(alpha, len(out_arcs))
+        if aggregate_compatibility:
+            # the head receives symbol a at position i iff the tail sends a at position j
+            for c in code:
+                for i in pos_in_arcs:
+                    for j in pos_out_arcs:
+                        for a in alpha:
+                            consname = "compatible{}#{}#{}#{}#{}".format(arc,c,i,j,a)
+                            m.addConstr(quicksum(inputs[c][s]
+                                                    for s in strings.symbol_ids(len(in_arcs), i, a))
+                                        == quicksum(outputs[c][s]
+                                                       for s in strings.symbol_ids(len(out_arcs), j, a)),
+                                        name=consname)
+            continue
 
         for c in code:
             for i in pos_in_arcs:
                 for j in pos_out_arcs:
-                    for in_str in in_strings:
-                        consname = "compatible{}#{}#{}#{}#{}".format(arc,c,i,j,string_name(str(in_str)))
-                        m.addConstr(var_input_at_node[c,v,in_str] +\
-                                    gp.quicksum(var_output_at_node[c,u,out_str]
-                                                for out_str in out_strings
-                                                if in_str[i] != out_str[j])
-                                    <= 1, name=consname
-                                    )
+                    in_symbols = strings.position_symbols(len(in_arcs), i)
+
+                    # output strings of the tail that disagree with a symbol at position j
+                    disagree = {}
+                    for a in alpha:
+                        disagree[a] = [outputs[c][s] for b in alpha if b != a
+                                       for s in strings.symbol_ids(len(out_arcs), j, b)]
 
-def symmetry_handling(m, G, alpha, code, var_output_at_node):
+                    for s in range(len(in_strings)):
+                        consname = "compatible{}#{}#{}#{}#{}".format(arc,c,i,j,strings.name(in_strings[s]))
+                        m.addConstr(inputs[c][s] + quicksum(disagree[in_symbols[s]]) <= 1,
+                                    name=consname)
+
+def symmetry_handling(m, G, alpha, code, var_output_at_node, strings=None, verbose=True):
     '''
     handles symmetries, currently implemented methods:
        1) so-called column inequalities are used to enforce that the
@@ -251,9 +614,15 @@ def symmetry_handling(m, G, alpha, code, var_output_at_node):
     alpha              - the alphabet
     code               - indices of code words
     var_output_at_node - variables modeling the output at vertices
+    strings            - index of strings (optional)
+    verbose            - whether the applied methods are printed (optional)
     '''
 
-    print("APPLY SYMMETRY HANDLING: sort code words at first source")
+    if strings is None:
+        strings = StringIndex(G, alpha)
+
+    if verbose:
+        print("APPLY SYMMETRY HANDLING: sort code words at first source")
 
     # sort the output of the first source non-increasingly
     vertices = G.get_vertices()
@@ -262,24 +631,129 @@ def symmetry_handling(m, G, alpha, code, var_output_at_node):
             continue
 
         vl = v.get_label()
-        out_arcs = G.get_out_arcs(vl)
-        assert not out_arcs is None
-
-        out_strings = create_strings(alpha, len(out_arcs))
+        out_strings = strings.out_strings(vl)
+        outputs = var_output_at_node.block(vl)
 
-        # the first code word takes the first out_string
-        var_output_at_node[0,v,out_strings[0]].lb = 1
+        for c in code:
+            # the first code word takes the first out_string
+            if c == 0:
+                set_lb(outputs[0][0], 1)
+                continue
 
-        # sort the remaining code words
-        for c in range(1, len(code)):
+            # sort the remaining code words
             for j in range(len(out_strings)):
-                m.addConstr(var_output_at_node[c,v,out_strings[j]] <=\
-                            gp.quicksum(var_output_at_node[c-1,v,out_strings[i]] for i in range(j)),
+                m.addConstr(outputs[c][j] <= quicksum(outputs[c-1][:j]),
                             name="symAtNode{}#{}#{}".format(vl,c,j))
 
         break
 
-def preprocessing(m, G, alpha, var_map_at_node):
+def value_symmetry_handling(m, G, alpha, code, var_output_at_node, strings=None, verbose=True):
+    '''
+    handles the symmetries of relabeling the symbols on a single arc, which only changes
+    the maps at the tail and head of the arc: on every arc, the first code word sends symbol 0
+    and a code word can only send symbol a > 0 if one of the previous code words sends a-1
+    (value precedence); since the code words are not reordered, this is compatible with
+    symmetry_handling and automorphism_handling
+
+    m                  - Gurobi model for which variables are created
+    G                  - graph for which we want to compute the code
+    alpha              - the alphabet
+    code               - indices of code words
+    var_output_at_node - variables modeling the output at vertices
+    strings            - index of strings (optional)
+    verbose            - whether the applied methods are printed (optional)
+    '''
+
+    if strings is None:
+        strings = StringIndex(G, alpha)
+
+    if verbose:
+        print("APPLY VALUE SYMMETRY HANDLING: symbols on arcs are used in order of code words")
+
+    for v in G.get_vertices():
+        if v.is_target:
+            continue
+
+        vl = v.get_label()
+        size = strings.out_size[vl]
+        outputs = var_output_at_node.block(vl)
+
+        for p in range(size):
+            symbols = strings.position_symbols(size, p)
+
+            for c in code:
+                # code word c cannot send a symbol larger than c
+                for s in range(len(symbols)):
+                    if symbols[s] > c:
+                        set_ub(outputs[c][s], 0)
+
+                for a in alpha:
+                    if a == 0 or a > c:
+                        continue
+
+                    previous = [outputs[d][s] for d in range(c) for s in strings.symbol_ids(size, p, a-1)]
+                    m.addConstr(quicksum(outputs[c][s] for s in strings.symbol_ids(size, p, a))
+                                <= quicksum(previous),
+                                name="valAtNode{}#{}#{}#{}".format(vl,p,c,a))
+
+# largest weight of the lexicographic constraints of automorphism handling, which
+# limits the number of code words the constraints are based on
+AUTOMORPHISM_MAX_WEIGHT = 10**6
+
+def automorphism_handling(m, G, alpha, code, var_output_at_node, strings=None, interchangeable=None,
+                          verbose=True):
+    '''
+    handles symmetries of the graph, i.e., automorphisms that preserve sources and targets:
+    if an automorphism interchanges two arcs leaving a vertex (and fixes the remaining arcs
+    leaving it as well as the vertices handled before), the symbols that the code words send
+    along the first arc are lexicographically not larger than the ones along the second arc;
+    the vertices are handled starting at the first source, so the constraints are compatible
+    with symmetry_handling, returns the interchangeable arcs
+
+    m                  - Gurobi model for which variables are created
+    G                  - graph for which we want to compute the code
+    alpha              - the alphabet
+    code               - indices of code words
+    var_output_at_node - variables modeling the output at vertices
+    strings            - index of strings (optional)
+    interchangeable    - interchangeable arcs as computed by interchangeable_out_arcs,
+                         which are detected if not given (optional)
+    verbose            - whether the applied methods are printed (optional)
+    '''
+
+    if strings is None:
+        strings = StringIndex(G, alpha)
+
+    if interchangeable is None:
+        first_source = [v.get_label() for v in G.get_vertices() if v.is_source][0]
+        interchangeable = aut.interchangeable_out_arcs(G, first_source)
+
+    if verbose:
+        print("APPLY AUTOMORPHISM HANDLING: sort interchangeable arcs at {} vertices".format(
+            len(interchangeable)))
+
+    # the symbols of a column are compared as number in base |alpha|, which is restricted
+    # to the first code words to keep the coefficients small
+    num_rows = 0
+    while num_rows < len(code) and len(alpha)**(num_rows + 1) <= AUTOMORPHISM_MAX_WEIGHT:
+        num_rows += 1
+
+    for (vl, classes) in interchangeable:
+        size = strings.out_size[vl]
+        outputs = var_output_at_node.block(vl)
+
+        for positions in classes:
+            positions = sorted(positions)
+            for (p, q) in zip(positions[:-1], positions[1:]):
+                diff = [a - b for (a, b) in zip(strings.position_symbols(size, p),
+                                                strings.position_symbols(size, q))]
+                expr = quicksum(len(alpha)**(num_rows - 1 - c) * diff[s] * outputs[c][s]
+                                   for c in range(num_rows) for s in range(len(diff)) if diff[s] != 0)
+                m.addConstr(expr <= 0, name="autAtNode{}#{}#{}#{}".format(vl,p,q,num_rows))
+
+    return interchangeable
+
+def preprocessing(m, G, alpha, var_map_at_node, strings=None):
     '''
     preprocesses the model, currently implemented methods:
        1) if an intermediate vertex has in-degree 1, then the map
@@ -290,8 +764,12 @@ def preprocessing(m, G, alpha, var_map_at_node):
     alpha           - the alphabet
     code            - indices of code words
     var_map_at_node - variables modeling the maps at vertices
+    strings         - index of strings (optional)
     '''
 
+    if strings is None:
+        strings = StringIndex(G, alpha)
+
     print("APPLY PREPROCESSING: intermediate vertices with in-degree 1 have identity map")
     # maps of non-sink and non-target vertices with in-degree are the identity map
     for v in G.get_vertices():
@@ -309,20 +787,22 @@ def preprocessing(m, G, alpha, var_map_at_node):
         assert not in_arcs is None and len(in_arcs) == 1
         assert not out_arcs is None and len(out_arcs) > 0
 
-        in_strings = create_strings(alpha, len(in_arcs))
-        out_strings = create_strings(alpha, len(out_arcs))
+        in_strings = strings.in_strings(vl)
+        maps = var_map_at_node.block(vl)
 
-        for in_str in in_strings:
-            id_str = tuple(len(out_arcs) * [in_str[0]])
-            for out_str in out_strings:
+        for i in range(len(in_strings)):
+            id_str = tuple(len(out_arcs) * [in_strings[i][0]])
+            id_out = strings.string_id(id_str)
+            for o in range(len(maps[i])):
                 # fix the identity map and forbid all others
-                if out_str == id_str:
-                    var_map_at_node[v,in_str,out_str].lb = 1.0
+                if o == id_out:
+                    set_lb(maps[i][o], 1.0)
                 else:
-                    var_map_at_node[v,in_str,out_str].ub = 0.0
+                    set_ub(maps[i][o], 0.0)
         
 
-def add_cutting_planes(m, G, alpha, code, var_input_at_node, var_output_at_node, var_map_at_node):
+def add_cutting_planes(m, G, alpha, code, var_input_at_node, var_output_at_node, var_map_at_node,
+                       strings=None):
     '''
     adds cutting planes to the model, currently implemented methods:
        1) Inequalities derived from linearizing the expression
@@ -336,8 +816,12 @@ def add_cutting_planes(m, G, alpha, code, var_input_at_node, var_output_at_node,
     var_input_at_node  - variables modeling the input at vertices
     var_output_at_node - variables modeling the output at vertices
     var_map_at_node    - variables modeling the maps at vertices    
+    strings            - index of strings (optional)
     '''
 
+    if strings is None:
+        strings = StringIndex(G, alpha)
+
     # add cutting planes based on linearization and partitioning condition
     for c in code:
         for v in G.get_vertices():
@@ -346,89 +830,135 @@ def add_cutting_planes(m, G, alpha, code, var_input_at_node, var_output_at_node,
                 continue
 
             vl = v.get_label()
-            out_arcs = G.get_out_arcs(vl)
-            in_arcs = G.get_in_arcs(vl)
-            assert not out_arcs is None
-            assert not in_arcs is None
+            out_strings = strings.out_strings(vl)
+            in_strings = strings.in_strings(vl)
 
-            out_strings = create_strings(alpha, len(out_arcs))
-            in_strings = create_strings(alpha, len(in_arcs))
+            inputs = var_input_at_node.block(vl)
+            outputs = var_output_at_node.block(vl)
+            maps = var_map_at_node.block(vl)
             ###
             # we add three classes of inequalities
             ###
-            for out_str in out_strings:
+            for o in range(len(out_strings)):
+                column = [maps[i][o] for i in range(len(in_strings))]
+
                 # NOTE: in principle correct, but too many for most applications
                 # for I subset of input strings: input[I] + map[I^c,out_str] >= output[out_str]
-                # for I in powerset(in_strings):
-                #     m.addConstr(gp.quicksum(var_input_at_node[c,v,in_str] for in_str in I) +\
-                #                 gp.quicksum(var_map_at_node[v,in_str,out_str] for in_str in in_strings if not in_str in I)
-                #                 >= var_output_at_node[c,v,out_str])
+                # for I in powerset(range(len(in_strings))):
+                #     m.addConstr(gp.quicksum(inputs[c][i] for i in I) +\
+                #                 gp.quicksum(column[i] for i in range(len(in_strings)) if not i in I)
+                #                 >= outputs[c][o])
 
                 # for i in input strings: map[I\setminus{i},out_str] <= |input strings| - 2 + output[out_str] + input[i]
-                for in_str in in_strings:
-                    m.addConstr(gp.quicksum(var_map_at_node[v,i,out_str] for i in in_strings if i != in_str)
-                                <= len(in_strings) - 2 + var_input_at_node[c,v,in_str] + var_output_at_node[c,v,out_str])
+                for i in range(len(in_strings)):
+                    m.addConstr(quicksum(column[:i] + column[i+1:])
+                                <= len(in_strings) - 2 + inputs[c][i] + outputs[c][o])
 
                 # map[in_strings] <= |in_strings| = 1 + output[out_str]
-                m.addConstr(gp.quicksum(var_map_at_node[v,in_str,out_str] for in_str in in_strings)
-                            <= len(in_strings) - 1 + var_output_at_node[c,v,out_str])
+                m.addConstr(quicksum(column) <= len(in_strings) - 1 + outputs[c][o])
             
 
-def display_solution(m, G, alpha, code, var_input_at_node, var_output_at_node, var_map_at_node):
+class Solution:
+
+    def __init__(self, inputs, outputs, maps):
+        '''
+        creates a compact representation of a solution of the unambiguous code model
+        inputs  - dictionary assigning to vertex labels the array of input ids per code word
+        outputs - dictionary assigning to vertex labels the array of output ids per code word
+        maps    - dictionary assigning to vertex labels the array of output ids per input id,
+                  where -1 marks an input without image
+        '''
+
+        self.inputs = inputs
+        self.outputs = outputs
+        self.maps = maps
+
+def decode_block(x, block):
+    '''
+    decodes a block of binary variables, returns the array containing for each row the
+    column of the variable with value 1, or -1 if there is no such variable
+    x     - array of the values of all variables of the model
+    block - list of rows of variables
     '''
-    prints the solution to the screen
+
+    if len(block) == 0:
+        return np.zeros(0, dtype=np.int64)
+
+    # each row has been created by a single call, so its variables are contiguous
+    cols = len(block[0])
+    values = np.stack([x[row[0].index:row[0].index + cols] for row in block])
+
+    ids = np.argmax(values, axis=1)
+    ids[values.max(axis=1) < 0.5] = -1
+
+    return ids
+
+def extract_solution(m, var_input_at_node, var_output_at_node, var_map_at_node):
+    '''
+    reads the solution of the Gurobi model by a single call and decodes it into arrays,
+    returns None if no solution is available
     m                  - Gurobi model for which variables are created
-    G                  - graph for which we want to compute the code
-    alpha              - the alphabet
-    code               - indices of code words
     var_input_at_node  - variables modeling the input at vertices
     var_output_at_node - variables modeling the output at vertices
-    var_map_at_node    - variables modeling the maps at vertices    
+    var_map_at_node    - variables modeling the maps at vertices
     '''
 
-    if m.Status == gp.GRB.INFEASIBLE or m.Status == gp.GRB.INF_OR_UNBD:
-        print("there does not exist an unambiguous code")
-        return
-
     if m.SolCount == 0:
-        print("WARNING: cannot display solution, no solution found yet")
-        return
+        return None
+
+    # the search stores its solution in the same arrays
+    if isinstance(m, srch.BacktrackingSearch):
+        return Solution(*m.solution)
+
+    x = np.array(m.getAttr("X", m.getVars()))
+
+    inputs = {vl: decode_block(x, block) for (vl, block) in var_input_at_node.blocks.items()}
+    outputs = {vl: decode_block(x, block) for (vl, block) in var_output_at_node.blocks.items()}
+    maps = {vl: decode_block(x, block) for (vl, block) in var_map_at_node.blocks.items()}
+
+    return Solution(inputs, outputs, maps)
+
+def solution_lines(G, code, solution, strings):
+    '''
+    generates the lines of a human-readable description of a solution
+    G        - graph for which we want to compute the code
+    code     - indices of code words
+    solution - solution as returned by extract_solution
+    strings  - index of strings
+    '''
 
     vertices = G.get_vertices()
 
     # display maps at vertices
-    print("MAPS")
+    yield "MAPS"
     for v in vertices:
         vl = v.get_label()
-        print("map at {}".format(vl))
+        yield "map at {}".format(vl)
 
         if v.is_source:
-            print("\tno map since {} is source".format(vl))
+            yield "\tno map since {} is source".format(vl)
         elif v.is_target:
-            print("\tno map since {} is target".format(vl))
+            yield "\tno map since {} is target".format(vl)
         else:
-            in_arcs = G.get_in_arcs(vl)
             out_arcs = G.get_out_arcs(vl)
-            assert not in_arcs is None
             assert not out_arcs is None
 
             out_neighbors = [arc.get_head().get_label() for arc in out_arcs]
-            print("\tarcs pointing to neighbors in order {}".format(out_neighbors))
+            yield "\tarcs pointing to neighbors in order {}".format(out_neighbors)
 
-            in_strings = create_strings(alpha, len(in_arcs))
-            out_strings = create_strings(alpha, len(out_arcs))
-            for in_str in in_strings:
+            in_strings = strings.in_strings(vl)
+            out_strings = strings.out_strings(vl)
+            images = solution.maps[vl]
+            for i in range(len(in_strings)):
                 result = "?"
-                for out_str in out_strings:
-                    if var_map_at_node[v,in_str,out_str].X > 0.5:
-                        result = string_name(str(out_str))
-                        break
+                if images[i] >= 0:
+                    result = strings.name(out_strings[images[i]])
 
-                print("\t{} -> {}".format(string_name(str(in_str)), result))
+                yield "\t{} -> {}".format(strings.name(in_strings[i]), result)
             
-    print("\nCODE WORDS")
+    yield "\nCODE WORDS"
     for c in code:
-        print("\tword %d" % c)
+        yield "\tword %d" % c
         for v in vertices:
             if v.is_target:
                 continue
@@ -437,14 +967,52 @@ def display_solution(m, G, alpha, code, var_input_at_node, var_output_at_node, v
             out_arcs = G.get_out_arcs(vl)
             assert not out_arcs is None
 
-            out_strings = create_strings(alpha, len(out_arcs))
+            out_strings = strings.out_strings(vl)
 
             out_neighbors = [arc.get_head().get_label() for arc in out_arcs]
-            for out_str in out_strings:
-                if var_output_at_node[c,v,out_str].X > 0.5:
-                    print("\t\t{} -> {} arcs pointing to neighbors in order {}".format(vl, string_name(str(out_str)),out_neighbors))
+            out_id = solution.outputs[vl][c]
+            if out_id >= 0:
+                yield "\t\t{} -> {} arcs pointing to neighbors in order {}".format(vl, strings.name(out_strings[out_id]),out_neighbors)
 
-def verify_solution(m, G, alpha, code, var_input_at_node, var_output_at_node, var_map_at_node):
+def display_solution(m, G, alpha, code, var_input_at_node, var_output_at_node, var_map_at_node,
+                     strings=None, solution=None, stream=None):
+    '''
+    writes the solution to the screen or to a stream
+    m                  - Gurobi model for which variables are created
+    G                  - graph for which we want to compute the code
+    alpha              - the alphabet
+    code               - indices of code words
+    var_input_at_node  - variables modeling the input at vertices
+    var_output_at_node - variables modeling the output at vertices
+    var_map_at_node    - variables modeling the maps at vertices    
+    strings            - index of strings (optional)
+    solution           - solution as returned by extract_solution (optional)
+    stream             - stream the solution is written to, default is the screen (optional)
+    '''
+
+    if strings is None:
+        strings = StringIndex(G, alpha)
+
+    if m.Status == gp.GRB.INFEASIBLE or m.Status == gp.GRB.INF_OR_UNBD:
+        print("there does not exist an unambiguous code")
+        return
+
+    if m.SolCount == 0:
+        print("WARNING: cannot display solution, no solution found yet")
+        return
+
+    if solution is None:
+        solution = extract_solution(m, var_input_at_node, var_output_at_node, var_map_at_node)
+
+    if stream is None:
+        stream = sys.stdout
+
+    for line in solution_lines(G, code, solution, strings):
+        stream.write(line)
+        stream.write("\n")
+
+def verify_solution(m, G, alpha, code, var_input_at_node, var_output_at_node, var_map_at_node,
+                    strings=None, solution=None):
     '''
     verifies whether solution of Gurobi model indead models an unambiguous network code
     m                  - Gurobi model for which variables are created
@@ -454,7 +1022,9 @@ def verify_solution(m, G, alpha, code, var_input_at_node, var_output_at_node, va
     var_input_at_node  - variables modeling the input at vertices
     var_output_at_node - variables modeling the output at vertices
     var_map_at_node    - variables modeling the maps at vertices    
-    '''    
+    strings            - index of strings (optional)
+    solution           - solution as returned by extract_solution (optional)
+    '''
 
     # infeasible models cannot be verified
     if m.Status == gp.GRB.INFEASIBLE or m.Status == gp.GRB.INF_OR_UNBD:
@@ -464,40 +1034,21 @@ def verify_solution(m, G, alpha, code, var_input_at_node, var_output_at_node, va
         print("WARNING: cannot verify solution, no solution found yet")
         return
 
-    vertices = G.get_vertices()
+    if solution is None:
+        solution = extract_solution(m, var_input_at_node, var_output_at_node, var_map_at_node)
 
     # check whether each code word is propagated correctly
-    for c in code:
-        for v in vertices:
-
-            if v.is_source or v.is_target:
-                continue
-
-            vl = v.get_label()
-            in_arcs = G.get_in_arcs(vl)
-            out_arcs = G.get_out_arcs(vl)
-            assert not in_arcs is None
-            assert not out_arcs is None
-
-            in_strings = create_strings(alpha, len(in_arcs))
-            out_strings = create_strings(alpha, len(out_arcs))
+    for v in G.get_vertices():
 
-            # find input at vertex
-            nodeinput = None
-            for in_str in in_strings:
-                if var_input_at_node[c,v,in_str].X > 0.5:
-                    nodeinput = in_str
-                    break
+        if v.is_source or v.is_target:
+            continue
 
-            # find output at vertex
-            nodeoutput = None
-            for out_str in out_strings:
-                if var_output_at_node[c,v,out_str].X > 0.5:
-                    nodeoutput = out_str
-                    break
+        vl = v.get_label()
+        nodeinput = solution.inputs[vl][code]
+        nodeoutput = solution.outputs[vl][code]
 
-            if var_map_at_node[v,nodeinput,nodeoutput].X < 0.5:
-                print("ERROR: code is not propagated correctly")
+        if (nodeinput < 0).any() or (solution.maps[vl][nodeinput] != nodeoutput).any():
+            print("ERROR: code is not propagated correctly")
 
     print("everything fine, code has been propagated correctly")
 
@@ -509,32 +1060,94 @@ def fix_maps(maps, var_map_at_node):
     '''
 
     for (v, in_str) in maps:
-        var_map_at_node[v,in_str,maps[v,in_str]].lb = 1.0
+        set_lb(var_map_at_node[v,in_str,maps[v,in_str]], 1.0)
 
 def fix_code(init_code, var_output_at_node):
 
     nodes_fixed_code = set()
     # fix used code words
     for (c,v) in init_code:        
-        var_output_at_node[c,v,init_code[c,v]].lb = 1.0
+        set_lb(var_output_at_node[c,v,init_code[c,v]], 1.0)
         nodes_fixed_code.add(v)
 
     # forbid other code words
     # for (c,v,out_str) in var_output_at_node:
     #     if v in nodes_fixed_code and not (c,v,out_str) in init_code:
     #         var_output_at_node[c,v,out_str].ub = 0.0
-    
-def create_maps_from_solution(m, G, alpha, var_map_at_node):
+
+def add_block_start(block, ids, variables, values):
+    '''
+    collects the start values of a block of variables, rows whose id is -1 or that
+    have no id are left undefined
+    block     - list of rows of variables
+    ids       - array containing for each row the column of the variable with value 1
+    variables - list to which the variables are appended
+    values    - list to which the start values are appended
+    '''
+
+    for r in range(min(len(block), len(ids))):
+        if ids[r] < 0:
+            continue
+
+        variables.extend(block[r])
+        values.extend([1.0 if col == ids[r] else 0.0 for col in range(len(block[r]))])
+
+def set_start(m, G, alpha, start_maps, start_code, var_input_at_node, var_output_at_node,
+              var_map_at_node, use_code=True):
+    '''
+    passes a previous solution as MIP start to the model; the inputs and outputs of all
+    vertices are derived by propagating the code words through the maps, so the start
+    can stem from a smaller code or a smaller alphabet, in which case the solver needs
+    to complete it
+    m                  - Gurobi model for which variables are created
+    G                  - graph for which we want to compute the code
+    alpha              - the alphabet
+    start_maps         - dictionary with keys (v,in_str) modeling how in_str is transformed
+                         at vertex v
+    start_code         - dictionary with keys (c,v) modeling the code word c on the out-arcs
+                         of vertex v
+    var_input_at_node  - variables modeling the input at vertices
+    var_output_at_node - variables modeling the output at vertices
+    var_map_at_node    - variables modeling the maps at vertices
+    use_code           - whether the code words are part of the start or only the maps (optional)
+    '''
+
+    size_alpha = len(alpha)
+    if not use_code:
+        start_code = {}
+
+    # strings of a smaller alphabet keep their order, so they are encoded w.r.t. alpha
+    lookups = sim.encode_maps(G, size_alpha, start_maps)
+    source_outputs = sim.encode_code(G, size_alpha, start_code)
+    inputs, outputs = sim.simulate(G, size_alpha, {vl: lookups[vl][None,:] for vl in lookups},
+                                   {vl: source_outputs[vl][None,:] for vl in source_outputs})
+
+    variables = []
+    values = []
+    for (vl, block) in var_map_at_node.blocks.items():
+        add_block_start(block, lookups[vl], variables, values)
+    for (vl, block) in var_input_at_node.blocks.items():
+        add_block_start(block, inputs[vl][0], variables, values)
+    for (vl, block) in var_output_at_node.blocks.items():
+        add_block_start(block, outputs[vl][0], variables, values)
+
+    m.setAttr("Start", variables, values)
+
+def create_maps_from_solution(m, G, alpha, var_map_at_node, strings=None, solution=None):
     '''
     extracts maps at each vertex from a solution of the Gurobi model,
     returns None in case of an infeasible model
     m                  - Gurobi model for which variables are created
     G                  - graph for which we want to compute the code
     alpha              - the alphabet
-    var_map_at_node    - variables modeling the maps at vertices    
-    
+    var_map_at_node    - variables modeling the maps at vertices
+    strings            - index of strings (optional)
+    solution           - solution as returned by extract_solution (optional)
     '''
 
+    if strings is None:
+        strings = StringIndex(G, alpha)
+
     # only apply method for feasible models
     if m.Status == gp.GRB.INFEASIBLE or m.Status == gp.GRB.INF_OR_UNBD:
         return None
@@ -543,48 +1156,385 @@ def create_maps_from_solution(m, G, alpha, var_map_at_node):
         print("WARNING: cannot create maps, no solution found yet")
         return
 
-    maps = {}
-    for v in G.get_vertices():
-        
-        if v.is_source or v.is_target:
-            continue
-
-        vl = v.get_label()
-        in_arcs = G.get_in_arcs(vl)
-        out_arcs = G.get_out_arcs(vl)
-        assert not in_arcs is None
-        assert not out_arcs is None
+    if solution is None:
+        x = np.array(m.getAttr("X", m.getVars()))
+        images = {vl: decode_block(x, block) for (vl, block) in var_map_at_node.blocks.items()}
+    else:
+        images = solution.maps
 
-        in_strings = create_strings(alpha, len(in_arcs))
-        out_strings = create_strings(alpha, len(out_arcs))
+    maps = {}
+    for vl in images:
+        v = G.get_vertex(vl)
+        in_strings = strings.in_strings(vl)
+        out_strings = strings.out_strings(vl)
 
-        for in_str in in_strings:
-            for out_str in out_strings:
-                if var_map_at_node[v,in_str,out_str].X > 0.5:
-                    maps[v,in_str] = out_str
+        for i in np.nonzero(images[vl] >= 0)[0]:
+            maps[v,in_strings[i]] = out_strings[images[vl][i]]
 
     return maps
     
-def create_code_from_solution(m, G, alpha, var_output_at_node):
+def create_code_from_solution(m, G, alpha, var_output_at_node, strings=None, solution=None):
 
     # only apply method for feasible models
     if m.Status == gp.GRB.INFEASIBLE or m.Status == gp.GRB.INF_OR_UNBD:
         return None
 
+    if m.SolCount == 0:
+        return None
+
+    if strings is None:
+        strings = StringIndex(G, alpha)
+
+    if solution is None:
+        x = np.array(m.getAttr("X", m.getVars()))
+
     code_words = {}
     for v in G.get_vertices():
         if not v.is_source:
             continue
 
-        for (c,w,out_str) in var_output_at_node:
-            if w != v or var_output_at_node[c,w,out_str].X < 0.5:
-                continue
-            code_words[c,w] = out_str
+        vl = v.get_label()
+        if solution is None:
+            out_ids = decode_block(x, var_output_at_node.block(vl))
+        else:
+            out_ids = solution.outputs[vl]
+
+        out_strings = strings.out_strings(vl)
+        for c in range(len(out_ids)):
+            if out_ids[c] >= 0:
+                code_words[c,v] = out_strings[out_ids[c]]
 
     return code_words
     
+def status_name(m):
+    '''
+    returns a short description of the status of a solved Gurobi model
+    m - Gurobi model
+    '''
+
+    if m.Status == gp.GRB.OPTIMAL:
+        return "feasible"
+    if m.Status == gp.GRB.INFEASIBLE or m.Status == gp.GRB.INF_OR_UNBD:
+        return "infeasible"
+    if m.Status == gp.GRB.TIME_LIMIT:
+        return "timelimit"
+    if m.Status == gp.GRB.INTERRUPTED:
+        return "interrupted"
+    return "status{}".format(m.Status)
+
+MODEL_CACHE_VERSION = 1
+
+def model_cache_key(G, size_alpha, size_code, options):
+    '''
+    returns the key of a model in the model cache, which is a hash of the structure of
+    the graph and all parameters that influence the model
+    G          - network to be used
+    size_alpha - size of the underlying alphabet
+    size_code  - size of code to be found
+    options    - dictionary of the options used for building the model
+    '''
+
+    key = {"version": MODEL_CACHE_VERSION, "graph": G.structure_hash(), "alphabet": size_alpha,
+           "code": size_code, "options": options}
+
+    return hashlib.sha256(json.dumps(key, sort_keys=True).encode()).hexdigest()
+
+def write_model_cache(filename, m, var_input_at_node, var_output_at_node, var_map_at_node):
+    '''
+    writes a model together with the indices of its variable blocks and ambiguity constraints
+    to the files filename.mps and filename.npz
+    filename           - name of the cache files without extension
+    m                  - Gurobi model created by build_model
+    var_input_at_node  - variables modeling the input at vertices
+    var_output_at_node - variables modeling the output at vertices
+    var_map_at_node    - variables modeling the maps at vertices
+    '''
+
+    m.update()
+    m.write(filename + ".mps")
+
+    index = {}
+    for family in [var_input_at_node, var_output_at_node, var_map_at_node]:
+        for (pos, (vl, block)) in enumerate(family.blocks.items()):
+            cols = len(family.column_strings(vl))
+            index["{}{}".format(family.kind, pos)] = \
+                np.array([[var.index for var in row] for row in block], dtype=np.int64).reshape(len(block), cols)
+
+    for (pos, constraints) in enumerate(m._ambiguity_constraints.values()):
+        index["ambiguity{}".format(pos)] = np.array([cons.index for cons in constraints], dtype=np.int64)
+
+    # the index is written last, so that it only exists if the model is complete
+    np.savez(filename + ".npz", **index)
+
+def read_model_cache(filename, G, strings):
+    '''
+    reads a model written by write_model_cache, returns the model and the variables
+    modeling input, output, and maps at vertices
+    filename - name of the cache files without extension
+    G        - graph for which we want to compute the code
+    strings  - index of strings
+    '''
+
+    m = gp.read(filename + ".mps")
+    variables = m.getVars()
+    constraints = m.getConstrs()
+
+    var_input_at_node = VariableFamily(strings, "input")
+    var_output_at_node = VariableFamily(strings, "output")
+    var_map_at_node = VariableFamily(strings, "map")
+
+    with np.load(filename + ".npz") as index:
+        # blocks are stored in the order in which create_variables adds them
+        for v in G.get_vertices():
+            for (family, skip) in [(var_input_at_node, v.is_source),
+                                   (var_output_at_node, v.is_target),
+                                   (var_map_at_node, v.is_source or v.is_target)]:
+                if skip:
+                    continue
+                ids = index["{}{}".format(family.kind, len(family.vertices))]
+                family.add_block(v, [[variables[i] for i in row] for row in ids.tolist()])
+
+        m._ambiguity_constraints = {}
+        for vl in G.get_targets():
+            ids = index["ambiguity{}".format(len(m._ambiguity_constraints))]
+            m._ambiguity_constraints[vl] = [constraints[i] for i in ids.tolist()]
+
+    return m, var_input_at_node, var_output_at_node, var_map_at_node
+
+def build_model(G, alpha, code, strings, handle_symmetries=True, add_cuts=True,
+                apply_preprocessing=True, aggregate_compatibility=False, linearize=False,
+                var_names=True, handle_automorphisms=False, handle_value_symmetries=False,
+                backend="gurobi", profiler=None):
+    '''
+    builds the model for finding an unambiguous network code, returns the model and
+    the variables modeling input, output, and maps at vertices, or None if the backend
+    is not available
+    G       - graph for which we want to compute the code
+    alpha   - the alphabet
+    code    - indices of code words
+    strings - index of strings
+
+    optional input:
+    see create_model
+    '''
+
+    m = bk.create_solver_model(backend)
+    if m is None:
+        return None, None, None, None
+
+    # create variables and constraints
+    with profile_phase(profiler, "create_variables", m):
+        var_input_at_node, var_output_at_node, var_map_at_node = create_variables(m, G, alpha, code,
+                                                                                  strings,
+                                                                                  names=var_names)
+
+    # the ambiguity constraints are kept with the model to be able to extend the code later
+    with profile_phase(profiler, "create_constraints", m):
+        m._ambiguity_constraints = create_constraints(m, G, alpha, code, var_input_at_node,
+                                                      var_output_at_node, var_map_at_node, strings,
+                                                      aggregate_compatibility=aggregate_compatibility,
+                                                      linearize=linearize)
+
+    # handle options    
+    if handle_symmetries:
+        with profile_phase(profiler, "symmetry_handling", m):
+            symmetry_handling(m, G, alpha, code, var_output_at_node, strings)
+
+    if handle_value_symmetries:
+        with profile_phase(profiler, "value_symmetry_handling", m):
+            value_symmetry_handling(m, G, alpha, code, var_output_at_node, strings)
+
+    if handle_automorphisms:
+        with profile_phase(profiler, "automorphism_handling", m):
+            m._interchangeable = automorphism_handling(m, G, alpha, code, var_output_at_node, strings)
+
+    if add_cuts:
+        with profile_phase(profiler, "add_cutting_planes", m):
+            add_cutting_planes(m, G, alpha, code, var_input_at_node, var_output_at_node,
+                               var_map_at_node, strings)
+
+    if apply_preprocessing:
+        with profile_phase(profiler, "preprocessing", m):
+            preprocessing(m, G, alpha, var_map_at_node, strings)
+
+    return m, var_input_at_node, var_output_at_node, var_map_at_node
+
+def backend_options(backend, linearize, add_cuts, lazy_cuts, subset_cuts, cache_dir):
+    '''
+    returns the options linearize, add_cuts, lazy_cuts, subset_cuts, and cache_dir that are
+    effective for a backend, i.e., options the backend does not support are replaced and a
+    warning is printed; the options need to be resolved before the model is built, since
+    models that are extended later need the same options
+    backend - solver used for the model
+    see find_unambiguous_code2 for the remaining options
+    '''
+
+    # CP-SAT only supports linear constraints and models cannot be written to files
+    if backend == "cpsat" and not linearize:
+        print("WARNING: backend cpsat requires a linear model, products of variables are linearized")
+        linearize = True
+    if backend != "gurobi" and not cache_dir is None:
+        print("WARNING: the model cache is only available for backend gurobi")
+        cache_dir = None
+
+    # cuts can only be separated in Gurobi callbacks, otherwise they are added to the model
+    if lazy_cuts and backend == "cpsat":
+        print("WARNING: lazy cuts are only available for backend gurobi, cuts are added to the model")
+        lazy_cuts = False
+        add_cuts = True
+    if subset_cuts and backend == "cpsat":
+        print("WARNING: subset cuts are only available for backend gurobi")
+        subset_cuts = False
+    if lazy_cuts:
+        add_cuts = False
+
+    return linearize, add_cuts, lazy_cuts, subset_cuts, cache_dir
+
+def create_model(G, size_alpha, size_code, handle_symmetries=True, add_cuts=True,
+                 apply_preprocessing=True, init_maps=None, init_code=None,
+                 aggregate_compatibility=False, linearize=False, var_names=True,
+                 start_maps=None, start_code=None, profiler=None, cache_dir=None,
+                 handle_automorphisms=False, handle_value_symmetries=False, backend="gurobi",
+                 lazy_cuts=False, max_cut_rounds=None, max_cuts=None, subset_cuts=False):
+    '''
+    creates the model for finding an unambiguous network code, returns the model, the
+    index of strings, and the variables modeling input, output, and maps at vertices;
+    the model is None if the backend is not available
+    G          - network to be used
+    size_alpha - size of the underlying alphabet
+    size_code  - size of code to be found
+
+    optional input:
+    profiler   - PhaseProfiler measuring the phases of the build
+    see find_unambiguous_code2 for the remaining options
+    '''
+
+    alpha = range(size_alpha)
+    code = range(size_code)
+
+    # all stages share one index of the strings
+    strings = StringIndex(G, alpha)
+
+    if handle_symmetries and not init_maps is None:
+        print("WARNING: symmetric handling is active and initial maps are provided, which can be conflicting")
+    if apply_preprocessing and not init_maps is None:
+        print("WARNING: preprocessing is active and initial maps are provided, which can be conflicting")
+    if handle_automorphisms and not (init_maps is None and init_code is None):
+        print("WARNING: automorphism handling is active and initial maps or code words are provided, which can be conflicting")
+    if handle_value_symmetries and not (init_maps is None and init_code is None):
+        print("WARNING: value symmetry handling is active and initial maps or code words are provided, which can be conflicting")
+
+    (linearize, add_cuts, lazy_cuts, subset_cuts, cache_dir) = \
+        backend_options(backend, linearize, add_cuts, lazy_cuts, subset_cuts, cache_dir)
+
+    # the search does not build a model, fixings restrict it and starts are tried first
+    if backend == "search":
+        m = srch.BacktrackingSearch(G, size_alpha, size_code, handle_symmetries=handle_symmetries,
+                                    apply_preprocessing=apply_preprocessing,
+                                    handle_automorphisms=handle_automorphisms,
+                                    handle_value_symmetries=handle_value_symmetries)
+        if not init_maps is None:
+            m.fix_maps(init_maps)
+        if not init_code is None:
+            m.fix_code(init_code)
+        if not start_maps is None or not start_code is None:
+            m.set_start(start_maps, start_code)
+        return m, strings, None, None, None
+
+    options = {"handle_symmetries": handle_symmetries, "add_cuts": add_cuts,
+               "apply_preprocessing": apply_preprocessing,
+               "aggregate_compatibility": aggregate_compatibility, "linearize": linearize,
+               "var_names": var_names, "handle_automorphisms": handle_automorphisms,
+               "handle_value_symmetries": handle_value_symmetries}
+
+    m = None
+    if not cache_dir is None:
+        cache_file = os.path.join(cache_dir, model_cache_key(G, size_alpha, size_code, options))
+        if os.path.exists(cache_file + ".npz"):
+            print("LOAD MODEL FROM CACHE: {}".format(cache_file))
+            m, var_input_at_node, var_output_at_node, var_map_at_node = read_model_cache(cache_file, G,
+                                                                                          strings)
+
+    if m is None:
+        m, var_input_at_node, var_output_at_node, var_map_at_node = \
+            build_model(G, alpha, code, strings, backend=backend, profiler=profiler, **options)
+        if m is None:
+            return None, strings, None, None, None
+
+        # fixings and starts are not part of the cached model, since they vary between calls
+        if not cache_dir is None:
+            print("WRITE MODEL TO CACHE: {}".format(cache_file))
+            os.makedirs(cache_dir, exist_ok=True)
+            write_model_cache(cache_file, m, var_input_at_node, var_output_at_node, var_map_at_node)
+
+    if not init_maps is None:
+        fix_maps(init_maps, var_map_at_node)
+
+    if not init_code is None:
+        fix_code(init_code, var_output_at_node)
+
+    if not start_maps is None or not start_code is None:
+        # sorted code words of a smaller code cannot keep their positions, since the new
+        # code words may need to be placed in between, so only the maps are passed then
+        start_code = start_code or {}
+        use_code = not handle_symmetries or len(start_code) >= size_code * len(G.get_sources())
+        set_start(m, G, alpha, start_maps or {}, start_code, var_input_at_node, var_output_at_node,
+                  var_map_at_node, use_code=use_code)
+
+    families = [family for (family, separated) in [("linearization", lazy_cuts), ("subset", subset_cuts)]
+                if separated]
+    if len(families) > 0:
+        m._separator = sep.CutSeparator(G, var_input_at_node, var_output_at_node, var_map_at_node,
+                                        max_rounds=max_cut_rounds, max_cuts=max_cuts,
+                                        families=families)
+        m.Params.PreCrush = 1
+
+    if backend == "gurobi":
+        m.Params.Heuristics = 0.9
+
+    return m, strings, var_input_at_node, var_output_at_node, var_map_at_node
+
+def optimize_model(m):
+    '''
+    solves a model, cutting planes are separated in a callback if the model has a separator
+    m - model created by create_model
+    '''
+
+    separator = getattr(m, "_separator", None)
+    if separator is None:
+        m.optimize()
+        return
+
+    separator.prepare(m)
+    m.optimize(separator)
+
+def reduce_for_model(G, fixings=False):
+    '''
+    reduces the network before building a model, returns the Reduction computed by
+    reduce_network or None if the network is not reduced
+    G       - network to be used
+    fixings - whether initial maps, code words, or starts are given, which refer to the
+              original network and prevent the reduction (optional)
+    '''
+
+    if fixings:
+        print("WARNING: initial maps, code words, or starts are given, network is not reduced")
+        return None
+
+    reduction = red.reduce_network(G)
+    if not reduction is None:
+        print("REDUCE NETWORK: {}".format(reduction.summary()))
+
+    return reduction
+
 def find_unambiguous_code2(G, size_alpha, size_code, handle_symmetries=True, add_cuts=True,
-                           apply_preprocessing=True, init_maps=None, init_code=None):
+                           apply_preprocessing=True, init_maps=None, init_code=None,
+                           aggregate_compatibility=False, linearize=False, var_names=True,
+                           display=True, solution_file=None, params=None, return_stats=False,
+                           start_maps=None, start_code=None, hooks=None, trace_memory=False,
+                           cache_dir=None, handle_automorphisms=False, handle_value_symmetries=False,
+                           reduce_graph=False, backend="gurobi", lazy_cuts=False, max_cut_rounds=None,
+                           max_cuts=None, subset_cuts=False):
     '''
     finds an unambigious network code or proves that none exists
     G          - network to be used
@@ -599,48 +1549,334 @@ def find_unambiguous_code2(G, size_alpha, size_code, handle_symmetries=True, add
                           at vertex v
     init_code           - dictionary with keys (c,v) modeling the code word c on the out-arcs
                           of vertex v
+    aggregate_compatibility - whether compatibility of arcs is modeled by one constraint per
+                              arc, code word, and symbol (see create_constraints)
+    linearize               - whether the model is a linear instead of a quadratic program
+                              (see create_constraints)
+    var_names               - whether variables get names, which can be turned off to save
+                              time and memory for large models
+    display                 - whether the solution is printed to the screen
+    solution_file           - name of a file the solution is written to instead of the screen
+    params                  - dictionary of Gurobi parameters, e.g., TimeLimit or Threads
+    return_stats            - whether a dictionary of statistics about the model and the
+                              solving process is returned as third value
+    start_maps              - maps of a previous solution that are used as MIP start instead
+                              of being fixed, e.g., the maps of a code of smaller size or
+                              over a smaller alphabet
+    start_code              - code words of a previous solution that are used as MIP start,
+                              missing code words are completed by the solver
+    hooks                   - list of functions that are called as hook(phase) after each
+                              phase of building and solving the model (see PhaseProfiler)
+    trace_memory            - whether the peak of Python allocations of each phase is traced
+    cache_dir               - directory of the model cache; if the model for G, the sizes,
+                              and the options has been built before, it is read from the
+                              cache, otherwise it is built and written to the cache
+    handle_automorphisms    - whether arcs that are interchanged by automorphisms of the
+                              network are sorted (see automorphism_handling)
+    handle_value_symmetries - whether the symbols on each arc are used in the order of the
+                              code words (see value_symmetry_handling)
+    reduce_graph            - whether the network is reduced before the model is built (see
+                              reduction.reduce_network); the returned maps and code words
+                              refer to the original network
+    backend                 - solver used for the model, "gurobi" or "cpsat" (see backends.py),
+                              or "search" for the backtracking search of search.py, which
+                              builds no model and ignores the options of the formulation;
+                              parameters are given by their Gurobi names, of which CP-SAT
+                              supports TimeLimit, Threads, OutputFlag, and Seed, and the
+                              search supports TimeLimit and OutputFlag
+    lazy_cuts               - whether the cutting planes of add_cutting_planes are separated
+                              in a callback when they are violated by the LP solution of a
+                              node instead of being added to the model (see separation.py),
+                              which replaces add_cuts and requires backend gurobi
+    max_cut_rounds          - maximum number of callbacks in which cuts are separated
+    max_cuts                - maximum number of separated cuts
+    subset_cuts             - whether the exponentially many inequalities
+                              input[I] + map[I^c,out_str] >= output[out_str] for subsets I of
+                              input strings are separated in a callback (see separation.py),
+                              requires backend gurobi; the statistics of the separation are
+                              returned in the entry "separation" of the statistics
     '''
 
     alpha = range(size_alpha)
     code = range(size_code)
 
-    m = gp.Model()
+    (linearize, add_cuts, lazy_cuts, subset_cuts, cache_dir) = \
+        backend_options(backend, linearize, add_cuts, lazy_cuts, subset_cuts, cache_dir)
+
+    profiler = PhaseProfiler(hooks=hooks, trace_memory=trace_memory)
+    build_start = time.perf_counter()
+
+    reduction = None
+    if reduce_graph:
+        fixings = not (init_maps is None and init_code is None and start_maps is None
+                       and start_code is None)
+        reduction = reduce_for_model(G, fixings)
+        if not reduction is None:
+            G = reduction.reduced
+
+    m, strings, var_input_at_node, var_output_at_node, var_map_at_node = \
+        create_model(G, size_alpha, size_code, handle_symmetries=handle_symmetries,
+                     add_cuts=add_cuts, apply_preprocessing=apply_preprocessing,
+                     init_maps=init_maps, init_code=init_code,
+                     aggregate_compatibility=aggregate_compatibility, linearize=linearize,
+                     var_names=var_names, start_maps=start_maps, start_code=start_code,
+                     profiler=profiler, cache_dir=cache_dir,
+                     handle_automorphisms=handle_automorphisms,
+                     handle_value_symmetries=handle_value_symmetries, backend=backend,
+                     lazy_cuts=lazy_cuts, max_cut_rounds=max_cut_rounds, max_cuts=max_cuts,
+                     subset_cuts=subset_cuts)
+
+    if m is None:
+        if return_stats:
+            return None, None, None
+        return None, None
+
+    if not params is None:
+        for (name, value) in params.items():
+            m.setParam(name, value)
+
+    m.update()
+    build_time = time.perf_counter() - build_start
+
+    with profiler.phase("optimize", m):
+        optimize_model(m)
+
+    with profiler.phase("extraction", m):
+        # read all values of the solution at once
+        solution = extract_solution(m, var_input_at_node, var_output_at_node, var_map_at_node)
+
+        # create maps
+        maps = create_maps_from_solution(m, G, alpha, var_map_at_node, strings, solution=solution)
+
+        # create code for sources
+        code_words = create_code_from_solution(m, G, alpha, var_output_at_node, strings,
+                                               solution=solution)
+
+    if not solution_file is None:
+        with open(solution_file, "w") as stream:
+            display_solution(m, G, alpha, code, var_input_at_node, var_output_at_node, var_map_at_node,
+                             strings, solution=solution, stream=stream)
+    elif display:
+        display_solution(m, G, alpha, code, var_input_at_node, var_output_at_node, var_map_at_node,
+                         strings, solution=solution)
+    verify_solution(m, G, alpha, code, var_input_at_node, var_output_at_node, var_map_at_node,
+                    strings, solution=solution)
+
+    # the solution is displayed for the reduced network, but returned for the original one
+    if not reduction is None:
+        maps, code_words = reduction.restore(size_alpha, maps, code_words)
+        G = reduction.G
+
+    # check the code independently of the model by pushing all code words through the maps
+    if not maps is None and not code_words is None:
+        if sim.verify_code(G, size_alpha, maps, code_words):
+            print("simulation confirms that the code is unambiguous")
+
+    if return_stats:
+        stats = {"status": status_name(m), "build_time": build_time, "solve_time": m.Runtime,
+                 "num_vars": m.NumVars, "num_constrs": m.NumConstrs + m.NumQConstrs,
+                 "num_nonzeros": m.NumNZs + m.NumQCNZs, "node_count": m.NodeCount,
+                 "gap": m.MIPGap if m.SolCount > 0 else None, "phases": profiler.phases}
+        if not getattr(m, "_separator", None) is None:
+            stats["separation"] = m._separator.statistics()
+        return maps, code_words, stats
 
-    # create variables and constraints
-    var_input_at_node, var_output_at_node, var_map_at_node = create_variables(m, G, alpha, code)
-    create_constraints(m, G, alpha, code, var_input_at_node, var_output_at_node, var_map_at_node)
+    return maps, code_words
+
+def extend_code(m, G, alpha, var_input_at_node, var_output_at_node, var_map_at_node, strings,
+                handle_symmetries=True, add_cuts=True, aggregate_compatibility=False,
+                linearize=False, var_names=True, handle_automorphisms=False,
+                handle_value_symmetries=False):
+    '''
+    extends the code of a model created by create_model by one code word, the variables and
+    constraints of the existing code words are kept, returns the index of the new code word
+    m                  - Gurobi model created by create_model
+    G                  - graph for which we want to compute the code
+    alpha              - the alphabet
+    var_input_at_node  - variables modeling the input at vertices
+    var_output_at_node - variables modeling the output at vertices
+    var_map_at_node    - variables modeling the maps at vertices
+    strings            - index of strings
+
+    optional input:
+    see create_model, the options need to coincide with the ones used for creating m
+    '''
+
+    c = add_code_word_variables(m, G, var_input_at_node, var_output_at_node, names=var_names)
+
+    create_code_word_constraints(m, G, alpha, [c], var_input_at_node, var_output_at_node,
+                                 var_map_at_node, strings,
+                                 aggregate_compatibility=aggregate_compatibility, linearize=linearize)
+
+    # the new code word must not share an input string at a target with the other code words
+    for (vl, constraints) in m._ambiguity_constraints.items():
+        inputs = var_input_at_node.block(vl)
+        for i in range(len(constraints)):
+            m.chgCoeff(constraints[i], inputs[c][i], 1.0)
 
-    # handle options    
     if handle_symmetries:
-        if not init_maps is None:
-            print("WARNING: symmetric handling is active and initial maps are provided, which can be conflicting")
-        symmetry_handling(m, G, alpha, code, var_output_at_node)
+        symmetry_handling(m, G, alpha, [c], var_output_at_node, strings, verbose=False)
 
-    if add_cuts:
-        add_cutting_planes(m, G, alpha, code, var_input_at_node, var_output_at_node, var_map_at_node)
+    if handle_value_symmetries:
+        value_symmetry_handling(m, G, alpha, [c], var_output_at_node, strings, verbose=False)
 
-    if apply_preprocessing:
-        if not init_maps is None:
-            print("WARNING: preprocessing is active and initial maps are provided, which can be conflicting")
-        preprocessing(m, G, alpha, var_map_at_node)
+    # the arcs are sorted with respect to more code words if the coefficients permit
+    if handle_automorphisms and len(alpha)**(c + 1) <= AUTOMORPHISM_MAX_WEIGHT:
+        m._interchangeable = automorphism_handling(m, G, alpha, range(c + 1), var_output_at_node,
+                                                   strings, getattr(m, "_interchangeable", None),
+                                                   verbose=False)
 
-    if not init_maps is None:
-        fix_maps(init_maps, var_map_at_node)
+    if add_cuts:
+        add_cutting_planes(m, G, alpha, [c], var_input_at_node, var_output_at_node, var_map_at_node,
+                           strings)
 
-    if not init_code is None:
-        fix_code(init_code, var_output_at_node)
+    return c
+
+def max_code_size_bound(G, size_alpha):
+    '''
+    returns a trivial upper bound on the size of an unambiguous code, namely the minimum of
+    the number of input strings of the targets and the number of outputs of all sources
+    G          - network to be used
+    size_alpha - size of the underlying alphabet
+    '''
 
-    m.Params.Heuristics = 0.9
-    m.optimize()
+    num_outputs = 1
+    for vl in G.get_sources():
+        num_outputs *= size_alpha**G.out_degree(vl)
 
-    display_solution(m, G, alpha, code, var_input_at_node, var_output_at_node, var_map_at_node)
-    verify_solution(m, G, alpha, code, var_input_at_node, var_output_at_node, var_map_at_node)
+    return min([size_alpha**G.in_degree(vl) for vl in G.get_targets()] + [num_outputs])
 
-    # create maps
-    maps = create_maps_from_solution(m, G, alpha, var_map_at_node)
+def find_maximum_code(G, size_alpha, start_size=1, max_size=None, handle_symmetries=True,
+                      add_cuts=True, apply_preprocessing=True, aggregate_compatibility=False,
+                      linearize=False, var_names=True, display=True, params=None, iis_file=None,
+                      warm_start=True, handle_automorphisms=False, handle_value_symmetries=False,
+                      reduce_graph=False, backend="gurobi", lazy_cuts=False, max_cut_rounds=None,
+                      max_cuts=None, subset_cuts=False):
+    '''
+    finds an unambiguous network code of maximum size by solving a sequence of models of
+    increasing code size, each of which extends the previous model by one code word;
+    returns the maximum size found, the maps and code words of a code of this size, and
+    whether the next code size has been proven to be infeasible
+    G          - network to be used
+    size_alpha - size of the underlying alphabet
 
-    # create code for sources
-    code_words = create_code_from_solution(m, G, alpha, var_output_at_node)    
+    optional input:
+    start_size - size of the first code to be found
+    max_size   - largest code size to be tested (default: bound of max_code_size_bound)
+    iis_file   - name of a file an irreducible inconsistent subsystem is written to if
+                 the next code size is infeasible
+    warm_start - whether the code of each size is passed as MIP start to the next size
+    see find_unambiguous_code2 for the remaining options
+    '''
 
-    return maps, code_words
+    alpha = range(size_alpha)
 
+    if start_size < 1:
+        print("ERROR: codes need to contain at least one code word")
+        return None, None, None, False
+
+    reduction = None
+    if reduce_graph:
+        reduction = reduce_for_model(G)
+        if not reduction is None:
+            G = reduction.reduced
+
+    if max_size is None:
+        max_size = max_code_size_bound(G, size_alpha)
+
+    # the new code words need the options of the model the backend has been built with
+    (linearize, add_cuts, lazy_cuts, subset_cuts, cache_dir) = \
+        backend_options(backend, linearize, add_cuts, lazy_cuts, subset_cuts, None)
+
+    m, strings, var_input_at_node, var_output_at_node, var_map_at_node = \
+        create_model(G, size_alpha, start_size, handle_symmetries=handle_symmetries,
+                     add_cuts=add_cuts, apply_preprocessing=apply_preprocessing,
+                     aggregate_compatibility=aggregate_compatibility, linearize=linearize,
+                     var_names=var_names, handle_automorphisms=handle_automorphisms,
+                     handle_value_symmetries=handle_value_symmetries, backend=backend,
+                     lazy_cuts=lazy_cuts, max_cut_rounds=max_cut_rounds, max_cuts=max_cuts,
+                     subset_cuts=subset_cuts)
+
+    if m is None:
+        return None, None, None, False
+
+    # the cuts of new code words are separated as well
+    if not getattr(m, "_separator", None) is None:
+        add_cuts = False
+
+    if not params is None:
+        for (name, value) in params.items():
+            m.setParam(name, value)
+
+    best_size = start_size - 1
+    best_solution = None
+    maps = None
+    code_words = None
+    size_code = start_size
+
+    while True:
+        optimize_model(m)
+        status = status_name(m)
+        print("code size {}: {} after {:.2f}s".format(size_code, status, m.Runtime))
+
+        if status != "feasible":
+            break
+
+        best_size = size_code
+        best_solution = extract_solution(m, var_input_at_node, var_output_at_node, var_map_at_node)
+        maps = create_maps_from_solution(m, G, alpha, var_map_at_node, strings, solution=best_solution)
+        code_words = create_code_from_solution(m, G, alpha, var_output_at_node, strings,
+                                               solution=best_solution)
+
+        if size_code >= max_size:
+            break
+
+        if backend == "search":
+            size_code = m.add_code_word() + 1
+        else:
+            size_code = extend_code(m, G, alpha, var_input_at_node, var_output_at_node, var_map_at_node,
+                                    strings, handle_symmetries=handle_symmetries, add_cuts=add_cuts,
+                                    aggregate_compatibility=aggregate_compatibility,
+                                    linearize=linearize, var_names=var_names,
+                                    handle_automorphisms=handle_automorphisms,
+                                    handle_value_symmetries=handle_value_symmetries) + 1
+
+        # the previous maps remain valid, only the new code word needs to be found
+        if warm_start and backend == "search":
+            m.set_start(maps, code_words)
+        elif warm_start:
+            set_start(m, G, alpha, maps, code_words, var_input_at_node, var_output_at_node,
+                      var_map_at_node, use_code=not (handle_symmetries or handle_automorphisms))
+
+    proven = status == "infeasible" or best_size >= max_size
+    if best_size >= max_size:
+        print("code size {} attains the upper bound".format(best_size))
+    elif status == "infeasible":
+        print("code size {} is infeasible, proven after {:.2f}s and {:.0f} nodes".format(
+            size_code, m.Runtime, m.NodeCount))
+        if not iis_file is None and backend != "gurobi":
+            print("WARNING: irreducible inconsistent subsystems are only available for backend gurobi")
+        elif not iis_file is None:
+            m.computeIIS()
+            m.write(iis_file)
+    else:
+        print("WARNING: could not decide whether a code of size {} exists".format(size_code))
+
+    if best_solution is None:
+        print("there does not exist an unambiguous code of size {}".format(start_size))
+        return best_size, None, None, proven
+
+    print("largest unambiguous code found has size {}".format(best_size))
+
+    if display:
+        for line in solution_lines(G, range(best_size), best_solution, strings):
+            print(line)
+
+    if not reduction is None:
+        maps, code_words = reduction.restore(size_alpha, maps, code_words)
+        G = reduction.G
+
+    if sim.verify_code(G, size_alpha, maps, code_words):
+        print("simulation confirms that the code is unambiguous")
+
+    return best_size, maps, code_words, proven
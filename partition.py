@@ -0,0 +1,176 @@
+import portfolio as pf
+import itertools as it
+import math
+import os
+import time
+
+# maximum number of subproblems if the number of fixed code words is chosen automatically
+MAX_SUBPROBLEMS = 256
+
+def describe(fixing):
+    '''
+    returns a short description of the fixings of a subproblem
+    fixing - dictionary of initial code words or maps, or None
+    '''
+
+    if fixing is None:
+        return "no fixing"
+
+    return ", ".join("{} at {}: {}".format(key[0], key[1].get_label(), out_str) if isinstance(key[0], int)
+                     else "{} at {}: {}".format(key[1], key[0].get_label(), out_str)
+                     for (key, out_str) in fixing.items())
+
+def split_by_code_words(G, size_alpha, size_code, depth=None, handle_symmetries=True):
+    '''
+    splits the problem into disjoint subproblems by fixing the code words 1,...,depth at the
+    first source, returns the list of initial codes of the subproblems; with symmetry handling,
+    code word 0 is the first string and the fixed code words are increasing as required by
+    symmetry_handling, otherwise all combinations of strings are used
+    G                 - network to be used
+    size_alpha        - size of the underlying alphabet
+    size_code         - size of code to be found
+    depth             - number of code words that are fixed, default is the number that
+                        leads to most subproblems, but at most MAX_SUBPROBLEMS (optional)
+    handle_symmetries - whether the subproblems use symmetry handling (optional)
+    '''
+
+    sources = G.get_sources()
+    if len(sources) == 0:
+        return [None]
+
+    v = G.get_vertex(sources[0])
+    strings = list(it.product(range(size_alpha), repeat=G.out_degree(sources[0])))
+
+    if depth is None:
+        if handle_symmetries:
+            counts = [math.comb(len(strings) - 1, d) for d in range(1, size_code)]
+        else:
+            counts = [len(strings) ** d for d in range(1, size_code)]
+        feasible_counts = [count for count in counts if count <= MAX_SUBPROBLEMS]
+        depth = 1 if len(feasible_counts) == 0 else counts.index(max(feasible_counts)) + 1
+    depth = min(depth, size_code - 1)
+    if depth <= 0:
+        return [None]
+
+    if handle_symmetries:
+        choices = it.combinations(strings[1:], depth)
+    else:
+        choices = it.product(strings, repeat=depth)
+
+    return [{(c + 1, v): choice[c] for c in range(depth)} for choice in choices]
+
+def split_by_map(G, size_alpha, vl=None):
+    '''
+    splits the problem into disjoint subproblems by fixing the image of the input string
+    consisting of zeros at an intermediate vertex, returns the list of initial maps of the
+    subproblems; since the image of an input string that is not received can be chosen
+    arbitrarily, every code is contained in one subproblem
+    G          - network to be used
+    size_alpha - size of the underlying alphabet
+    vl         - label of the vertex, default is an intermediate vertex of maximum in-degree
+    '''
+
+    if vl is None:
+        vertices = [v for v in G.get_vertices() if not v.is_source and not v.is_target]
+        if len(vertices) == 0:
+            return [None]
+        vl = max(vertices, key=lambda v: G.in_degree(v.get_label())).get_label()
+
+    v = G.get_vertex(vl)
+    in_str = tuple(G.in_degree(vl) * [0])
+
+    return [{(v, in_str): out_str}
+            for out_str in it.product(range(size_alpha), repeat=G.out_degree(vl))]
+
+def find_unambiguous_code_partitioned(G, size_alpha, size_code, split="code", depth=None, vl=None,
+                                      workers=None, params=None, display=True, return_stats=False,
+                                      **options):
+    '''
+    splits the problem into disjoint subproblems, which are solved in parallel worker
+    processes; returns the maps and code words of the first subproblem that has a code,
+    which is verified by simulation, or None, None; the problem is infeasible if all
+    subproblems are infeasible
+    G          - network to be used
+    size_alpha - size of the underlying alphabet
+    size_code  - size of code to be found
+
+    optional input:
+    split        - "code" to fix code words at the first source (see split_by_code_words)
+                   or "map" to fix an image of a map (see split_by_map)
+    depth        - number of code words that are fixed by split "code" (default: automatic)
+    vl           - label of the vertex whose map is fixed by split "map"
+    workers      - number of subproblems that are solved in parallel (default: number of cores)
+    params       - dictionary of solver parameters of all subproblems, the threads are
+                   shared among the workers unless Threads is given
+    display      - whether the output of the subproblem that has a code is printed
+    return_stats - whether a dictionary with the status, the number of subproblems, the
+                   numbers of feasible, infeasible, and undecided subproblems, the wall time,
+                   and the results of the finished subproblems is returned as third value
+    options      - options of find_unambiguous_code2 used for all subproblems
+    '''
+
+    if split == "code":
+        fixings = split_by_code_words(G, size_alpha, size_code, depth,
+                                      options.get("handle_symmetries", True))
+        configurations = [dict(options, init_code=init_code) for init_code in fixings]
+    elif split == "map":
+        fixings = split_by_map(G, size_alpha, vl)
+        configurations = [dict(options, init_maps=init_maps) for init_maps in fixings]
+    else:
+        print("ERROR: unknown split {}, use code or map".format(split))
+        return None, None
+
+    if workers is None:
+        workers = min(len(configurations), os.cpu_count() or 1)
+
+    print("SOLVE PARTITION: {} subproblems on {} workers".format(len(configurations), workers))
+
+    start = time.perf_counter()
+    finished = []
+    counts = {"feasible": 0, "infeasible": 0, "undecided": 0}
+    answer = None
+
+    results = pf.solve_configurations(G, size_alpha, size_code, configurations, workers,
+                                      pf.common_parameters(workers, params), display)
+    try:
+        for (i, status, maps, code_words, stats, output, elapsed) in results:
+            print("subproblem {} ({}): {} after {:.2f}s".format(i, describe(fixings[i]), status, elapsed))
+            finished.append({"subproblem": i, "status": status, "time": elapsed,
+                             "solve_time": None if stats is None else stats.get("solve_time")})
+
+            if status == "feasible" and not maps is None:
+                counts["feasible"] += 1
+                answer = (i, maps, code_words, output)
+                break
+            elif status == "infeasible":
+                counts["infeasible"] += 1
+            else:
+                counts["undecided"] += 1
+    finally:
+        results.close()
+
+    wall_time = time.perf_counter() - start
+
+    if not answer is None:
+        status = "feasible"
+        (i, maps, code_words, output) = answer
+        if display:
+            print(output, end="")
+        print("subproblem {} has an unambiguous code, found after {:.2f}s".format(i, wall_time))
+    elif counts["infeasible"] == len(configurations):
+        status = "infeasible"
+        maps = None
+        code_words = None
+        print("all {} subproblems are infeasible, there does not exist an unambiguous code".format(
+            len(configurations)))
+    else:
+        status = "unknown"
+        maps = None
+        code_words = None
+        print("WARNING: {} of {} subproblems are undecided".format(counts["undecided"], len(configurations)))
+
+    if return_stats:
+        return maps, code_words, {"status": status, "subproblems": len(configurations),
+                                  "wall_time": wall_time, "results": finished, **counts}
+
+    return maps, code_words
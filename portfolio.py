@@ -0,0 +1,219 @@
+import networkcode as nwc
+import simulator as sim
+import contextlib
+import io
+import multiprocessing
+import os
+import queue
+import time
+
+# configurations of the portfolio, each consisting of options of find_unambiguous_code2
+# and, under the key params, solver parameters that are added to the common ones
+PORTFOLIO = [{},
+             {"handle_symmetries": False},
+             {"add_cuts": False},
+             {"apply_preprocessing": False},
+             {"linearize": True},
+             {"handle_automorphisms": True, "handle_value_symmetries": True},
+             {"add_cuts": False, "subset_cuts": True},
+             {"params": {"Seed": 1}},
+             {"params": {"Seed": 2, "MIPFocus": 1}},
+             {"backend": "search"},
+             {"backend": "cpsat"}]
+
+def describe(configuration):
+    '''
+    returns a short description of a configuration
+    configuration - dictionary of options and parameters
+    '''
+
+    if len(configuration) == 0:
+        return "default"
+
+    return ", ".join("{}={}".format(key, value) for (key, value) in configuration.items())
+
+def solve_configuration(G, size_alpha, size_code, index, configuration, params, display, results):
+    '''
+    solves the problem with one configuration of the portfolio in a worker process and puts
+    the tuple (index, status, maps, code words, statistics, output) into the result queue
+    G             - network to be used
+    size_alpha    - size of the underlying alphabet
+    size_code     - size of code to be found
+    index         - index of the configuration
+    configuration - dictionary of options and parameters
+    params        - dictionary of common solver parameters
+    display       - whether the solution is written to the output
+    results       - queue for the results
+    '''
+
+    options = dict(configuration)
+    config_params = dict(params)
+    config_params.update(options.pop("params", {}))
+
+    output = io.StringIO()
+    try:
+        with contextlib.redirect_stdout(output):
+            maps, code_words, stats = nwc.find_unambiguous_code2(G, size_alpha, size_code, var_names=False,
+                                                                 display=display, params=config_params,
+                                                                 return_stats=True, **options)
+        status = "error" if stats is None else stats["status"]
+        results.put((index, status, maps, code_words, stats, output.getvalue()))
+    except Exception as e:
+        results.put((index, "error", None, None, {"error": str(e)}, output.getvalue()))
+
+def solve_configurations(G, size_alpha, size_code, configurations, workers, params, display):
+    '''
+    solves the problem with each configuration in parallel worker processes and yields the
+    tuple (index, status, maps, code words, statistics, output, time) of every configuration
+    as soon as it is finished; the maps and code words refer to the vertices of G and are
+    verified by simulation; workers that are still running when the generator is closed
+    are terminated
+    G              - network to be used
+    size_alpha     - size of the underlying alphabet
+    size_code      - size of code to be found
+    configurations - list of configurations, each a dictionary of options and parameters
+    workers        - number of configurations that run in parallel
+    params         - dictionary of common solver parameters
+    display        - whether the solution is written to the output of a configuration
+    '''
+
+    # workers are forked, so that scripts without main guard are not executed again
+    context = multiprocessing.get_context("fork")
+    results = context.Queue()
+
+    start = time.perf_counter()
+    pending = list(range(len(configurations)))
+    running = {}
+
+    try:
+        while len(pending) > 0 or len(running) > 0:
+            while len(pending) > 0 and len(running) < workers:
+                i = pending.pop(0)
+                running[i] = context.Process(target=solve_configuration,
+                                             args=(G, size_alpha, size_code, i, configurations[i],
+                                                   params, display, results), daemon=True)
+                running[i].start()
+
+            try:
+                (i, status, maps, code_words, stats, output) = results.get(timeout=1)
+            except queue.Empty:
+                # workers that crashed cannot report a result
+                for (i, process) in list(running.items()):
+                    if not process.is_alive() and process.exitcode != 0:
+                        del running[i]
+                        yield (i, "error", None, None, {"error": "exit code {}".format(process.exitcode)},
+                               "", time.perf_counter() - start)
+                continue
+
+            running.pop(i).join()
+
+            # the maps refer to copies of the vertices made by the worker
+            if not maps is None and not code_words is None:
+                maps = {(G.get_vertex(v.get_label()), in_str): out_str
+                        for ((v, in_str), out_str) in maps.items()}
+                code_words = {(c, G.get_vertex(v.get_label())): out_str
+                              for ((c, v), out_str) in code_words.items()}
+                if not sim.verify_code(G, size_alpha, maps, code_words, verbose=False):
+                    print("WARNING: code of configuration {} is not verified by simulation".format(i))
+                    status = "unverified"
+
+            yield (i, status, maps, code_words, stats, output, time.perf_counter() - start)
+    finally:
+        for process in running.values():
+            process.terminate()
+            process.join()
+
+def common_parameters(workers, params):
+    '''
+    returns the solver parameters of all workers, which do not write a log and share the
+    threads of the machine unless the parameters say otherwise
+    workers - number of workers
+    params  - dictionary of solver parameters or None
+    '''
+
+    common_params = {"OutputFlag": 0, "Threads": max(1, (os.cpu_count() or 1) // workers)}
+    if not params is None:
+        common_params.update(params)
+
+    return common_params
+
+def find_unambiguous_code_portfolio(G, size_alpha, size_code, configurations=None, workers=None,
+                                    params=None, display=True, return_stats=False, options=None):
+    '''
+    solves the problem with several configurations in parallel worker processes, returns
+    the maps and code words of the first configuration that finds a code, which is verified
+    by simulation, or None, None if the first definitive answer is that no code exists; the
+    remaining workers are terminated as soon as an answer is found
+    G          - network to be used
+    size_alpha - size of the underlying alphabet
+    size_code  - size of code to be found
+
+    optional input:
+    configurations - list of configurations, each a dictionary of options of
+                     find_unambiguous_code2 and, under the key params, of solver
+                     parameters (default: PORTFOLIO)
+    workers        - number of configurations that run in parallel (default: number of
+                     cores, at most the number of configurations)
+    params         - dictionary of solver parameters of all configurations, the threads are
+                     shared among the workers unless Threads is given
+    display        - whether the output of the configuration that answers is printed
+    return_stats   - whether a dictionary with the status, the index of the answering
+                     configuration, the wall time, the results of the finished configurations,
+                     and the statistics of the answering configuration is returned as third value
+    options        - dictionary of options of find_unambiguous_code2 that are used by all
+                     configurations unless a configuration sets them differently
+    '''
+
+    if configurations is None:
+        configurations = PORTFOLIO
+    if workers is None:
+        workers = min(len(configurations), os.cpu_count() or 1)
+
+    print("SOLVE PORTFOLIO: {} configurations on {} workers".format(len(configurations), workers))
+
+    start = time.perf_counter()
+    finished = []
+    answer = None
+
+    if not options is None:
+        solved = [dict(options, **configuration) for configuration in configurations]
+    else:
+        solved = configurations
+
+    results = solve_configurations(G, size_alpha, size_code, solved, workers,
+                                   common_parameters(workers, params), display)
+    try:
+        for (i, status, maps, code_words, stats, output, elapsed) in results:
+            print("configuration {} ({}): {} after {:.2f}s".format(i, describe(configurations[i]), status,
+                                                                   elapsed))
+            finished.append({"configuration": i, "status": status, "time": elapsed})
+
+            if status == "infeasible" or (status == "feasible" and not maps is None):
+                answer = (i, status, maps, code_words, stats, output)
+                break
+    finally:
+        results.close()
+
+    wall_time = time.perf_counter() - start
+
+    if answer is None:
+        print("WARNING: no configuration could decide whether a code of size {} exists".format(size_code))
+        if return_stats:
+            return None, None, {"status": "unknown", "configuration": None, "wall_time": wall_time,
+                                "results": finished, "stats": None}
+        return None, None
+
+    (i, status, maps, code_words, stats, output) = answer
+    if display:
+        print(output, end="")
+    print("configuration {} ({}) answered after {:.2f}s".format(i, describe(configurations[i]), wall_time))
+
+    if status == "infeasible":
+        maps = None
+        code_words = None
+
+    if return_stats:
+        return maps, code_words, {"status": status, "configuration": i, "wall_time": wall_time,
+                                  "results": finished, "stats": stats}
+
+    return maps, code_words
@@ -0,0 +1,79 @@
+import contextlib
+import time
+import tracemalloc
+
+class PhaseProfiler:
+
+    def __init__(self, hooks=None, trace_memory=False):
+        '''
+        collects the wall time, the peak of Python allocations, and the number of added
+        variables and constraints of the phases of building and solving a Gurobi model
+        hooks        - list of functions that are called as hook(phase) after each phase,
+                       where phase is the dictionary of statistics of the phase (optional)
+        trace_memory - whether the peak of Python allocations is traced, which slows down
+                       the build (optional)
+        '''
+
+        self.hooks = [] if hooks is None else list(hooks)
+        self.trace_memory = trace_memory
+        self.phases = []
+
+    @contextlib.contextmanager
+    def phase(self, name, m):
+        '''
+        measures the phase name of building or solving model m
+        name - name of the phase
+        m    - Gurobi model
+        '''
+
+        # pending modifications of previous phases must not be counted for this phase
+        m.update()
+        num_vars = m.NumVars
+        num_constrs = m.NumConstrs + m.NumQConstrs
+
+        started_tracing = False
+        if self.trace_memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                started_tracing = True
+            tracemalloc.reset_peak()
+
+        start = time.perf_counter()
+        try:
+            yield
+            m.update()
+        finally:
+            phase = {"name": name, "time": time.perf_counter() - start, "peak_memory": None}
+
+            if self.trace_memory:
+                phase["peak_memory"] = tracemalloc.get_traced_memory()[1] / 2**20
+                if started_tracing:
+                    tracemalloc.stop()
+
+        phase["vars"] = m.NumVars - num_vars
+        phase["constrs"] = m.NumConstrs + m.NumQConstrs - num_constrs
+        self.phases.append(phase)
+
+        for hook in self.hooks:
+            hook(phase)
+
+    def total_time(self, names):
+        '''
+        returns the total time of all phases with the given names
+        names - names of phases
+        '''
+
+        return sum(phase["time"] for phase in self.phases if phase["name"] in names)
+
+def profile_phase(profiler, name, m):
+    '''
+    returns a context that measures a phase if a profiler is given and does nothing otherwise
+    profiler - profiler or None
+    name     - name of the phase
+    m        - Gurobi model
+    '''
+
+    if profiler is None:
+        return contextlib.nullcontext()
+
+    return profiler.phase(name, m)
@@ -0,0 +1,249 @@
+import graph as graph
+import itertools as it
+
+class Reduction:
+
+    def __init__(self, G, reduced, arc_of, relays, dropped, merged):
+        '''
+        stores a reduced network together with the information needed to transfer codes
+        of the reduced network back to the original network
+        G       - original network
+        reduced - reduced network
+        arc_of  - list assigning to each original arc id the id of the arc of the reduced
+                  network that carries the same symbols, or None if the arc has been dropped
+        relays  - labels of contracted relay vertices, which forward their input
+        dropped - labels of vertices that do not lie on a path from a source to a target
+        merged  - dictionary assigning to labels of merged targets the label of the target
+                  they have been merged into
+        '''
+
+        self.G = G
+        self.reduced = reduced
+        self.arc_of = arc_of
+        self.relays = relays
+        self.dropped = dropped
+        self.merged = merged
+
+    def summary(self):
+        '''
+        returns a description of the applied reductions
+        '''
+
+        return "{} relays contracted, {} vertices dropped, {} targets merged ({} -> {} vertices, {} -> {} arcs)".format(
+            len(self.relays), len(self.dropped), len(self.merged), len(self.G.get_vertices()),
+            len(self.reduced.get_vertices()), len(self.G.get_arcs()), len(self.reduced.get_arcs()))
+
+    def restore_string(self, string, arcs, pos_of):
+        '''
+        returns the string on arcs of the original network, given the string on the
+        corresponding arcs of the reduced network; dropped arcs carry symbol 0
+        string - string of the reduced network
+        arcs   - arcs of the original network
+        pos_of - function returning the position of a reduced arc within string
+        '''
+
+        reduced_arcs = self.reduced.get_arcs()
+
+        return tuple(0 if self.arc_of[arc.id] is None else string[pos_of(reduced_arcs[self.arc_of[arc.id]])]
+                     for arc in arcs)
+
+    def restore(self, size_alpha, maps, code_words):
+        '''
+        transfers maps and code words of the reduced network to the original network, returns
+        the maps and code words; relays forward their input, dropped vertices send symbol 0
+        on all arcs, and merged targets receive the same symbols as their representatives
+        size_alpha - size of the underlying alphabet
+        maps       - maps of the reduced network as returned by find_unambiguous_code2
+        code_words - code words of the reduced network as returned by find_unambiguous_code2
+        '''
+
+        if maps is None or code_words is None:
+            return maps, code_words
+
+        G = self.G
+        restored_maps = {}
+        restored_code = {}
+
+        for ((v, in_str), out_str) in maps.items():
+            vl = v.get_label()
+            in_arcs = G.get_in_arcs(vl)
+            out_arcs = G.get_out_arcs(vl)
+            restored_in = self.restore_string(in_str, in_arcs, lambda arc: arc.get_head_pos())
+            restored_out = self.restore_string(out_str, out_arcs, lambda arc: arc.get_tail_pos())
+            restored_maps[G.get_vertex(vl), restored_in] = restored_out
+
+        # relays forward the symbol of their only remaining in-arc to all remaining out-arcs
+        for vl in self.relays:
+            in_arcs = G.get_in_arcs(vl)
+            out_arcs = G.get_out_arcs(vl)
+            for a in range(size_alpha):
+                restored_in = tuple(0 if self.arc_of[arc.id] is None else a for arc in in_arcs)
+                restored_out = tuple(0 if self.arc_of[arc.id] is None else a for arc in out_arcs)
+                restored_maps[G.get_vertex(vl), restored_in] = restored_out
+
+        for vl in self.dropped:
+            v = G.get_vertex(vl)
+            if v.is_source or v.is_target or G.in_degree(vl) == 0:
+                continue
+            zero = tuple(G.out_degree(vl) * [0])
+            for in_str in it.product(range(size_alpha), repeat=G.in_degree(vl)):
+                restored_maps[v, in_str] = zero
+
+        for ((c, v), out_str) in code_words.items():
+            vl = v.get_label()
+            restored_code[c, G.get_vertex(vl)] = self.restore_string(out_str, G.get_out_arcs(vl),
+                                                                    lambda arc: arc.get_tail_pos())
+
+        size_code = len(set(c for (c, v) in code_words))
+        for vl in self.dropped:
+            v = G.get_vertex(vl)
+            if v.is_source and G.out_degree(vl) > 0:
+                for c in range(size_code):
+                    restored_code[c, v] = tuple(G.out_degree(vl) * [0])
+
+        return restored_maps, restored_code
+
+def reachable(G, starts, forward):
+    '''
+    returns the ids of the vertices that are reachable from the vertices with the given ids,
+    arcs leaving targets and arcs pointing to sources are not used
+    G       - graph
+    starts  - ids of start vertices
+    forward - whether arcs are traversed from tail to head or from head to tail
+    '''
+
+    found = set(starts)
+    stack = list(starts)
+    while len(stack) > 0:
+        i = stack.pop()
+        arcs = G.out_arcs[i] if forward else G.in_arcs[i]
+        for arc in arcs:
+            if arc.get_tail().is_target or arc.get_head().is_source:
+                continue
+            j = arc.get_head().get_id() if forward else arc.get_tail().get_id()
+            if not j in found:
+                found.add(j)
+                stack.append(j)
+
+    return found
+
+def reduce_network(G):
+    '''
+    reduces a network before a model is built, returns a Reduction or None if the network
+    cannot be reduced; the following reductions are applied until none of them applies:
+       1) vertices that do not lie on a path from a source to a target are dropped
+       2) intermediate vertices with in- and out-degree 1 are contracted, i.e., the arcs
+          pointing to and leaving such a relay are replaced by one arc
+       3) targets whose in-arcs have the same tails are merged, since the tails can send
+          the same symbols to all of them
+    G - network to be reduced
+    '''
+
+    vertices = G.get_vertices()
+    sources = [v.get_id() for v in vertices if v.is_source]
+    targets = [v.get_id() for v in vertices if v.is_target]
+
+    from_sources = reachable(G, sources, True)
+    to_targets = reachable(G, targets, False)
+
+    for i in targets:
+        if not i in from_sources:
+            print("WARNING: target {} cannot be reached from a source, network is not reduced".format(
+                vertices[i].get_label()))
+            return None
+
+    kept = [i in to_targets if v.is_source else (v.is_target or (i in from_sources and i in to_targets))
+            for (i, v) in enumerate(vertices)]
+
+    if not any(kept[i] for i in sources):
+        print("WARNING: no source reaches a target, network is not reduced")
+        return None
+
+    # current arcs as triples [tail id, head id, ids of original arcs carrying the same symbols]
+    arcs = []
+    in_arcs = [[] for v in vertices]
+    out_arcs = [[] for v in vertices]
+    for arc in G.get_arcs():
+        (i, j) = (arc.get_tail().get_id(), arc.get_head().get_id())
+        if kept[i] and kept[j] and not vertices[i].is_target and not vertices[j].is_source:
+            out_arcs[i].append(len(arcs))
+            in_arcs[j].append(len(arcs))
+            arcs.append([i, j, [arc.id]])
+
+    dropped = [v.get_label() for (i, v) in enumerate(vertices) if not kept[i]]
+    relays = []
+    merged = {}
+
+    changed = True
+    while changed:
+        changed = False
+
+        # contract relays, the arc pointing to a relay takes the place of the leaving arc
+        for (i, v) in enumerate(vertices):
+            if not kept[i] or v.is_source or v.is_target:
+                continue
+            if len(in_arcs[i]) != 1 or len(out_arcs[i]) != 1:
+                continue
+
+            a = in_arcs[i][0]
+            b = out_arcs[i][0]
+            j = arcs[b][1]
+            arcs[a][1] = j
+            arcs[a][2].extend(arcs[b][2])
+            in_arcs[j][in_arcs[j].index(b)] = a
+            arcs[b] = None
+
+            kept[i] = False
+            relays.append(v.get_label())
+            changed = True
+
+        # merge targets with the same tails into the first of them
+        representatives = {}
+        for i in targets:
+            if not kept[i]:
+                continue
+
+            key = tuple(sorted(arcs[a][0] for a in in_arcs[i]))
+            if not key in representatives:
+                representatives[key] = i
+                continue
+
+            r = representatives[key]
+            unused = list(in_arcs[r])
+            for a in in_arcs[i]:
+                b = next(b for b in unused if arcs[b][0] == arcs[a][0])
+                unused.remove(b)
+                arcs[b][2].extend(arcs[a][2])
+                out_arcs[arcs[a][0]].remove(a)
+                arcs[a] = None
+
+            in_arcs[i] = []
+            kept[i] = False
+            merged[vertices[i].get_label()] = vertices[r].get_label()
+            changed = True
+
+    # build the reduced network, vertices keep their labels
+    ids = {}
+    for (i, v) in enumerate(vertices):
+        if kept[i]:
+            ids[i] = len(ids)
+
+    reduced_arcs = [arc for arc in arcs if not arc is None]
+    original_arcs = G.get_arcs()
+    kept_vertices = [v for (i, v) in enumerate(vertices) if kept[i]]
+    reduced = graph.DiGraph.from_arrays([ids[arc[0]] for arc in reduced_arcs],
+                                        [ids[arc[1]] for arc in reduced_arcs],
+                                        num_vertices=len(ids),
+                                        labels=[v.get_label() for v in kept_vertices],
+                                        sources=[ids[i] for i in sources if kept[i]],
+                                        targets=[ids[i] for i in targets if kept[i]],
+                                        attackable=[any(original_arcs[a].is_attackable for a in arc[2])
+                                                    for arc in reduced_arcs],
+                                        positions=[v.pos for v in kept_vertices])
+
+    arc_of = [None] * len(original_arcs)
+    for (r, arc) in enumerate(reduced_arcs):
+        for a in arc[2]:
+            arc_of[a] = r
+
+    return Reduction(G, reduced, arc_of, relays, dropped, merged)
@@ -0,0 +1,410 @@
+import gurobipy as gp
+import automorphisms as aut
+import reduction as red
+import simulator as sim
+import itertools as it
+import time
+import numpy as np
+
+# parameters of Gurobi that are supported by the search
+SEARCH_PARAMS = ["TimeLimit", "OutputFlag"]
+
+# number of search nodes between two checks of the time limit
+TIME_CHECK_INTERVAL = 1000
+
+class BacktrackingSearch:
+
+    def __init__(self, G, size_alpha, size_code, handle_symmetries=True, apply_preprocessing=True,
+                 handle_automorphisms=False, handle_value_symmetries=False):
+        '''
+        creates an exact backtracking search for unambiguous network codes, which replaces
+        the model for small alphabets and codes; the search assigns the code words at the
+        sources and then the maps at the remaining vertices in topological order, where the
+        inputs of a vertex are determined by the previous vertices, and it backtracks as soon
+        as two code words can no longer be distinguished at a target; it provides the part of
+        the interface of a Gurobi model that is needed to solve it and report the status
+        G                       - network to be used
+        size_alpha              - size of the underlying alphabet
+        size_code               - size of code to be found
+        handle_symmetries       - whether the code words at the first source are sorted as
+                                  by symmetry_handling (optional)
+        apply_preprocessing     - whether vertices with in-degree 1 use the identity map as
+                                  by preprocessing (optional)
+        handle_automorphisms    - whether interchangeable arcs are sorted as by
+                                  automorphism_handling (optional)
+        handle_value_symmetries - whether symbols on arcs are used in order of the code words
+                                  as by value_symmetry_handling (optional)
+        '''
+
+        self.G = G
+        self.size_alpha = size_alpha
+        self.size_code = size_code
+        self.handle_symmetries = handle_symmetries
+        self.apply_preprocessing = apply_preprocessing
+        self.handle_value_symmetries = handle_value_symmetries
+
+        self.time_limit = None
+        self.output_flag = 1
+
+        # fixed and preferred output ids, indexed by (label, input id) and (code word, label)
+        self.fixed_maps = {}
+        self.fixed_code = {}
+        self.start_maps = {}
+        self.start_code = {}
+
+        self.Status = gp.GRB.LOADED
+        self.SolCount = 0
+        self.Runtime = 0.0
+        self.NodeCount = 0
+        self.MIPGap = 0.0
+        self.solution = None
+
+        vertices = G.get_vertices()
+        sources = G.get_sources()
+        self.first_source = sources[0] if len(sources) > 0 else None
+
+        # the sources are assigned first, so that all targets can be checked afterwards
+        self.order = list(sources) + [vl for vl in G.topological_order()
+                                      if not G.get_vertex(vl).is_source and not G.get_vertex(vl).is_target]
+        self.in_arcs = {vl: [arc.id for arc in G.get_in_arcs(vl) or []] for vl in self.order}
+        self.out_arcs = {vl: [arc.id for arc in G.get_out_arcs(vl) or []] for vl in self.order}
+
+        # symbols of the output strings per length, ordered by string id
+        self.symbols = {}
+        for vl in self.order:
+            size = len(self.out_arcs[vl])
+            if not size in self.symbols:
+                self.symbols[size] = list(it.product(range(size_alpha), repeat=size))
+
+        # ids of vertices that can reach a target, per target
+        targets = [v.get_id() for v in vertices if v.is_target]
+        reach = {t: red.reachable(G, [t], False) for t in targets}
+        self.useful = {vl: any(G.get_vertex_id(vl) in reach[t] for t in targets) for vl in self.order}
+
+        # after a vertex is assigned, the code words need to differ on the arcs that leave the
+        # assigned vertices and can reach a target, unless an unassigned source reaches it
+        self.checks = []
+        assigned = set()
+        for (s, vl) in enumerate(self.order):
+            assigned.add(G.get_vertex_id(vl))
+            checks = []
+            for t in targets:
+                if not G.get_vertex_id(vl) in reach[t]:
+                    continue
+                if any(not G.get_vertex_id(ul) in assigned and G.get_vertex_id(ul) in reach[t]
+                       for ul in sources):
+                    continue
+                arcs = [arc.id for arc in G.get_arcs() if arc.get_tail().get_id() in assigned
+                        and not arc.get_head().get_id() in assigned and arc.get_head().get_id() in reach[t]]
+                checks.append(arcs)
+            self.checks.append(checks)
+
+        self.interchangeable = {}
+        if handle_automorphisms and not self.first_source is None:
+            for (vl, classes) in aut.interchangeable_out_arcs(G, self.first_source):
+                self.interchangeable[vl] = [sorted(positions) for positions in classes]
+
+    # the search does not build a model
+    NumVars = 0
+    NumConstrs = 0
+    NumNZs = 0
+    NumQConstrs = 0
+    NumQCNZs = 0
+
+    def add_code_word(self):
+        '''
+        adds a code word to the code to be found, returns the index of the new code word
+        '''
+
+        self.size_code += 1
+
+        return self.size_code - 1
+
+    def fix_maps(self, maps):
+        '''
+        fixes the maps at vertices
+        maps - dictionary with keys (v,in_str) modeling how in_str is transformed at vertex v
+        '''
+
+        for ((v, in_str), out_str) in maps.items():
+            key = (v.get_label(), sim.string_to_id(in_str, self.size_alpha))
+            self.fixed_maps[key] = sim.string_to_id(out_str, self.size_alpha)
+
+    def fix_code(self, code_words):
+        '''
+        fixes code words at sources
+        code_words - dictionary with keys (c,v) modeling the code word c on the out-arcs of v
+        '''
+
+        for ((c, v), out_str) in code_words.items():
+            self.fixed_code[c, v.get_label()] = sim.string_to_id(out_str, self.size_alpha)
+
+    def set_start(self, maps, code_words):
+        '''
+        sets maps and code words that are tried first by the search
+        maps       - dictionary with keys (v,in_str) as for fix_maps, or None
+        code_words - dictionary with keys (c,v) as for fix_code, or None
+        '''
+
+        self.start_maps = {}
+        self.start_code = {}
+
+        for ((v, in_str), out_str) in (maps or {}).items():
+            key = (v.get_label(), sim.string_to_id(in_str, self.size_alpha))
+            self.start_maps[key] = sim.string_to_id(out_str, self.size_alpha)
+
+        for ((c, v), out_str) in (code_words or {}).items():
+            self.start_code[c, v.get_label()] = sim.string_to_id(out_str, self.size_alpha)
+
+    def setParam(self, name, value):
+        '''
+        sets a parameter, given by the name of the corresponding Gurobi parameter
+        name  - name of the Gurobi parameter
+        value - value of the parameter
+        '''
+
+        if not name in SEARCH_PARAMS:
+            print("WARNING: parameter {} is not supported by the search and ignored".format(name))
+        elif name == "TimeLimit":
+            self.time_limit = value
+        else:
+            self.output_flag = value
+
+    def update(self):
+        '''
+        does nothing, since there is no model to be updated
+        '''
+
+        pass
+
+    def input_classes(self, vl):
+        '''
+        returns the classes of code words that receive the same input at a vertex as list of
+        pairs (input id, code words), ordered by the first code word of each class; code words
+        at sources form classes of their own
+        vl - label of the vertex
+        '''
+
+        if self.G.get_vertex(vl).is_source:
+            return [(None, [c]) for c in range(self.size_code)]
+
+        classes = {}
+        for c in range(self.size_code):
+            in_id = 0
+            for a in self.in_arcs[vl]:
+                in_id = in_id * self.size_alpha + self.sym[a][c]
+            classes.setdefault(in_id, []).append(c)
+
+        return list(classes.items())
+
+    def candidates(self, vl, in_id, c):
+        '''
+        returns the output ids that can be assigned to a class of code words at a vertex,
+        ordered such that a given start is tried first
+        vl    - label of the vertex
+        in_id - input id of the class, None at sources
+        c     - first code word of the class
+        '''
+
+        out_arcs = self.out_arcs[vl]
+        symbols = self.symbols[len(out_arcs)]
+        candidates = range(len(symbols))
+
+        if in_id is None:
+            fixed = self.fixed_code.get((c, vl))
+            start = self.start_code.get((c, vl))
+        else:
+            fixed = self.fixed_maps.get((vl, in_id))
+            start = self.start_maps.get((vl, in_id))
+
+        if not fixed is None:
+            candidates = [fixed]
+
+        # the first source sends the code words in increasing order, starting with string 0
+        if self.handle_symmetries and vl == self.first_source:
+            previous = self.out_ids[vl][c-1] if c > 0 else -1
+            candidates = [o for o in candidates if o > previous and (c > 0 or o == 0)]
+
+        # a vertex with in-degree 1 sends its input along all leaving arcs
+        if self.apply_preprocessing and in_id is not None and len(self.in_arcs[vl]) == 1:
+            identity = sum(in_id * self.size_alpha**p for p in range(len(out_arcs)))
+            candidates = [o for o in candidates if o == identity]
+
+        # symbol a > 0 can only be sent along an arc if a previous code word sends a-1
+        if self.handle_value_symmetries:
+            bounds = [min(c, 1 + max(self.sym[a][:c], default=-1)) for a in out_arcs]
+            candidates = [o for o in candidates
+                          if all(symbols[o][p] <= bounds[p] for p in range(len(out_arcs)))]
+
+        candidates = list(candidates)
+
+        # the output of a vertex that does not reach a target is irrelevant
+        if not self.useful[vl] and fixed is None:
+            candidates = candidates[:1]
+
+        if not start is None and start in candidates:
+            candidates.remove(start)
+            candidates.insert(0, start)
+
+        return candidates
+
+    def assign(self, vl, cws, o):
+        '''
+        assigns an output id to a class of code words at a vertex, -1 removes the assignment
+        vl  - label of the vertex
+        cws - code words of the class
+        o   - output id
+        '''
+
+        out_arcs = self.out_arcs[vl]
+        symbols = self.symbols[len(out_arcs)][o] if o >= 0 else [-1] * len(out_arcs)
+
+        for c in cws:
+            self.out_ids[vl][c] = o
+            for p in range(len(out_arcs)):
+                self.sym[out_arcs[p]][c] = symbols[p]
+
+    def distinguishable(self, s):
+        '''
+        returns whether all pairs of code words that are assigned at the vertex of step s
+        still differ on the arcs that can reach each target
+        s - step of the search
+        '''
+
+        for arcs in self.checks[s]:
+            seen = set()
+            for c in range(self.size_code):
+                key = tuple(self.sym[a][c] for a in arcs)
+                if -1 in key:
+                    continue
+                if key in seen:
+                    return False
+                seen.add(key)
+
+        return True
+
+    def sorted_arcs(self, vl):
+        '''
+        returns whether the symbols sent along interchangeable arcs leaving a vertex are
+        lexicographically sorted
+        vl - label of the vertex
+        '''
+
+        out_arcs = self.out_arcs[vl]
+        for positions in self.interchangeable.get(vl, []):
+            for (p, q) in zip(positions[:-1], positions[1:]):
+                if self.sym[out_arcs[p]] > self.sym[out_arcs[q]]:
+                    return False
+
+        return True
+
+    def bounded(self):
+        '''
+        returns whether the search cannot succeed since fewer strings than code words can be
+        sent along the arcs that can reach some target
+        '''
+
+        return any(self.size_alpha**len(arcs) < self.size_code for checks in self.checks for arcs in checks)
+
+    def optimize(self):
+        '''
+        runs the search until a code is found, the search space is exhausted, or the time
+        limit is hit
+        '''
+
+        start = time.perf_counter()
+
+        self.Status = gp.GRB.INFEASIBLE
+        self.SolCount = 0
+        self.NodeCount = 0
+        self.solution = None
+
+        self.sym = [[-1] * self.size_code for arc in self.G.get_arcs()]
+        self.out_ids = {vl: [-1] * self.size_code for vl in self.order}
+        classes = [None] * len(self.order)
+
+        # a frame consists of the step, the index of the class, its candidates, and the
+        # index of the next candidate
+        stack = []
+        if len(self.order) > 0 and not self.bounded():
+            classes[0] = self.input_classes(self.order[0])
+            stack.append([0, 0, self.candidates(self.order[0], *self.first_code_word(classes[0][0])), 0])
+
+        while len(stack) > 0:
+            frame = stack[-1]
+            (s, j, candidates, k) = frame
+            vl = self.order[s]
+            cws = classes[s][j][1]
+
+            if k == len(candidates):
+                self.assign(vl, cws, -1)
+                stack.pop()
+                continue
+
+            frame[3] += 1
+            self.NodeCount += 1
+            if (not self.time_limit is None and self.NodeCount % TIME_CHECK_INTERVAL == 0
+                and time.perf_counter() - start > self.time_limit):
+                self.Status = gp.GRB.TIME_LIMIT
+                break
+
+            self.assign(vl, cws, candidates[k])
+            if not self.distinguishable(s):
+                continue
+
+            if j + 1 < len(classes[s]):
+                stack.append([s, j + 1, self.candidates(vl, *self.first_code_word(classes[s][j+1])), 0])
+                continue
+
+            if not self.sorted_arcs(vl):
+                continue
+
+            if s + 1 == len(self.order):
+                self.Status = gp.GRB.OPTIMAL
+                self.SolCount = 1
+                self.solution = self.current_solution()
+                break
+
+            classes[s+1] = self.input_classes(self.order[s+1])
+            stack.append([s + 1, 0, self.candidates(self.order[s+1], *self.first_code_word(classes[s+1][0])), 0])
+
+        self.Runtime = time.perf_counter() - start
+
+        if self.output_flag:
+            print("SEARCH: {} nodes explored in {:.2f}s".format(self.NodeCount, self.Runtime))
+
+    def first_code_word(self, input_class):
+        '''
+        returns the input id and the first code word of a class as returned by input_classes
+        input_class - pair (input id, code words)
+        '''
+
+        return input_class[0], input_class[1][0]
+
+    def current_solution(self):
+        '''
+        returns the current assignment as dictionaries of input ids, output ids, and maps
+        indexed by vertex labels, with the same arrays as extract_solution in networkcode.py
+        '''
+
+        inputs = {}
+        outputs = {}
+        maps = {}
+        for v in self.G.get_vertices():
+            vl = v.get_label()
+
+            if not v.is_source:
+                in_arcs = [arc.id for arc in self.G.get_in_arcs(vl) or []]
+                in_ids = np.zeros(self.size_code, dtype=np.int64)
+                for a in in_arcs:
+                    in_ids = in_ids * self.size_alpha + np.array(self.sym[a], dtype=np.int64)
+                inputs[vl] = in_ids
+
+            if not v.is_target:
+                outputs[vl] = np.array(self.out_ids[vl], dtype=np.int64)
+
+            if not v.is_source and not v.is_target:
+                maps[vl] = np.full(self.size_alpha**len(in_arcs), -1, dtype=np.int64)
+                maps[vl][inputs[vl]] = outputs[vl]
+
+        return inputs, outputs, maps
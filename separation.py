@@ -0,0 +1,205 @@
+import gurobipy as gp
+import numpy as np
+
+# minimum violation of a separated cutting plane
+CUT_TOLERANCE = 1e-6
+
+class CutSeparator:
+
+    def __init__(self, G, var_input_at_node, var_output_at_node, var_map_at_node, max_rounds=None,
+                 max_cuts=None, families=("linearization",)):
+        '''
+        separates cutting planes in a Gurobi callback, i.e., only inequalities that are violated
+        by the LP solution of a node are added to the model; the separator is passed as callback
+        to optimize; the following families are available:
+           linearization - the cutting planes of add_cutting_planes
+           subset        - for each subset I of input strings of a vertex:
+                           input[I] + map[I^c,out_str] >= output[out_str], which is exponential
+                           in size, but a most violated inequality is found by choosing I as
+                           the input strings whose input value is smaller than their map value
+        G                  - graph for which we want to compute the code
+        var_input_at_node  - variables modeling the input at vertices
+        var_output_at_node - variables modeling the output at vertices
+        var_map_at_node    - variables modeling the maps at vertices
+        max_rounds         - maximum number of callbacks in which cuts are added (optional)
+        max_cuts           - maximum number of cuts that are added (optional)
+        families           - families of cutting planes that are separated (optional)
+        '''
+
+        self.G = G
+        self.var_input_at_node = var_input_at_node
+        self.var_output_at_node = var_output_at_node
+        self.var_map_at_node = var_map_at_node
+        self.max_rounds = max_rounds
+        self.max_cuts = max_cuts
+        self.families = list(families)
+
+        self.variables = None
+        self.indices = {}
+        self.rounds = 0
+        self.cuts = 0
+        self.family_stats = {}
+
+    def prepare(self, m):
+        '''
+        collects the indices of the variables of the current model and resets the statistics,
+        needs to be called before each solve since the code can be extended in between
+        m - Gurobi model
+        '''
+
+        m.update()
+        self.variables = m.getVars()
+        self.rounds = 0
+        self.cuts = 0
+        self.family_stats = {family: {"cuts": 0, "violation": 0.0, "max_violation": 0.0}
+                             for family in self.families}
+
+        self.indices = {}
+        for v in self.var_map_at_node.vertices:
+            vl = v.get_label()
+            blocks = [self.var_input_at_node.block(vl), self.var_output_at_node.block(vl),
+                      self.var_map_at_node.block(vl)]
+            self.indices[vl] = [np.array([[var.index for var in row] for row in block], dtype=np.int64)
+                                for block in blocks]
+
+    def statistics(self):
+        '''
+        returns a dictionary with the number of rounds and cuts of the last solve, and per
+        family the number of cuts as well as the total and maximum violation of the cuts by
+        the LP solutions they cut off; the violation measures the progress of a feasibility
+        model, whose objective bound does not change
+        '''
+
+        return {"rounds": self.rounds, "cuts": self.cuts, "families": self.family_stats}
+
+    def separate(self, x):
+        '''
+        returns the violated cutting planes as list of tuples (violation, family, vl, key),
+        where key identifies the inequality within the family (see cut)
+        x - array of the values of all variables
+        '''
+
+        violated = []
+        for (vl, (in_idx, out_idx, map_idx)) in self.indices.items():
+            inputs = x[in_idx]
+            outputs = x[out_idx]
+            maps = x[map_idx]
+
+            if "linearization" in self.families:
+                violated.extend(self.separate_linearization(vl, inputs, outputs, maps))
+            if "subset" in self.families:
+                violated.extend(self.separate_subset(vl, inputs, outputs, maps))
+
+        return violated
+
+    def separate_linearization(self, vl, inputs, outputs, maps):
+        '''
+        returns the violated cutting planes of add_cutting_planes at a vertex, keys are triples
+        (c, i, o), where i is None for the inequality of the whole column of the map
+        vl      - label of the vertex
+        inputs  - values of the input variables per code word and input string
+        outputs - values of the output variables per code word and output string
+        maps    - values of the map variables per input and output string
+        '''
+
+        violated = []
+        num_in = maps.shape[0]
+        column_sums = maps.sum(axis=0)
+
+        # map[I\setminus{i},out_str] <= |input strings| - 2 + output[out_str] + input[i]
+        lhs = column_sums[None,None,:] - maps[None,:,:] - inputs[:,:,None] - outputs[:,None,:]
+        for (c, i, o) in zip(*np.nonzero(lhs > num_in - 2 + CUT_TOLERANCE)):
+            violated.append((float(lhs[c,i,o] - num_in + 2), "linearization", vl, (c, i, o)))
+
+        # map[in_strings] <= |in_strings| - 1 + output[out_str]
+        lhs = column_sums[None,:] - outputs
+        for (c, o) in zip(*np.nonzero(lhs > num_in - 1 + CUT_TOLERANCE)):
+            violated.append((float(lhs[c,o] - num_in + 1), "linearization", vl, (c, None, o)))
+
+        return violated
+
+    def separate_subset(self, vl, inputs, outputs, maps):
+        '''
+        returns the most violated subset inequality per code word and output string at a
+        vertex if it is violated, keys are triples (c, o, I) for the subset I of input strings
+        vl      - label of the vertex
+        inputs  - values of the input variables per code word and input string
+        outputs - values of the output variables per code word and output string
+        maps    - values of the map variables per input and output string
+        '''
+
+        violated = []
+
+        # each input string contributes the smaller of its input and map value
+        smaller = inputs[:,:,None] < maps[None,:,:]
+        lhs = np.minimum(inputs[:,:,None], maps[None,:,:]).sum(axis=1)
+        for (c, o) in zip(*np.nonzero(outputs > lhs + CUT_TOLERANCE)):
+            subset = tuple(int(i) for i in np.nonzero(smaller[c,:,o])[0])
+            violated.append((float(outputs[c,o] - lhs[c,o]), "subset", vl, (c, o, subset)))
+
+        return violated
+
+    def cut(self, family, vl, key):
+        '''
+        returns a cutting plane as constraint that can be passed to cbCut
+        family - family of the cutting plane
+        vl     - label of the vertex
+        key    - triple (c, i, o) of code word c, input string i, and output string o for
+                 family linearization, where i is None for the inequality of the whole column,
+                 and triple (c, o, I) of code word c, output string o, and subset I of input
+                 strings for family subset
+        '''
+
+        inputs = self.var_input_at_node.block(vl)
+        outputs = self.var_output_at_node.block(vl)
+
+        if family == "subset":
+            (c, o, subset) = key
+            column = [row[o] for row in self.var_map_at_node.block(vl)]
+            return (gp.quicksum(inputs[c][i] for i in subset)
+                    + gp.quicksum(column[i] for i in range(len(column)) if not i in subset)
+                    >= outputs[c][o])
+
+        (c, i, o) = key
+        column = [row[o] for row in self.var_map_at_node.block(vl)]
+
+        if i is None:
+            return gp.quicksum(column) <= len(column) - 1 + outputs[c][o]
+
+        return gp.quicksum(column[:i] + column[i+1:]) <= len(column) - 2 + inputs[c][i] + outputs[c][o]
+
+    def __call__(self, m, where):
+        '''
+        adds the most violated cutting planes at nodes whose LP relaxation is solved
+        m     - Gurobi model
+        where - callback code
+        '''
+
+        if where != gp.GRB.Callback.MIPNODE:
+            return
+        if m.cbGet(gp.GRB.Callback.MIPNODE_STATUS) != gp.GRB.OPTIMAL:
+            return
+        if not self.max_rounds is None and self.rounds >= self.max_rounds:
+            return
+        if not self.max_cuts is None and self.cuts >= self.max_cuts:
+            return
+
+        x = np.array(m.cbGetNodeRel(self.variables))
+        violated = self.separate(x)
+        if len(violated) == 0:
+            return
+
+        violated.sort(key=lambda cut: -cut[0])
+        if not self.max_cuts is None:
+            violated = violated[:self.max_cuts - self.cuts]
+
+        for (violation, family, vl, key) in violated:
+            m.cbCut(self.cut(family, vl, key))
+
+            stats = self.family_stats[family]
+            stats["cuts"] += 1
+            stats["violation"] += violation
+            stats["max_violation"] = max(stats["max_violation"], violation)
+
+        self.rounds += 1
+        self.cuts += len(violated)
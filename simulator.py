@@ -0,0 +1,206 @@
+import numpy as np
+
+def topological_order(G):
+    '''
+    returns the vertex labels of an acyclic graph in topological order
+    G - graph to be sorted
+    '''
+
+    return G.topological_order()
+
+def string_to_id(string, size_alpha):
+    '''
+    returns the mixed-radix id of a string, i.e., its position in the lexicographic
+    enumeration of all strings of the same length
+    string     - string to be encoded
+    size_alpha - size of the underlying alphabet
+    '''
+
+    sid = 0
+    for a in string:
+        sid = sid * size_alpha + a
+
+    return sid
+
+def id_symbols(ids, size_alpha, size, pos):
+    '''
+    returns the symbols at position pos of strings of length size given by their ids
+    ids        - array of string ids
+    size_alpha - size of the underlying alphabet
+    size       - length of the strings
+    pos        - position within the strings
+    '''
+
+    return (ids // size_alpha**(size - 1 - pos)) % size_alpha
+
+def encode_maps(G, size_alpha, maps):
+    '''
+    encodes the maps as lookup arrays, returns a dictionary that assigns to the label
+    of every vertex with a map the array of output ids indexed by input ids, where -1
+    marks an input without image
+    G          - network to be used
+    size_alpha - size of the underlying alphabet
+    maps       - dictionary with keys (v,in_str) modeling how in_str is transformed at vertex v
+    '''
+
+    lookups = {}
+    for v in G.get_vertices():
+        if v.is_source or v.is_target:
+            continue
+
+        vl = v.get_label()
+        lookups[vl] = np.full(size_alpha**G.in_degree(vl), -1, dtype=np.int64)
+
+    for (v, in_str) in maps:
+        lookups[v.get_label()][string_to_id(in_str, size_alpha)] = string_to_id(maps[v,in_str], size_alpha)
+
+    return lookups
+
+def encode_code(G, size_alpha, code_words):
+    '''
+    encodes the code words as arrays, returns a dictionary that assigns to the label
+    of every source the array of ids of the output strings indexed by code words
+    G          - network to be used
+    size_alpha - size of the underlying alphabet
+    code_words - dictionary with keys (c,v) modeling the code word c on the out-arcs of source v
+    '''
+
+    size_code = max([c for (c, v) in code_words], default=-1) + 1
+
+    outputs = {}
+    for v in G.get_vertices():
+        if v.is_source:
+            outputs[v.get_label()] = np.full(size_code, -1, dtype=np.int64)
+
+    for (c, v) in code_words:
+        outputs[v.get_label()][c] = string_to_id(code_words[c,v], size_alpha)
+
+    return outputs
+
+def simulate(G, size_alpha, lookups, source_outputs, order=None):
+    '''
+    propagates all code words of a batch of codes through the network, returns dictionaries
+    that assign to each vertex label the arrays of input and output ids, respectively; the
+    arrays have one row per code of the batch and one column per code word, -1 marks
+    code words whose input has no image
+    G              - network to be used
+    size_alpha     - size of the underlying alphabet
+    lookups        - dictionary assigning to vertex labels arrays of output ids indexed by
+                     code and input id
+    source_outputs - dictionary assigning to source labels arrays of output ids indexed by
+                     code and code word
+    order          - topological order of the vertex labels (optional)
+    '''
+
+    if order is None:
+        order = topological_order(G)
+
+    shape = next(iter(source_outputs.values())).shape
+    batch = np.arange(shape[0])[:,None]
+
+    inputs = {}
+    outputs = {}
+    for vl in order:
+        v = G.get_vertex(vl)
+
+        if v.is_source:
+            outputs[vl] = source_outputs[vl]
+            continue
+
+        # assemble the input ids from the symbols on the in-arcs
+        in_arcs = G.get_in_arcs(vl)
+        in_ids = np.zeros(shape, dtype=np.int64)
+        undefined = np.zeros(shape, dtype=bool)
+        for arc in in_arcs:
+            ul = arc.get_tail().get_label()
+            out_arcs = G.get_out_arcs(ul)
+            pos = arc.get_tail_pos()
+            undefined |= outputs[ul] < 0
+            in_ids = in_ids * size_alpha + id_symbols(outputs[ul], size_alpha, len(out_arcs), pos)
+
+        in_ids[undefined] = -1
+        inputs[vl] = in_ids
+
+        if v.is_target:
+            continue
+
+        out_ids = lookups[vl][batch, np.maximum(in_ids, 0)]
+        out_ids[undefined] = -1
+        outputs[vl] = out_ids
+
+    return inputs, outputs
+
+def check_simulation(G, inputs, verbose=True):
+    '''
+    checks whether the simulated inputs define unambiguous codes, returns a boolean array
+    with one entry per code of the batch
+    G       - network to be used
+    inputs  - dictionary assigning to vertex labels arrays of input ids as computed by simulate
+    verbose - whether reasons for failures are printed
+    '''
+
+    valid = None
+    for v in G.get_vertices():
+        if not v.is_target:
+            continue
+
+        in_ids = inputs[v.get_label()]
+        if valid is None:
+            valid = np.ones(in_ids.shape[0], dtype=bool)
+
+        # codes whose code words reach an input without image
+        undefined = (in_ids < 0).any(axis=1)
+
+        # codes in which two code words arrive with the same input
+        in_sorted = np.sort(in_ids, axis=1)
+        ambiguous = (in_sorted[:,1:] == in_sorted[:,:-1]).any(axis=1)
+
+        if verbose:
+            for b in np.nonzero(undefined)[0]:
+                print("ERROR: code {} uses an input without image before reaching {}".format(b, v.get_label()))
+            for b in np.nonzero(ambiguous & ~undefined)[0]:
+                print("ERROR: code {} is ambiguous at {}".format(b, v.get_label()))
+
+        valid &= ~(undefined | ambiguous)
+
+    return valid
+
+def verify_codes(G, size_alpha, solutions, verbose=True):
+    '''
+    verifies a batch of codes by simulation, returns a boolean array with one entry per code
+    G          - network to be used
+    size_alpha - size of the underlying alphabet
+    solutions  - list of pairs (maps, code_words) as returned by find_unambiguous_code2,
+                 all codes need to have the same size
+    verbose    - whether reasons for failures are printed
+    '''
+
+    lookups = {}
+    source_outputs = {}
+    encoded = [(encode_maps(G, size_alpha, maps), encode_code(G, size_alpha, code_words))
+               for (maps, code_words) in solutions]
+
+    for (vl_lookups, vl_outputs) in encoded:
+        for vl in vl_lookups:
+            lookups.setdefault(vl, []).append(vl_lookups[vl])
+        for vl in vl_outputs:
+            source_outputs.setdefault(vl, []).append(vl_outputs[vl])
+
+    lookups = {vl: np.stack(lookups[vl]) for vl in lookups}
+    source_outputs = {vl: np.stack(source_outputs[vl]) for vl in source_outputs}
+
+    inputs, outputs = simulate(G, size_alpha, lookups, source_outputs)
+
+    return check_simulation(G, inputs, verbose)
+
+def verify_code(G, size_alpha, maps, code_words, verbose=True):
+    '''
+    verifies by simulation whether maps and code words define an unambiguous network code
+    G          - network to be used
+    size_alpha - size of the underlying alphabet
+    maps       - dictionary with keys (v,in_str) modeling how in_str is transformed at vertex v
+    code_words - dictionary with keys (c,v) modeling the code word c on the out-arcs of source v
+    verbose    - whether reasons for failures are printed
+    '''
+
+    return bool(verify_codes(G, size_alpha, [(maps, code_words)], verbose)[0])
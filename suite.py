@@ -0,0 +1,177 @@
+#!/usr/bin/python3
+
+import sweep
+import datetime
+import json
+import os
+import platform
+import sys
+
+# instances of the benchmark suite together with the alphabet and code sizes to be solved
+SUITE = [("butterfly", [2, 3], [2, 3, 4]),
+         ("RIIS", [2], [2, 3]),
+         ("comb4_2_mult", [2], [2, 3]),
+         ("comb5_2", [2], [2, 3])]
+
+# every run of the suite is solved with and without the following options
+SUITE_OPTIONS = ["handle_symmetries", "apply_preprocessing", "add_cuts"]
+
+# statistics that are compared with the baseline, together with their unit
+TIME_STATS = [("build_time", "s"), ("solve_time", "s"), ("peak_memory", "MB")]
+SIZE_STATS = ["num_vars", "num_constrs", "num_nonzeros", "node_count"]
+
+def create_suite_jobs():
+    '''
+    creates the jobs of the benchmark suite
+    '''
+
+    option_values = {option: default for (option, flag, default) in sweep.OPTIONS}
+    for option in SUITE_OPTIONS:
+        option_values[option] = [True, False]
+
+    jobs = []
+    for (name, alphabets, codesizes) in SUITE:
+        jobs.extend(sweep.create_jobs([name], alphabets, codesizes, option_values))
+
+    return jobs
+
+def run_suite(time_limit, threads, workers):
+    '''
+    runs the benchmark suite, returns the report as dictionary
+    time_limit - time limit for solving a single job
+    threads    - number of threads used by Gurobi per job
+    workers    - number of jobs that run in parallel
+    '''
+
+    jobs = create_suite_jobs()
+    print("running {} jobs of the benchmark suite on {} workers".format(len(jobs), workers))
+
+    results = list(sweep.run_jobs(jobs, time_limit, threads, workers))
+
+    # report the results in the order of the jobs to make reports easy to diff
+    order = {sweep.job_key(jobs[i]): i for i in range(len(jobs))}
+    results.sort(key=lambda result: order[sweep.job_key(result["job"])])
+
+    return {"created": datetime.datetime.now().isoformat(timespec="seconds"),
+            "machine": platform.node(), "python": platform.python_version(),
+            "time_limit": time_limit, "threads": threads, "results": results}
+
+def compare_reports(report, baseline, tolerance=0.2, min_diff=0.1):
+    '''
+    compares a report with a baseline report, prints all differences and returns the number of
+    regressions, i.e., changed solution statuses and statistics that got worse by more than
+    the tolerance, and of jobs that are missing in the baseline, which cannot be compared
+    report    - report of the current run
+    baseline  - report of the baseline run
+    tolerance - relative increase of times and memory that is tolerated
+    min_diff  - absolute increase of times and memory below which differences are ignored
+    '''
+
+    baseline_results = {sweep.job_key(result["job"]): result for result in baseline["results"]}
+
+    regressions = 0
+    improvements = 0
+    missing = 0
+    for result in report["results"]:
+        job = result["job"]
+        name = "{} {} {} sym{:d} pre{:d} cut{:d}".format(job["instance"], job["alphabet"],
+                                                         job["codesize"], job["handle_symmetries"],
+                                                         job["apply_preprocessing"], job["add_cuts"])
+
+        key = sweep.job_key(job)
+        if not key in baseline_results:
+            print("{:40} MISSING in baseline".format(name))
+            missing += 1
+            continue
+        base = baseline_results[key]
+
+        if result["status"] != base["status"]:
+            print("{:40} REGRESSION status {} (baseline {})".format(name, result["status"], base["status"]))
+            regressions += 1
+            continue
+
+        if result["status"] == "error":
+            continue
+
+        for (stat, unit) in TIME_STATS:
+            diff = result[stat] - base[stat]
+            if abs(diff) < min_diff:
+                continue
+            if result[stat] > (1 + tolerance) * base[stat]:
+                print("{:40} REGRESSION {} {:.2f}{} (baseline {:.2f}{})".format(
+                    name, stat, result[stat], unit, base[stat], unit))
+                regressions += 1
+            elif base[stat] > (1 + tolerance) * result[stat]:
+                print("{:40} improvement {} {:.2f}{} (baseline {:.2f}{})".format(
+                    name, stat, result[stat], unit, base[stat], unit))
+                improvements += 1
+
+        # model sizes are deterministic, so every change is reported, but not counted
+        for stat in SIZE_STATS:
+            if result[stat] != base[stat]:
+                print("{:40} changed {} {:.0f} (baseline {:.0f})".format(name, stat, result[stat], base[stat]))
+
+    print("{} regressions, {} improvements, {} jobs missing in baseline".format(regressions, improvements,
+                                                                             missing))
+
+    return regressions + missing
+
+if __name__ == "__main__":
+
+    if "-h" in sys.argv[1:]:
+        print("runs the benchmark suite and compares the results with a baseline")
+        print("usage: ./suite.py <optional parameters>")
+        print("optional parameters:")
+        print("\t-h: show help")
+        print("\t-o<file>: JSON report file (default: suite.json)")
+        print("\t-b<file>: baseline report to compare with")
+        print("\t-r<file>: compare an existing report with the baseline instead of running the suite")
+        print("\t-x<tolerance>: tolerated relative increase of times and memory (default: 0.2)")
+        print("\t-t<seconds>: time limit per job (default: 600)")
+        print("\t-T<threads>: threads per job (default: 1)")
+        print("\t-j<workers>: number of parallel jobs (default: cores / threads)")
+        print("\texamplary call: ./suite.py -osuite.json -bbaseline.json")
+        sys.exit()
+
+    # parse optional parameters
+    filename = "suite.json"
+    baseline_file = None
+    report_file = None
+    tolerance = 0.2
+    time_limit = 600
+    threads = 1
+    workers = None
+    for arg in sys.argv[1:]:
+        if arg.startswith("-o"):
+            filename = arg[2:]
+        elif arg.startswith("-b"):
+            baseline_file = arg[2:]
+        elif arg.startswith("-r"):
+            report_file = arg[2:]
+        elif arg.startswith("-x"):
+            tolerance = float(arg[2:])
+        elif arg.startswith("-t"):
+            time_limit = float(arg[2:])
+        elif arg.startswith("-T"):
+            threads = int(arg[2:])
+        elif arg.startswith("-j"):
+            workers = int(arg[2:])
+
+    if workers is None:
+        workers = max(1, (os.cpu_count() or 1) // threads)
+
+    if report_file is None:
+        report = run_suite(time_limit, threads, workers)
+        with open(filename, "w") as f:
+            json.dump(report, f, indent=1)
+        print("report written to {}".format(filename))
+    else:
+        with open(report_file) as f:
+            report = json.load(f)
+
+    if not baseline_file is None:
+        with open(baseline_file) as f:
+            baseline = json.load(f)
+
+        if compare_reports(report, baseline, tolerance) > 0:
+            sys.exit(1)
@@ -0,0 +1,244 @@
+#!/usr/bin/python3
+
+import networkcode as nwc
+import instances as inst
+import concurrent.futures
+import contextlib
+import itertools as it
+import json
+import os
+import resource
+import sys
+import time
+
+# options of find_unambiguous_code2 that can be varied in a sweep, together with the
+# command line parameter selecting their values and their default values
+OPTIONS = [("handle_symmetries", "-s", [True]),
+           ("apply_preprocessing", "-p", [True]),
+           ("add_cuts", "-c", [True]),
+           ("aggregate_compatibility", "-a", [False]),
+           ("linearize", "-l", [False]),
+           ("handle_automorphisms", "-g", [False]),
+           ("handle_value_symmetries", "-r", [False]),
+           ("reduce_graph", "-n", [False]),
+           ("lazy_cuts", "-e", [False]),
+           ("subset_cuts", "-u", [False]),
+           ("backend", "-b", ["gurobi"])]
+
+def parse_list(arg):
+    '''
+    parses a comma-separated list of integers, where ranges can be given as a-b
+    arg - string to be parsed
+    '''
+
+    values = []
+    for part in arg.split(","):
+        if "-" in part:
+            first, last = part.split("-")
+            values.extend(range(int(first), int(last) + 1))
+        else:
+            values.append(int(part))
+
+    return values
+
+def job_key(job):
+    '''
+    returns a string that identifies a job; options that take their default value are left
+    out, so that adding an option to OPTIONS does not change the keys of jobs in existing
+    result files, which do not contain the new option
+    job - dictionary describing the job
+    '''
+
+    defaults = {option: default[0] for (option, flag, default) in OPTIONS}
+
+    return json.dumps({key: value for (key, value) in job.items()
+                       if not (key in defaults and value == defaults[key])}, sort_keys=True)
+
+def create_jobs(names, alphabets, codesizes, option_values):
+    '''
+    creates the jobs of a sweep, i.e., all combinations of the given parameters
+    names         - names of the instances
+    alphabets     - sizes of the alphabet
+    codesizes     - sizes of the code
+    option_values - dictionary assigning to each option the list of values to be tested
+    '''
+
+    options = [option for (option, flag, default) in OPTIONS]
+
+    jobs = []
+    for (name, size_alpha, size_code) in it.product(names, alphabets, codesizes):
+        for values in it.product(*[option_values[option] for option in options]):
+            job = {"instance": name, "alphabet": size_alpha, "codesize": size_code}
+            job.update(zip(options, values))
+            jobs.append(job)
+
+    return jobs
+
+def read_finished_jobs(filename):
+    '''
+    returns the keys of all jobs whose results are contained in a JSONL file
+    filename - name of the result file
+    '''
+
+    finished = set()
+    if not os.path.exists(filename):
+        return finished
+
+    with open(filename) as f:
+        for line in f:
+            line = line.strip()
+            if len(line) == 0:
+                continue
+            try:
+                result = json.loads(line)
+            except ValueError:
+                print("WARNING: skipping corrupted line in {}".format(filename))
+                continue
+            finished.add(job_key(result["job"]))
+
+    return finished
+
+def run_job(job, time_limit, threads):
+    '''
+    solves the problem described by a job, returns a dictionary with the job,
+    its status, timings, peak memory in MB, and model statistics
+    job        - dictionary describing the job
+    time_limit - time limit for solving the model
+    threads    - number of threads used by the solver
+    '''
+
+    result = {"job": job}
+    start = time.perf_counter()
+
+    options = {option: job.get(option, default[0]) for (option, flag, default) in OPTIONS}
+    params = {"TimeLimit": time_limit, "Threads": threads, "OutputFlag": 0}
+
+    try:
+        G = inst.get_instance(job["instance"])
+
+        # the messages of the solver are not needed in a sweep
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            maps, code_words, stats = nwc.find_unambiguous_code2(G, job["alphabet"], job["codesize"],
+                                                                 var_names=False, display=False,
+                                                                 params=params, return_stats=True,
+                                                                 **options)
+        result.update(stats)
+    except Exception as e:
+        result["status"] = "error"
+        result["error"] = str(e)
+
+    result["wall_time"] = time.perf_counter() - start
+
+    # every job runs in a fresh process, so the peak of the process is the peak of the job
+    result["peak_memory"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0
+
+    return result
+
+def run_jobs(jobs, time_limit, threads, workers):
+    '''
+    runs jobs in a pool of processes, each job in a fresh process, and yields the
+    result of every job as soon as it is finished
+    jobs       - list of jobs
+    time_limit - time limit for solving a single job
+    threads    - number of threads used by Gurobi per job
+    workers    - number of jobs that run in parallel
+    '''
+
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers, max_tasks_per_child=1) as pool:
+        futures = [pool.submit(run_job, job, time_limit, threads) for job in jobs]
+        for future in concurrent.futures.as_completed(futures):
+            result = future.result()
+
+            job = result["job"]
+            print("{} {} {}: {} after {:.2f}s".format(job["instance"], job["alphabet"],
+                                                       job["codesize"], result["status"],
+                                                       result["wall_time"]))
+            yield result
+
+def run_sweep(jobs, filename, time_limit, threads, workers):
+    '''
+    runs all jobs that are not yet contained in the result file in a pool of processes
+    and appends the result of every finished job to the file
+    jobs       - list of jobs
+    filename   - name of the result file
+    time_limit - time limit for solving a single job
+    threads    - number of threads used by Gurobi per job
+    workers    - number of jobs that run in parallel
+    '''
+
+    finished = read_finished_jobs(filename)
+    pending = [job for job in jobs if not job_key(job) in finished]
+    print("{} of {} jobs already finished, running {} jobs on {} workers".format(
+        len(jobs) - len(pending), len(jobs), len(pending), workers))
+
+    with open(filename, "a") as f:
+        for result in run_jobs(pending, time_limit, threads, workers):
+            f.write(json.dumps(result) + "\n")
+            f.flush()
+
+if __name__ == "__main__":
+
+    # check input
+    if len(sys.argv) < 3:
+        print("ERROR: received too few arguments")
+        print("usage: ./sweep.py <alphabets> <codesizes> <optional parameters>")
+        print("call script with optional parameter -h for more information")
+        sys.exit()
+
+    optional = sys.argv[3:]
+    if "-h" in sys.argv[1:]:
+        print("alphabets and codesizes are comma-separated lists, ranges can be given as a-b")
+        print("optional parameters:")
+        print("\t-h: show help")
+        print("\t-i<name,...>: instance names (default: all instances)")
+        print("\t-s<list>: values for symmetry handling, e.g., -s0,1")
+        print("\t-p<list>: values for presolving")
+        print("\t-c<list>: values for cutting planes")
+        print("\t-e<list>: values for separating cutting planes in a callback")
+        print("\t-u<list>: values for separating subset inequalities")
+        print("\t-a<list>: values for aggregated arc compatibility constraints")
+        print("\t-l<list>: values for linearization")
+        print("\t-g<list>: values for automorphism handling")
+        print("\t-r<list>: values for value symmetry handling")
+        print("\t-n<list>: values for network reduction")
+        print("\t-b<list>: solvers, e.g., -bgurobi,cpsat,search (default: gurobi)")
+        print("\t-o<file>: JSONL result file (default: sweep.jsonl)")
+        print("\t-t<seconds>: time limit per job (default: 3600)")
+        print("\t-T<threads>: threads per job (default: 1)")
+        print("\t-j<workers>: number of parallel jobs (default: cores / threads)")
+        print("\texamplary call: ./sweep.py 2-4 2,3 -ibutterfly,RIIS -s0,1 -t600")
+        sys.exit()
+
+    alphabets = parse_list(sys.argv[1])
+    codesizes = parse_list(sys.argv[2])
+
+    # parse optional parameters
+    names = inst.get_instance_names()
+    option_values = {option: default for (option, flag, default) in OPTIONS}
+    filename = "sweep.jsonl"
+    time_limit = 3600
+    threads = 1
+    workers = None
+    for arg in optional:
+        if arg.startswith("-i"):
+            names = arg[2:].split(",")
+        elif arg.startswith("-o"):
+            filename = arg[2:]
+        elif arg.startswith("-t"):
+            time_limit = float(arg[2:])
+        elif arg.startswith("-T"):
+            threads = int(arg[2:])
+        elif arg.startswith("-j"):
+            workers = int(arg[2:])
+        else:
+            for (option, flag, default) in OPTIONS:
+                if arg.startswith(flag) and option == "backend":
+                    option_values[option] = arg[2:].split(",")
+                elif arg.startswith(flag):
+                    option_values[option] = [bool(value) for value in parse_list(arg[2:])]
+
+    if workers is None:
+        workers = max(1, (os.cpu_count() or 1) // threads)
+
+    jobs = create_jobs(names, alphabets, codesizes, option_values)
+    run_sweep(jobs, filename, time_limit, threads, workers)
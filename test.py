@@ -3,6 +3,10 @@
 import graph as graph
 import networkcode as nwc
 import instances as inst
+import loader as loader
+import portfolio as pf
+import partition as pt
+import enumeration as en
 import sys
 
 # check input
@@ -18,9 +22,25 @@ if "-h" in optional:
     print("\t-h: show help")
     print("\t-v: visualize network?")
     print("\t-i<name>: instance name")
+    print("\t-f<file>: read network from an edge list or JSON file instead")
     print("\t-s<0/1>: (don't) use symmetry handling")
+    print("\t-g<0/1>: (don't) sort arcs that are interchanged by automorphisms of the network")
+    print("\t-r<0/1>: (don't) break the relabeling symmetries of the symbols on each arc")
+    print("\t-n<0/1>: (don't) reduce the network before building the model")
+    print("\t-b<backend>: solver, gurobi, cpsat, or search (default: gurobi)")
     print("\t-p<0/1>: (don't) apply presolving")
     print("\t-c<0/1>: (don't) add cutting planes")
+    print("\t-e<0/1>: (don't) separate cutting planes in a callback instead of adding them")
+    print("\t-u<0/1>: (don't) separate subset inequalities in a callback")
+    print("\t-a<0/1>: (don't) aggregate arc compatibility constraints")
+    print("\t-l<0/1>: (don't) linearize the products of input and map variables")
+    print("\t-o<file>: write solution to file instead of the screen")
+    print("\t-q: do not display the solution")
+    print("\t-m: find a code of maximum size, starting with codesize code words")
+    print("\t-d<dir>: read the model from or write it to the model cache in dir")
+    print("\t-w<workers>: solve a portfolio of configurations on workers processes (0: all cores)")
+    print("\t-k<max>: enumerate up to max codes that are not equivalent up to symmetry (0: all)")
+    print("\t-x<workers>: split the problem by fixing code words, solve the parts on workers processes (0: all cores)")
     print("\texamplary call: ./test.py 4 2 -ibutterfly -s1 -c0")
     sys.exit()
 
@@ -29,26 +49,139 @@ size_code = int(sys.argv[2])
 
 # parse optional parameters
 default_ins = "butterfly"
+default_file = None
 default_sym = True
+default_aut = False
+default_val = False
+default_red = False
+default_bck = "gurobi"
 default_pre = True
 default_cut = True
+default_laz = False
+default_sub = False
 default_vis = False
+default_agg = False
+default_lin = False
+default_out = None
+default_dis = True
+default_max = False
+default_dir = None
+default_por = None
+default_par = None
+default_enu = None
 for arg in optional:
     if arg.startswith("-i"):
         default_ins = arg[2:]
+    elif arg.startswith("-f"):
+        default_file = arg[2:]
     elif arg.startswith("-s"):
         default_sym = bool(int(arg[2:]))
+    elif arg.startswith("-g"):
+        default_aut = bool(int(arg[2:]))
+    elif arg.startswith("-r"):
+        default_val = bool(int(arg[2:]))
+    elif arg.startswith("-n"):
+        default_red = bool(int(arg[2:]))
+    elif arg.startswith("-b"):
+        default_bck = arg[2:]
     elif arg.startswith("-p"):
         default_pre = bool(int(arg[2:]))
     elif arg.startswith("-c"):
         default_cut = bool(int(arg[2:]))
+    elif arg.startswith("-e"):
+        default_laz = bool(int(arg[2:]))
+    elif arg.startswith("-u"):
+        default_sub = bool(int(arg[2:]))
+    elif arg.startswith("-a"):
+        default_agg = bool(int(arg[2:]))
+    elif arg.startswith("-l"):
+        default_lin = bool(int(arg[2:]))
+    elif arg.startswith("-o"):
+        default_out = arg[2:]
+    elif arg.startswith("-q"):
+        default_dis = False
+    elif arg.startswith("-m"):
+        default_max = True
+    elif arg.startswith("-d"):
+        default_dir = arg[2:]
+    elif arg.startswith("-w"):
+        default_por = int(arg[2:])
+    elif arg.startswith("-k"):
+        default_enu = int(arg[2:])
+    elif arg.startswith("-x"):
+        default_par = int(arg[2:])
     elif arg.startswith("-v"):
         default_vis = True
 
-G = inst.get_instance(default_ins)
+if default_file is None:
+    G = inst.get_instance(default_ins)
+else:
+    G = loader.read_network(default_file)
+
+if G is None:
+    sys.exit()
+
 if default_vis:
     G.visualize()
 
-nwc.find_unambiguous_code2(G, size_alpha, size_code,
-                           handle_symmetries=default_sym, add_cuts=default_cut,
-                           apply_preprocessing=default_pre)
+if default_max:
+    # the model is extended code word by code word, which the cache does not support
+    if not (default_out is None and default_dir is None):
+        print("WARNING: -o<file> and -d<dir> are not supported with -m and ignored")
+    nwc.find_maximum_code(G, size_alpha, start_size=size_code,
+                          handle_symmetries=default_sym, add_cuts=default_cut,
+                          apply_preprocessing=default_pre,
+                          aggregate_compatibility=default_agg,
+                          linearize=default_lin, display=default_dis,
+                          handle_automorphisms=default_aut,
+                          handle_value_symmetries=default_val,
+                          reduce_graph=default_red, backend=default_bck,
+                          lazy_cuts=default_laz, subset_cuts=default_sub)
+elif not default_por is None:
+    if not (default_out is None and default_dir is None):
+        print("WARNING: -o<file> and -d<dir> are not supported with -w and ignored")
+    # the given options are the base of all configurations, which override some of them
+    pf.find_unambiguous_code_portfolio(G, size_alpha, size_code, workers=default_por or None,
+                                       display=default_dis,
+                                       options={"handle_symmetries": default_sym, "add_cuts": default_cut,
+                                                "apply_preprocessing": default_pre,
+                                                "aggregate_compatibility": default_agg,
+                                                "linearize": default_lin,
+                                                "handle_automorphisms": default_aut,
+                                                "handle_value_symmetries": default_val,
+                                                "reduce_graph": default_red, "backend": default_bck,
+                                                "lazy_cuts": default_laz, "subset_cuts": default_sub})
+elif not default_enu is None:
+    if not (default_out is None and default_dir is None):
+        print("WARNING: -o<file> and -d<dir> are not supported with -k and ignored")
+    # symmetry handling and preprocessing keep the defaults of the enumeration
+    en.enumerate_codes(G, size_alpha, size_code, max_codes=default_enu or None,
+                       display=default_dis, add_cuts=default_cut,
+                       aggregate_compatibility=default_agg, linearize=default_lin,
+                       handle_automorphisms=default_aut, backend=default_bck,
+                       lazy_cuts=default_laz, subset_cuts=default_sub)
+elif not default_par is None:
+    # the workers would write the same solution file and cache entries concurrently
+    if not (default_out is None and default_dir is None):
+        print("WARNING: -o<file> and -d<dir> are not supported with -x and ignored")
+    pt.find_unambiguous_code_partitioned(G, size_alpha, size_code, workers=default_par or None,
+                                         display=default_dis,
+                                         handle_symmetries=default_sym, add_cuts=default_cut,
+                                         apply_preprocessing=default_pre,
+                                         aggregate_compatibility=default_agg,
+                                         linearize=default_lin,
+                                         handle_automorphisms=default_aut,
+                                         handle_value_symmetries=default_val,
+                                         reduce_graph=default_red, backend=default_bck,
+                                         lazy_cuts=default_laz, subset_cuts=default_sub)
+else:
+    nwc.find_unambiguous_code2(G, size_alpha, size_code,
+                               handle_symmetries=default_sym, add_cuts=default_cut,
+                               apply_preprocessing=default_pre,
+                               aggregate_compatibility=default_agg,
+                               linearize=default_lin, display=default_dis,
+                               solution_file=default_out, cache_dir=default_dir,
+                               handle_automorphisms=default_aut,
+                               handle_value_symmetries=default_val,
+                               reduce_graph=default_red, backend=default_bck,
+                               lazy_cuts=default_laz, subset_cuts=default_sub)